@@ -0,0 +1,92 @@
+"""Сравнение векторного расчёта свободных слотов с построчным.
+
+Запуск:
+    python benchmarks/bench_free_slots.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from generators import generate_schedule  # noqa: E402
+
+import pandas as pd  # noqa: E402
+
+from scheduler import Scheduler  # noqa: E402
+
+CASES = ((30, 10), (365, 10), (365, 50))
+
+
+def legacy_free_slots(schedule_data):
+    """Построчный расчёт свободных слотов до перехода на индекс."""
+    days_df = pd.DataFrame(schedule_data["days"])
+    days_df["start"] = pd.to_datetime(days_df["start"], format='%H:%M')
+    days_df["end"] = pd.to_datetime(days_df["end"], format='%H:%M')
+    days_df["date"] = pd.to_datetime(days_df["date"])
+    timeslots_df = pd.merge(pd.DataFrame(schedule_data["timeslots"]),
+                            days_df[["id", "date"]],
+                            left_on='day_id',
+                            right_on='id').drop(
+        ["day_id", "id_x", "id_y"], axis=1
+    )
+    timeslots_df["start"] = pd.to_datetime(timeslots_df["start"],
+                                           format='%H:%M')
+    timeslots_df["end"] = pd.to_datetime(timeslots_df["end"],
+                                         format='%H:%M')
+    timeslots_df = timeslots_df.sort_values('start')
+    for i in days_df.index.values:
+        start_ts = {'start': pd.to_datetime('00:00', format='%H:%M'),
+                    'end': days_df.loc[i].start,
+                    'date': days_df.loc[i].date}
+        end_ts = {'start': days_df.loc[i].end,
+                  'end': pd.to_datetime('23:59', format='%H:%M'),
+                  'date': days_df.loc[i].date}
+        timeslots_df = pd.concat([timeslots_df,
+                                  pd.DataFrame([start_ts, end_ts])])
+    timeslots_df = timeslots_df.sort_values(['date', 'start'])
+    timeslots_df = timeslots_df.set_index(
+        keys=pd.RangeIndex(start=1, stop=len(timeslots_df) + 1)
+    )
+    free_slots = []
+    for i in range(1, len(timeslots_df)):
+        free_start = timeslots_df.iloc[i - 1]['end']
+        free_end = timeslots_df.iloc[i]['start']
+        if (free_start < free_end and
+                timeslots_df.iloc[i - 1]['date'] ==
+                timeslots_df.iloc[i]['date']):
+            free_slots.append(
+                (timeslots_df.iloc[i]['date'].strftime("%Y-%m-%d"),
+                 free_start.strftime('%H:%M'),
+                 free_end.strftime('%H:%M'))
+            )
+    return free_slots
+
+
+def indexed_free_slots(schedule_data):
+    scheduler = Scheduler(auto_fetch=False)
+    scheduler.schedule_data = schedule_data
+    return scheduler.get_free_slots()
+
+
+def measure(func, schedule_data):
+    started = time.perf_counter()
+    result = func(schedule_data)
+    return result, time.perf_counter() - started
+
+
+def main():
+    print(f"{'days':>6} {'slots':>8} {'legacy, s':>10} "
+          f"{'vector, s':>10} {'speedup':>8}")
+    for n_days, slots_per_day in CASES:
+        schedule_data = generate_schedule(n_days, slots_per_day)
+        legacy, legacy_time = measure(legacy_free_slots, schedule_data)
+        vector, vector_time = measure(indexed_free_slots, schedule_data)
+        assert legacy == vector, "results differ"
+        print(f"{n_days:>6} {len(schedule_data['timeslots']):>8} "
+              f"{legacy_time:>10.4f} {vector_time:>10.4f} "
+              f"{legacy_time / vector_time:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Память на один таймслот для внутренних представлений расписания.
+
+Для каждого представления считается память, которая остаётся занятой
+после построения (tracemalloc), делённая на количество таймслотов.
+Scheduler хранит только индекс: словари ответа API после разбора
+освобождаются.
+
+Запуск:
+    python benchmarks/bench_memory.py
+"""
+import gc
+import json
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from generators import generate_schedule  # noqa: E402
+
+from schedule_index import ScheduleArrays, ScheduleIndex  # noqa: E402
+
+from scheduler import Scheduler  # noqa: E402
+
+CASES = ((365, 20), (3 * 365, 100))
+
+
+def retained(build):
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current
+
+
+def load_scheduler(payload):
+    scheduler = Scheduler(auto_fetch=False)
+    scheduler._swap_schedule_data(json.loads(payload))
+    return scheduler
+
+
+def main():
+    print(f"{'days':>5} {'slots':>7} {'model':<16} {'bytes/slot':>10}")
+    for n_days, slots_per_day in CASES:
+        payload = json.dumps(generate_schedule(n_days, slots_per_day))
+        data, data_size = retained(lambda: json.loads(payload))
+        arrays, arrays_size = retained(
+            lambda: ScheduleArrays.from_schedule_data(data)
+        )
+        _, index_size = retained(lambda: ScheduleIndex.from_arrays(arrays))
+        _, scheduler_size = retained(lambda: load_scheduler(payload))
+        n_slots = len(data["timeslots"])
+        for model, size in (("response dicts", data_size),
+                            ("ScheduleArrays", arrays_size),
+                            ("ScheduleIndex", index_size),
+                            ("Scheduler", scheduler_size)):
+            print(f"{n_days:>5} {n_slots:>7} {model:<16} "
+                  f"{size / n_slots:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
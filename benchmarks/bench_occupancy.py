@@ -0,0 +1,69 @@
+"""Сравнение поиска окон по матрице занятости с обходом дней.
+
+Для каждого дня ищется самое раннее свободное окно в заданном периоде
+суток: построчно через get_free_slots и векторно через
+find_free_windows. Время матрицы указано без построения, которое
+выполняется один раз на версию расписания, build - построение матрицы
+по готовому индексу.
+
+Запуск:
+    python benchmarks/bench_occupancy.py
+"""
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from generators import generate_schedule  # noqa: E402
+
+from schedule_index import minutes_to_time, time_to_minutes  # noqa: E402
+
+from scheduler import Scheduler  # noqa: E402
+
+CASES = ((365, 10), (1825, 10), (3650, 20))
+QUERY = (90, "10:00", "16:00")
+
+
+def loop_windows(scheduler: Scheduler, duration: int, time_from: str,
+                 time_to: str) -> list:
+    """Построчный поиск окон по свободным слотам каждого дня."""
+    lower, upper = time_to_minutes(time_from), time_to_minutes(time_to)
+    windows = []
+    for date, slots in scheduler.iter_free_slots():
+        for start, end in slots:
+            start = max(time_to_minutes(start), lower)
+            end = min(time_to_minutes(end), upper)
+            if start + duration <= end:
+                windows.append((date, minutes_to_time(start),
+                                minutes_to_time(end)))
+                break
+    return windows
+
+
+def measure(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    print(f"{'days':>6} {'slots':>8} {'build, s':>9} {'loop, s':>9} "
+          f"{'matrix, s':>10} {'speedup':>8} {'KiB':>7}")
+    for n_days, slots_per_day in CASES:
+        scheduler = Scheduler(auto_fetch=False)
+        scheduler.schedule_data = generate_schedule(n_days, slots_per_day)
+        # Индекс строится при первом запросе, его время не учитывается
+        scheduler.get_free_slots("2000-01-01")
+        matrix, build_time = measure(scheduler.occupancy)
+        loop, loop_time = measure(loop_windows, scheduler, *QUERY)
+        vector, vector_time = measure(scheduler.find_free_windows, *QUERY)
+        assert loop == vector, "results differ"
+        print(f"{n_days:>6} {n_days * slots_per_day:>8} {build_time:>9.4f} "
+              f"{loop_time:>9.4f} {vector_time:>10.4f} "
+              f"{loop_time / vector_time:>7.1f}x "
+              f"{matrix.nbytes / 1024:>7.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Сравнение пакетного размещения встреч с поиском и бронированием по одной.
+
+Построчный вариант для каждой встречи вызывает find_slot_for_duration
+и book, как это делалось до place_many. Пакетный вариант - один вызов
+place_many(book=True). Оба варианта размещают встречи стратегией
+earliest в одинаковые интервалы.
+
+Запуск:
+    python benchmarks/bench_placement.py
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from generators import generate_schedule  # noqa: E402
+
+from scheduler import Scheduler  # noqa: E402
+
+CASES = ((365, 10, 500), (1825, 10, 2000), (3650, 20, 5000))
+
+
+def loop_place(scheduler: Scheduler, durations: list) -> list:
+    """Поиск и бронирование встреч по одной."""
+    placed = []
+    for duration in durations:
+        slot = scheduler.find_slot_for_duration(duration)
+        if slot is None:
+            continue
+        date, start, _ = slot
+        end = scheduler._validate_time(start) + duration
+        end = f"{end // 60:02d}:{end % 60:02d}"
+        scheduler.book(date, start, end)
+        placed.append((date, start, end))
+    return placed
+
+
+def measure(func, *args, **kwargs):
+    started = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def main():
+    print(f"{'days':>6} {'slots':>8} {'meetings':>9} {'loop, s':>9} "
+          f"{'batch, s':>9} {'speedup':>8}")
+    rnd = random.Random(0)
+    for n_days, slots_per_day, meetings in CASES:
+        durations = [rnd.choice((15, 30, 45, 60, 90)) for _ in range(meetings)]
+        schedule_data = generate_schedule(n_days, slots_per_day)
+        schedulers = []
+        for _ in range(2):
+            scheduler = Scheduler(auto_fetch=False)
+            scheduler.schedule_data = schedule_data
+            # Индекс строится при первом запросе, его время не учитывается
+            scheduler.get_free_slots("2000-01-01")
+            schedulers.append(scheduler)
+        loop, loop_time = measure(loop_place, schedulers[0], durations)
+        (batch, _), batch_time = measure(schedulers[1].place_many, durations,
+                                         book=True)
+        assert loop == [slot[1:] for slot in batch], "results differ"
+        print(f"{n_days:>6} {n_days * slots_per_day:>8} {meetings:>9} "
+              f"{loop_time:>9.4f} {batch_time:>9.4f} "
+              f"{loop_time / batch_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""Нагрузочный тест HTTP сервиса расписания.
+
+Запускает `python -m scheduler serve` в отдельном процессе над
+сгенерированным расписанием, которое отдаёт локальный HTTP сервер,
+и нагружает его запросами /available по постоянным соединениям.
+Печатает количество запросов в секунду и задержки p50 и p99.
+
+Запуск:
+    python benchmarks/bench_server.py
+    python benchmarks/bench_server.py --connections 64 --batch 100
+    python benchmarks/bench_server.py --url http://127.0.0.1:8080
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from generators import generate_timeslots  # noqa: E402
+
+from suite import StubAPI  # noqa: E402
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, process: subprocess.Popen,
+                   timeout: float = 60) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("server exited before accepting connections")
+        try:
+            socket.create_connection(("127.0.0.1", port), 0.1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError("server did not start in time")
+
+
+def build_requests(dates: list, batch: int, count: int = 1000) -> list:
+    """Заранее сериализованные HTTP запросы к /available."""
+    rnd = random.Random(0)
+    requests = []
+    for _ in range(count):
+        queries = []
+        for _ in range(max(batch, 1)):
+            start = rnd.randrange(9 * 60, 20 * 60, 15)
+            queries.append({"date": rnd.choice(dates),
+                            "time_start": f"{start // 60:02d}:"
+                                          f"{start % 60:02d}",
+                            "time_end": f"{(start + 30) // 60:02d}:"
+                                        f"{(start + 30) % 60:02d}"})
+        if batch:
+            body = json.dumps(queries).encode()
+            requests.append(b"POST /available HTTP/1.1\r\n"
+                            b"Content-Length: %d\r\n\r\n%s"
+                            % (len(body), body))
+        else:
+            query = queries[0]
+            requests.append(
+                f"GET /available?date={query['date']}"
+                f"&time_start={query['time_start']}"
+                f"&time_end={query['time_end']} HTTP/1.1\r\n\r\n".encode()
+            )
+    return requests
+
+
+async def _client(host: str, port: int, requests: list, deadline: float,
+                  latencies: list) -> None:
+    reader, writer = await asyncio.open_connection(host, port)
+    rnd = random.Random(id(latencies))
+    try:
+        while time.perf_counter() < deadline:
+            request = rnd.choice(requests)
+            started = time.perf_counter()
+            writer.write(request)
+            await writer.drain()
+            length = 0
+            while True:
+                line = await reader.readline()
+                if line == b"\r\n":
+                    break
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":")[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - started)
+    finally:
+        writer.close()
+
+
+async def load(host: str, port: int, requests: list, connections: int,
+               duration: float) -> list:
+    """Задержки запросов, выполненных за duration секунд."""
+    latencies = []
+    deadline = time.perf_counter() + duration
+    await asyncio.gather(*(
+        _client(host, port, requests, deadline, latencies)
+        for _ in range(connections)
+    ))
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None,
+                        help="адрес уже запущенного сервиса")
+    parser.add_argument("--size", type=int, default=100_000,
+                        help="количество таймслотов расписания")
+    parser.add_argument("--connections", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--batch", type=int, default=0,
+                        help="запросов в одном POST, 0 - GET запросы")
+    args = parser.parse_args()
+
+    data = generate_timeslots(args.size, "random")
+    dates = [day["date"] for day in data["days"]]
+    stub = process = None
+    if args.url is None:
+        stub = StubAPI(json.dumps(data).encode())
+        threading.Thread(target=stub.serve_forever, daemon=True).start()
+        port = _free_port()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "scheduler", "serve",
+             "--url", stub.url, "--no-cache", "--port", str(port)],
+            cwd=SRC_PATH, stderr=subprocess.DEVNULL
+        )
+        host = "127.0.0.1"
+    else:
+        host, port = args.url.split("//")[-1].rstrip("/").split(":")
+        port = int(port)
+    try:
+        if process is not None:
+            _wait_for_port(port, process)
+        requests = build_requests(dates, args.batch)
+        latencies = sorted(asyncio.run(load(host, port, requests,
+                                            args.connections,
+                                            args.duration)))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        if stub is not None:
+            stub.shutdown()
+            stub.server_close()
+
+    queries = len(latencies) * max(args.batch, 1)
+    print(f"requests/s  {len(latencies) / args.duration:>10.0f}")
+    print(f"queries/s   {queries / args.duration:>10.0f}")
+    print(f"p50, ms     {latencies[len(latencies) // 2] * 1000:>10.2f}")
+    print(f"p99, ms     {latencies[int(len(latencies) * 0.99)] * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
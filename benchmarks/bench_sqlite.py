@@ -0,0 +1,59 @@
+"""Сравнение запроса по одной дате к базе SQLite и к файлу JSON.
+
+Для каждого запроса создаётся новый Scheduler, как при запуске CLI:
+с JSONFileSource файл разбирается и индексируется целиком, с
+SQLiteSource читаются только строки выбранной даты по индексам
+days(date) и timeslots(day_id, start).
+
+Запуск:
+    python benchmarks/bench_sqlite.py
+"""
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from generators import generate_schedule  # noqa: E402
+
+from schedule_sources import JSONFileSource, SQLiteSource  # noqa: E402
+
+from scheduler import Scheduler  # noqa: E402
+
+CASES = ((365, 20), (3650, 20), (36500, 30))
+
+
+def measure(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def query(source, date: str) -> list:
+    return Scheduler(source=source).get_free_slots(date)
+
+
+def main():
+    print(f"{'days':>6} {'slots':>8} {'json, s':>9} {'sqlite, s':>10} "
+          f"{'speedup':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_days, slots_per_day in CASES:
+            schedule_data = generate_schedule(n_days, slots_per_day)
+            date = schedule_data["days"][n_days // 2]["date"]
+            file = Path(tmp) / f"{n_days}.json"
+            file.write_text(json.dumps(schedule_data))
+            json_source = JSONFileSource(file)
+            sqlite_source = SQLiteSource.create(Path(tmp) / f"{n_days}.db",
+                                                schedule_data)
+            expected, json_time = measure(query, json_source, date)
+            result, sqlite_time = measure(query, sqlite_source, date)
+            assert result == expected, "results differ"
+            print(f"{n_days:>6} {n_days * slots_per_day:>8} "
+                  f"{json_time:>9.4f} {sqlite_time:>10.4f} "
+                  f"{json_time / sqlite_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Время импорта и потребление памяти при старте процесса.
+
+Каждый сценарий запускается в отдельном интерпретаторе. Сценарий
+"с pandas" воспроизводит прежний импорт библиотеки, которая
+подгружала pandas на уровне модуля, сценарий "с requests" - импорт
+до отложенного создания HTTP сессии.
+
+Запуск:
+    python benchmarks/bench_startup.py
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+from statistics import median
+
+SRC_PATH = Path(__file__).resolve().parents[1] / "src"
+REPEATS = 5
+
+SCENARIOS = (
+    ("scheduler", "import scheduler"),
+    ("scheduler + pandas", "import pandas; import scheduler"),
+    ("scheduler + requests", "import requests; import scheduler"),
+    ("scheduler_cli", "import scheduler_cli"),
+)
+
+PROBE = """
+import json, resource, time
+started = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - started
+print(json.dumps({{
+    "seconds": elapsed,
+    "maxrss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}}))
+"""
+
+
+def run_probe(statement):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(statement=statement)],
+        cwd=SRC_PATH, capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def main():
+    print(f"{'scenario':<26} {'import, ms':>10} {'RSS, MB':>8}")
+    for name, statement in SCENARIOS:
+        probes = [run_probe(statement) for _ in range(REPEATS)]
+        seconds = median(probe["seconds"] for probe in probes)
+        rss = median(probe["maxrss_kb"] for probe in probes)
+        print(f"{name:<26} {seconds * 1000:>10.1f} {rss / 1024:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
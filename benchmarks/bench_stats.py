@@ -0,0 +1,67 @@
+"""Сравнение показателей загрузки через stats() с разбором строк.
+
+Построчный вариант считает загрузку дней, занятые минуты по часам
+и распределение длин свободных интервалов по результатам
+get_free_slots и get_busy_slots(merged=True), как это делалось
+до stats(). Векторный вариант - один вызов Scheduler.stats().
+
+Запуск:
+    python benchmarks/bench_stats.py
+"""
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from generators import generate_schedule  # noqa: E402
+
+from schedule_index import time_to_minutes  # noqa: E402
+
+from scheduler import Scheduler  # noqa: E402
+
+CASES = ((365, 20), (3650, 20), (36500, 30))
+
+
+def loop_stats(scheduler: Scheduler) -> tuple:
+    """Показатели по строкам свободных и занятых таймслотов."""
+    free = Counter()
+    gaps = []
+    for date, start, end in scheduler.get_free_slots():
+        length = time_to_minutes(end) - time_to_minutes(start)
+        free[date] += length
+        gaps.append(length)
+    hours = [0] * 24
+    for _, start, end in scheduler.get_busy_slots(merged=True):
+        for minute in range(time_to_minutes(start), time_to_minutes(end)):
+            hours[minute // 60] += 1
+    return free, hours, max(gaps, default=0)
+
+
+def measure(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def main():
+    print(f"{'days':>6} {'slots':>8} {'loop, s':>9} {'stats, s':>9} "
+          f"{'speedup':>8}")
+    for n_days, slots_per_day in CASES:
+        scheduler = Scheduler(auto_fetch=False)
+        scheduler.schedule_data = generate_schedule(n_days, slots_per_day)
+        # Индекс строится при первом запросе, его время не учитывается
+        scheduler.get_free_slots("2000-01-01")
+        (free, _, longest), loop_time = measure(loop_stats, scheduler)
+        stats, stats_time = measure(scheduler.stats)
+        assert longest == int(stats.gap_lengths.max(initial=0)), \
+            "results differ"
+        assert [free[date] for date in stats.dates] == \
+            (stats.working - stats.busy).tolist(), "results differ"
+        print(f"{n_days:>6} {n_days * slots_per_day:>8} {loop_time:>9.4f} "
+              f"{stats_time:>9.4f} {loop_time / stats_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Пиковая память и время разбора большого ответа API.
+
+Сравнивается разбор ответа целиком (response.json()) с потоковым
+разбором фрагментами. Память считается через tracemalloc, тело ответа
+заранее разбито на фрагменты и в пик не входит.
+
+Запуск:
+    python benchmarks/bench_stream_parse.py
+"""
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from generators import generate_schedule  # noqa: E402
+
+from schedule_index import ScheduleArrays  # noqa: E402
+
+from schedule_stream import parse_schedule_stream  # noqa: E402
+
+from settings import STREAM_CHUNK_SIZE  # noqa: E402
+
+CASES = ((365, 50), (3 * 365, 100))
+
+
+def parse_whole(chunks):
+    return ScheduleArrays.from_schedule_data(json.loads(b"".join(chunks)))
+
+
+def parse_stream(chunks):
+    arrays, _ = parse_schedule_stream(chunks)
+    return arrays
+
+
+def measure(parse, chunks):
+    tracemalloc.start()
+    started = time.perf_counter()
+    arrays = parse(chunks)
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return arrays, elapsed, peak
+
+
+def main():
+    print(f"{'days':>5} {'slots':>7} {'payload, MB':>11} "
+          f"{'mode':>7} {'time, s':>8} {'peak, MB':>9}")
+    for n_days, slots_per_day in CASES:
+        payload = json.dumps(generate_schedule(n_days,
+                                               slots_per_day)).encode()
+        chunks = [payload[pos:pos + STREAM_CHUNK_SIZE]
+                  for pos in range(0, len(payload), STREAM_CHUNK_SIZE)]
+        results = []
+        for mode, parse in (("whole", parse_whole),
+                            ("stream", parse_stream)):
+            arrays, elapsed, peak = measure(parse, chunks)
+            results.append(arrays)
+            print(f"{n_days:>5} {len(arrays.slot_id):>7} "
+                  f"{len(payload) / 2 ** 20:>11.1f} {mode:>7} "
+                  f"{elapsed:>8.2f} {peak / 2 ** 20:>9.1f}")
+        assert all(getattr(results[0], name).tolist() ==
+                   getattr(results[1], name).tolist()
+                   for name in ScheduleArrays.__slots__[1:])
+
+
+if __name__ == "__main__":
+    main()
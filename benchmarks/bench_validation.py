@@ -0,0 +1,63 @@
+"""Накладные расходы на разбор входных даты и времени.
+
+Сравнивается прежний путь (re.fullmatch со строковым паттерном и
+datetime.strptime на каждый вызов) с parse_date и parse_time,
+которые используют скомпилированные паттерны и LRU кэш, а также
+полный вызов is_available.
+
+Запуск:
+    python benchmarks/bench_validation.py
+"""
+import re
+import sys
+import timeit
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from generators import generate_schedule  # noqa: E402
+
+from scheduler import Scheduler, parse_date, parse_time  # noqa: E402
+
+from settings import DATE_PATTERN, TIME_PATTERN  # noqa: E402
+
+NUMBER = 100_000
+DATE = "2025-03-14"
+TIME_START = "13:25"
+TIME_END = "14:40"
+
+
+def legacy_parse_slot():
+    """Разбор слота до перехода на кэшируемые функции разбора."""
+    if not re.fullmatch(DATE_PATTERN, DATE):
+        raise ValueError
+    for time_string in (TIME_START, TIME_END):
+        if not re.fullmatch(TIME_PATTERN, time_string):
+            raise ValueError
+    start = datetime.strptime(TIME_START, "%H:%M")
+    end = datetime.strptime(TIME_END, "%H:%M")
+    return DATE, start, end
+
+
+def cached_parse_slot():
+    return parse_date(DATE), parse_time(TIME_START), parse_time(TIME_END)
+
+
+def main():
+    scheduler = Scheduler(auto_fetch=False)
+    scheduler._swap_schedule_data(generate_schedule(365, 20))
+    cases = (
+        ("legacy validate + strptime", legacy_parse_slot),
+        ("parse_date + parse_time", cached_parse_slot),
+        ("is_available", lambda: scheduler.is_available(DATE, TIME_START,
+                                                        TIME_END)),
+    )
+    print(f"{'case':<28} {'µs/call':>8}")
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=NUMBER, repeat=5))
+        print(f"{name:<28} {seconds / NUMBER * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
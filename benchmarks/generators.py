@@ -0,0 +1,125 @@
+import random
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+# Количество таймслотов в дне для generate_timeslots по виду расписания
+SLOTS_PER_DAY = {"random": 20, "dense": 40, "sparse": 4,
+                 "overlap": 20, "adjacent": 30}
+SCHEDULE_KINDS = tuple(SLOTS_PER_DAY)
+
+
+def _time(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _day_slots(
+        rnd: random.Random, kind: str, day_start: int, day_end: int,
+        slots_per_day: int
+) -> List[Tuple[int, int]]:
+    if kind == "overlap":
+        slots = []
+        for _ in range(slots_per_day):
+            start = rnd.randrange(day_start, day_end)
+            slots.append((start, min(day_end,
+                                     start + rnd.randrange(15, 240))))
+        return slots
+    if kind == "random":
+        cuts = sorted(rnd.sample(range(day_start, day_end + 1),
+                                 min(2 * slots_per_day,
+                                     day_end - day_start + 1)))
+        return list(zip(cuts[::2], cuts[1::2]))
+    cuts = sorted(rnd.sample(range(day_start, day_end + 1),
+                             min(slots_per_day + 1,
+                                 day_end - day_start + 1)))
+    slots = list(zip(cuts, cuts[1:]))
+    if kind == "dense":
+        return [(start, max(start + 1, end - rnd.randrange(0, 3)))
+                for start, end in slots]
+    if kind == "sparse":
+        return [(start, min(end, start + rnd.randrange(5, 30)))
+                for start, end in slots]
+    return slots
+
+
+def generate_schedule(
+        n_days: int, slots_per_day: int, seed: int = 0,
+        kind: str = "random"
+) -> Dict[str, List[Dict[str, str | int]]]:
+    """
+    Генерирует детерминированное расписание в формате ответа API.
+
+    Таймслоты лежат внутри рабочего дня, порядок таймслотов перемешан,
+    как в ответе API.
+
+    Виды расписаний:
+        random - непересекающиеся таймслоты случайной длины;
+        dense - таймслоты почти без промежутков между ними;
+        sparse - короткие таймслоты с длинными промежутками;
+        overlap - пересекающиеся таймслоты;
+        adjacent - таймслоты встык, окончание равно началу следующего.
+
+    Args:
+        n_days (int, example=365): количество рабочих дней.
+        slots_per_day (int, example=20): количество таймслотов в дне.
+        seed (int, default=0): зерно генератора случайных чисел.
+        kind (str, default="random"): вид расписания.
+
+    Raises:
+        ValueError: если kind неизвестен.
+
+    Returns:
+        Dict[str, List[Dict[str, str | int]]]
+
+    Example:
+        >> schedule_data = generate_schedule(365, 20, kind="overlap")
+    """
+    if kind not in SCHEDULE_KINDS:
+        raise ValueError(f"kind must be one of {SCHEDULE_KINDS}")
+    rnd = random.Random(seed)
+    first_date = date(2025, 1, 1)
+    days = []
+    timeslots = []
+    for day_id in range(1, n_days + 1):
+        day_start = rnd.randrange(6 * 60, 10 * 60)
+        day_end = rnd.randrange(17 * 60, 23 * 60)
+        days.append({"date": (first_date +
+                              timedelta(days=day_id - 1)).isoformat(),
+                     "end": _time(day_end),
+                     "id": day_id,
+                     "start": _time(day_start)})
+        for start, end in _day_slots(rnd, kind, day_start, day_end,
+                                     slots_per_day):
+            timeslots.append({"day_id": day_id,
+                              "end": _time(end),
+                              "start": _time(start)})
+    rnd.shuffle(timeslots)
+    for slot_id, timeslot in enumerate(timeslots, start=1):
+        timeslot["id"] = slot_id
+    return {"days": days, "timeslots": timeslots}
+
+
+def generate_timeslots(
+        n_timeslots: int, kind: str = "random", seed: int = 0
+) -> Dict[str, List[Dict[str, str | int]]]:
+    """
+    Генерирует расписание примерно из n_timeslots таймслотов.
+
+    Количество таймслотов в дне зависит от вида расписания, количество
+    дней подбирается под нужный размер.
+
+    Args:
+        n_timeslots (int, example=100000): количество таймслотов.
+        kind (str, default="random"): вид расписания.
+        seed (int, default=0): зерно генератора случайных чисел.
+
+    Returns:
+        Dict[str, List[Dict[str, str | int]]]
+
+    Example:
+        >> schedule_data = generate_timeslots(10 ** 6, kind="dense")
+    """
+    if kind not in SLOTS_PER_DAY:
+        raise ValueError(f"kind must be one of {SCHEDULE_KINDS}")
+    slots_per_day = SLOTS_PER_DAY[kind]
+    return generate_schedule(max(1, n_timeslots // slots_per_day),
+                             min(slots_per_day, n_timeslots), seed, kind)
@@ -0,0 +1,299 @@
+"""Бенчмарки публичных методов Scheduler с проверкой регрессий.
+
+Для каждого вида расписания и размера генерируется детерминированное
+расписание, которое отдаёт локальный HTTP сервер, поэтому набор
+работает без доступа к сети. Для каждого метода измеряется время
+одного вызова, для загрузки - память на один таймслот (оставшаяся
+после загрузки и пиковая). Запросы sqlite_* читают то же расписание
+из временной базы SQLite через новый Scheduler, как при запуске CLI.
+
+Время сохраняется в единицах эталонной нагрузки на чистом Python,
+которая измеряется вперемежку с каждым методом, поэтому baseline можно
+сравнивать между машинами, а изменение частоты процессора во время
+прогона не даёт ложных регрессий.
+С --check набор завершается с кодом 1, если метрика хуже baseline
+больше чем в tolerance раз.
+
+Запуск:
+    python benchmarks/suite.py
+    python benchmarks/suite.py --sizes 100 1000000 --kinds dense overlap
+    python benchmarks/suite.py --check
+    python benchmarks/suite.py --update
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import tempfile
+import threading
+import timeit
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from generators import SCHEDULE_KINDS, generate_timeslots  # noqa: E402
+
+from schedule_sources import SQLiteSource  # noqa: E402
+
+from scheduler import Scheduler, create_session  # noqa: E402
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_SIZES = (100, 1000, 10_000, 100_000)
+REPEAT = 5
+CONFIRM_RUNS = 4
+TIME_BUDGET = 0.02
+ETAG = '"bench"'
+
+
+class StubAPI(ThreadingHTTPServer):
+    """Локальный HTTP сервер, отдающий заранее сериализованный ответ."""
+    daemon_threads = True
+
+    def __init__(self, payload: bytes):
+        super().__init__(("127.0.0.1", 0), StubAPIHandler)
+        self.payload = payload
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/"
+
+
+class StubAPIHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.server.payload)))
+        self.send_header("ETag", ETAG)
+        self.end_headers()
+        self.wfile.write(self.server.payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def _reference_workload():
+    data = list(range(5_000))
+    random.Random(0).shuffle(data)
+    table = {value: str(value) for value in data}
+    return sorted((table[value], value) for value in data)
+
+
+def measure(func) -> tuple:
+    """
+    Время одного вызова func в секундах и в единицах эталонной нагрузки.
+
+    Серии вызовов func чередуются с эталонной нагрузкой, из каждой
+    берётся лучшее время.
+    """
+    timer = timeit.Timer(func)
+    reference_timer = timeit.Timer(_reference_workload)
+    number = max(1, int(TIME_BUDGET / max(timer.timeit(1), 1e-7)))
+    seconds = []
+    reference = []
+    for _ in range(REPEAT):
+        reference.append(reference_timer.timeit(1))
+        seconds.append(timer.timeit(number) / number)
+    return min(seconds), min(seconds) / min(reference)
+
+
+def measure_memory(url: str, session) -> tuple:
+    """Оставшаяся и пиковая память при загрузке расписания в байтах."""
+    Scheduler(url, session=session)
+    gc.collect()
+    tracemalloc.start()
+    scheduler = Scheduler(url, session=session)
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return scheduler, current, peak
+
+
+def build_cases(scheduler: Scheduler, data: dict,
+                source: SQLiteSource | None = None) -> dict:
+    """Вызовы публичных методов Scheduler для измерения."""
+    dates = [day["date"] for day in data["days"]]
+    middle = len(dates) // 2
+    date = dates[middle]
+    week = dates[middle:middle + 7]
+    rnd = random.Random(0)
+    queries = [(rnd.choice(dates), "10:00", "10:30") for _ in range(100)]
+    slot = scheduler.find_slot_for_duration(1)
+    if slot is not None:
+        minutes = int(slot[1][:2]) * 60 + int(slot[1][3:]) + 1
+        slot = (slot[0], slot[1], f"{minutes // 60:02d}:{minutes % 60:02d}")
+
+    def book_release():
+        scheduler.book(*slot)
+        scheduler.release(*slot)
+
+    cases = {
+        "fetch": scheduler.fetch,
+        "refresh_not_modified": scheduler.refresh,
+        "get_free_slots": scheduler.get_free_slots,
+        "get_free_slots_date": lambda: scheduler.get_free_slots(date),
+        "get_free_slots_week": lambda: scheduler.get_free_slots(
+            date_from=week[0], date_to=week[-1]
+        ),
+        "get_busy_slots": scheduler.get_busy_slots,
+        "get_busy_slots_date": lambda: scheduler.get_busy_slots(date),
+        "iter_free_slots": lambda: sum(
+            1 for _ in scheduler.iter_free_slots()
+        ),
+        "is_available": lambda: scheduler.is_available(date, "10:00",
+                                                       "10:30"),
+        "are_available_100": lambda: scheduler.are_available(queries),
+        "find_slot_earliest": lambda: scheduler.find_slot_for_duration(120),
+        "find_slot_best": lambda: scheduler.find_slot_for_duration(
+            120, strategy="best"
+        ),
+        "find_slots_10": lambda: scheduler.find_slots_for_duration(
+            60, limit=10
+        ),
+        "find_free_windows": lambda: scheduler.find_free_windows(60),
+        "place_many_10": lambda: scheduler.place_many([60] * 10),
+        "place_many_best_10": lambda: scheduler.place_many(
+            [60] * 10, strategy="best"
+        ),
+        "stats": scheduler.stats,
+        "stats_week": lambda: scheduler.stats(week[0], week[-1]),
+    }
+    if source is not None:
+        cases["sqlite_free_slots_date"] = lambda: Scheduler(
+            source=source
+        ).get_free_slots(date)
+        cases["sqlite_busy_slots_week"] = lambda: Scheduler(
+            source=source
+        ).get_busy_slots(date_from=week[0], date_to=week[-1])
+    if slot is not None:
+        cases["book_release"] = book_release
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        cases["to_dataframe"] = scheduler.to_dataframe
+    return cases
+
+
+def run(kinds, sizes, case_names, limits=None) -> dict:
+    """
+    Измеряет все методы для каждого вида и размера расписания.
+
+    Если задан limits (допустимое значение по ключу метрики), метод,
+    превысивший его, измеряется ещё CONFIRM_RUNS раз и берётся лучшее
+    значение, чтобы единичный всплеск нагрузки на машину не считался
+    регрессией.
+    """
+    limits = limits or {}
+    results = {}
+    session = create_session()
+    tmp = tempfile.TemporaryDirectory()
+    for kind in kinds:
+        for size in sizes:
+            data = generate_timeslots(size, kind)
+            n_slots = len(data["timeslots"])
+            source = None
+            if not case_names or any(name.startswith("sqlite_")
+                                     for name in case_names):
+                source = SQLiteSource.create(
+                    Path(tmp.name) / f"{kind}_{size}.db", data
+                )
+            server = StubAPI(json.dumps(data).encode())
+            thread = threading.Thread(target=server.serve_forever,
+                                      kwargs={"poll_interval": 0.01},
+                                      daemon=True)
+            thread.start()
+            try:
+                scheduler, current, peak = measure_memory(server.url,
+                                                          session)
+                prefix = f"{kind}/{size}"
+                results[f"{prefix}/memory_retained"] = current / n_slots
+                results[f"{prefix}/memory_peak"] = peak / n_slots
+                for name, func in build_cases(scheduler, data,
+                                              source).items():
+                    if case_names and name not in case_names:
+                        continue
+                    key = f"{prefix}/{name}"
+                    seconds, relative = measure(func)
+                    for _ in range(CONFIRM_RUNS):
+                        if relative <= limits.get(key, relative):
+                            break
+                        seconds, relative = min((seconds, relative),
+                                                measure(func))
+                    results[key] = relative
+                    print(f"{prefix:<16} {name:<22} "
+                          f"{seconds * 1e6:>12.1f} µs", flush=True)
+                print(f"{prefix:<16} {'memory (retained/peak)':<22} "
+                      f"{current / n_slots:>6.0f} / {peak / n_slots:.0f} "
+                      f"B/slot", flush=True)
+            finally:
+                server.shutdown()
+                server.server_close()
+    session.close()
+    tmp.cleanup()
+    return results
+
+
+def check(results: dict, baseline: dict, tolerance: float,
+          memory_tolerance: float) -> list:
+    """Метрики, которые хуже baseline больше допустимого."""
+    regressions = []
+    for key, value in results.items():
+        expected = baseline.get(key)
+        if expected is None:
+            continue
+        limit = memory_tolerance if "/memory_" in key else tolerance
+        if value > expected * limit:
+            regressions.append((key, value / expected))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=DEFAULT_SIZES)
+    parser.add_argument("--kinds", nargs="+", choices=SCHEDULE_KINDS,
+                        default=SCHEDULE_KINDS)
+    parser.add_argument("--cases", nargs="+", default=None)
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--check", action="store_true",
+                        help="завершиться с кодом 1 при регрессии")
+    parser.add_argument("--update", action="store_true",
+                        help="сохранить результаты в baseline")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--memory-tolerance", type=float, default=1.1)
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    limits = {key: value * args.tolerance for key, value in baseline.items()
+              if "/memory_" not in key} if args.check else None
+    results = run(args.kinds, args.sizes, args.cases, limits)
+
+    if args.update:
+        baseline.update({key: round(value, 6)
+                         for key, value in results.items()})
+        args.baseline.write_text(
+            json.dumps(dict(sorted(baseline.items())), indent=2) + "\n"
+        )
+        print(f"baseline updated: {args.baseline}")
+    if args.check:
+        regressions = check(results, baseline, args.tolerance,
+                            args.memory_tolerance)
+        for key, ratio in regressions:
+            print(f"REGRESSION {key}: {ratio:.2f}x baseline")
+        if regressions:
+            sys.exit(1)
+        print("no regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
+
+import requests
+
+from scheduler import Scheduler, create_session
+
+from settings import FETCH_CONCURRENCY, REQUEST_TIMEOUT
+
+
+class AsyncScheduler:
+    """Параллельная загрузка расписаний из нескольких API.
+
+    Все запросы выполняются через одну HTTP сессию с пулом соединений,
+    количество одновременных запросов ограничено семафором. Загрузка и
+    построение индекса выполняются в собственном пуле из concurrency
+    потоков, поэтому не блокируют цикл событий и не упираются в размер
+    пула по умолчанию.
+
+    Attributes:
+        concurrency (int): Максимальное количество одновременных запросов.
+        timeout (float): Таймаут одного запроса к API в секундах.
+        session (requests.Session): HTTP сессия с пулом соединений.
+
+    Example:
+        >> async with AsyncScheduler(concurrency=20) as client:
+        >>     schedulers = await client.fetch_many(api_urls)
+    """
+    concurrency: int
+    timeout: float
+    session: requests.Session
+
+    def __init__(self,
+                 concurrency: int = FETCH_CONCURRENCY,
+                 timeout: float = REQUEST_TIMEOUT,
+                 session: requests.Session | None = None):
+        if not isinstance(concurrency, int) or concurrency <= 0:
+            raise ValueError("concurrency must be a positive integer")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._owns_session = session is None
+        self.session = session if session is not None else \
+            create_session(concurrency)
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=concurrency, thread_name_prefix="async-scheduler"
+        )
+
+    async def __aenter__(self) -> "AsyncScheduler":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Функция для остановки пула потоков и закрытия HTTP сессии,
+        созданной экземпляром.
+
+        Example:
+            >> client.close()
+        """
+        self._executor.shutdown(wait=True)
+        if self._owns_session:
+            self.session.close()
+
+    async def fetch(self, api_url: str) -> Scheduler:
+        """
+        Функция для загрузки расписания одного API.
+
+        Args:
+            api_url (str): URL Endpoint для запроса расписания.
+
+        Raises:
+            SchedulerError: если URL отсутствует.
+            ValueError: если URL не является строкой или не прошёл
+                валидацию.
+            requests.RequestException: если запрос к API не удался.
+
+        Returns:
+            Scheduler с загруженным расписанием.
+
+        Example:
+            >> scheduler = await client.fetch(api_url)
+        """
+        scheduler = Scheduler(api_url,
+                              auto_fetch=False,
+                              session=self.session,
+                              timeout=self.timeout)
+        async with self._semaphore:
+            await asyncio.get_running_loop().run_in_executor(
+                self._executor, scheduler.fetch
+            )
+        return scheduler
+
+    async def fetch_many(
+            self, api_urls: Iterable[str], return_exceptions: bool = False
+    ) -> List[Scheduler | BaseException]:
+        """
+        Функция для параллельной загрузки расписаний нескольких API.
+
+        Args:
+            api_urls (Iterable[str]): URL Endpoint'ы для запроса расписания.
+            return_exceptions (bool, default=False): Вернуть исключение
+                на месте неудавшейся загрузки вместо его проброса.
+
+        Raises:
+            requests.RequestException: если запрос к одному из API не
+                удался и return_exceptions=False.
+
+        Returns:
+            List[Scheduler]. Экземпляры в порядке api_urls.
+
+        Example:
+            >> schedulers = await client.fetch_many([url_1, url_2])
+        """
+        return await asyncio.gather(
+            *(self.fetch(api_url) for api_url in api_urls),
+            return_exceptions=return_exceptions
+        )
@@ -0,0 +1,300 @@
+import threading
+from bisect import bisect_left
+from functools import wraps
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Tuple
+
+Hook = Callable[[str, float, Dict[str, Any]], None]
+Labels = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+FETCH_RESPONSE = "fetch_response"
+
+_hooks: Tuple[Hook, ...] = ()
+_hooks_lock = threading.Lock()
+
+
+def add_hook(hook: Hook) -> None:
+    """
+    Подключает обработчик событий инструментирования.
+
+    Обработчик вызывается после каждого инструментированного вызова
+    с именем события, длительностью в секундах и словарём с деталями.
+    Пока нет ни одного обработчика, инструментирование только проверяет
+    пустой кортеж и не замеряет время.
+
+    Args:
+        hook (Callable[[str, float, Dict[str, Any]], None]): обработчик.
+
+    Example:
+        >> registry = MetricsRegistry()
+        >> add_hook(registry)
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = _hooks + (hook,)
+
+
+def remove_hook(hook: Hook) -> None:
+    """
+    Отключает обработчик событий инструментирования.
+
+    Args:
+        hook (Callable[[str, float, Dict[str, Any]], None]): обработчик,
+            подключённый через add_hook.
+
+    Raises:
+        ValueError: если обработчик не подключён.
+
+    Example:
+        >> remove_hook(registry)
+    """
+    global _hooks
+    with _hooks_lock:
+        hooks = list(_hooks)
+        hooks.remove(hook)
+        _hooks = tuple(hooks)
+
+
+def hooks_enabled() -> bool:
+    """Возвращает True, если подключён хотя бы один обработчик."""
+    return bool(_hooks)
+
+
+def emit(event: str, seconds: float, info: Dict[str, Any]) -> None:
+    """
+    Передаёт событие всем подключённым обработчикам.
+
+    Args:
+        event (str, example="get_free_slots"): имя события.
+        seconds (float): длительность в секундах.
+        info (Dict[str, Any]): детали события.
+
+    Example:
+        >> emit(FETCH_RESPONSE, 0.12, {"status": 200, "bytes": 1024})
+    """
+    for hook in _hooks:
+        hook(event, seconds, info)
+
+
+def instrument(func: Callable = None, *, name: str | None = None):
+    """
+    Декоратор, замеряющий длительность вызова функции.
+
+    Событие называется по имени функции, если name не задан. В info
+    передаётся error - имя класса исключения или None.
+
+    Args:
+        func (Callable): декорируемая функция.
+        name (str | None, default=None): имя события.
+
+    Example:
+        >> @instrument
+        >> def get_free_slots(self, date=None): ...
+    """
+    def decorate(func: Callable) -> Callable:
+        event = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _hooks:
+                return func(*args, **kwargs)
+            started = perf_counter()
+            error = None
+            try:
+                return func(*args, **kwargs)
+            except BaseException as exc:
+                error = type(exc).__name__
+                raise
+            finally:
+                emit(event, perf_counter() - started, {"error": error})
+
+        return wrapper
+
+    return decorate if func is None else decorate(func)
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in labels) + "}"
+
+
+class MetricsRegistry:
+    """Реестр метрик в процессе в стиле Prometheus.
+
+    Хранит счётчики и гистограммы с метками и отдаёт их в текстовом
+    формате Prometheus. Экземпляр является обработчиком событий
+    инструментирования и подключается через add_hook.
+
+    Метрики событий Scheduler:
+        scheduler_calls_total{method} - количество вызовов;
+        scheduler_call_errors_total{method, error} - вызовы с ошибкой;
+        scheduler_call_duration_seconds{method} - длительность вызовов;
+        scheduler_fetch_responses_total{status} - ответы API;
+        scheduler_fetch_bytes_total - размер тел ответов API;
+        scheduler_fetch_duration_seconds - время ответа API.
+
+    Attributes:
+        buckets (Tuple[float, ...]): верхние границы корзин гистограмм
+            в секундах.
+
+    Example:
+        >> registry = MetricsRegistry()
+        >> add_hook(registry)
+        >> print(registry.render())
+    """
+    buckets: Tuple[float, ...]
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, List[float]]] = {}
+
+    def __call__(self, event: str, seconds: float,
+                 info: Dict[str, Any]) -> None:
+        if event == FETCH_RESPONSE:
+            self.inc("scheduler_fetch_responses_total",
+                     status=info["status"])
+            self.inc("scheduler_fetch_bytes_total", info["bytes"])
+            self.observe("scheduler_fetch_duration_seconds", seconds)
+            return
+        self.inc("scheduler_calls_total", method=event)
+        self.observe("scheduler_call_duration_seconds", seconds,
+                     method=event)
+        if info.get("error"):
+            self.inc("scheduler_call_errors_total", method=event,
+                     error=info["error"])
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """
+        Увеличивает счётчик.
+
+        Args:
+            name (str, example="scheduler_calls_total"): имя метрики.
+            value (float, default=1): прирост.
+            **labels: метки метрики.
+
+        Example:
+            >> registry.inc("scheduler_calls_total", method="book")
+        """
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        """
+        Добавляет наблюдение в гистограмму.
+
+        Args:
+            name (str, example="scheduler_call_duration_seconds"): имя
+                метрики.
+            value (float): наблюдаемое значение.
+            **labels: метки метрики.
+
+        Example:
+            >> registry.observe("scheduler_call_duration_seconds", 0.002,
+            >>                  method="book")
+        """
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # Счётчики корзин и +Inf, затем сумма и количество наблюдений
+            values = series.get(key)
+            if values is None:
+                values = series[key] = [0] * (len(self.buckets) + 3)
+            values[bisect_left(self.buckets, value)] += 1
+            values[-2] += value
+            values[-1] += 1
+
+    def value(self, name: str, **labels: Any) -> float:
+        """
+        Возвращает значение счётчика.
+
+        Args:
+            name (str, example="scheduler_calls_total"): имя метрики.
+            **labels: метки метрики.
+
+        Returns:
+            float. 0 - если счётчик ещё не увеличивался.
+
+        Example:
+            >> registry.value("scheduler_calls_total", method="book")
+        """
+        with self._lock:
+            return self._counters.get(name, {}).get(_labels(labels), 0)
+
+    def summary(self, name: str, **labels: Any) -> Tuple[int, float]:
+        """
+        Возвращает количество и сумму наблюдений гистограммы.
+
+        Args:
+            name (str, example="scheduler_call_duration_seconds"): имя
+                метрики.
+            **labels: метки метрики.
+
+        Returns:
+            Tuple[int, float]. (3, 0.0042)
+
+        Example:
+            >> count, total = registry.summary(
+            >>     "scheduler_call_duration_seconds", method="book"
+            >> )
+        """
+        with self._lock:
+            values = self._histograms.get(name, {}).get(_labels(labels))
+            if values is None:
+                return 0, 0.0
+            return int(values[-1]), values[-2]
+
+    def reset(self) -> None:
+        """
+        Удаляет все накопленные метрики.
+
+        Example:
+            >> registry.reset()
+        """
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """
+        Возвращает метрики в текстовом формате Prometheus.
+
+        Returns:
+            str
+            # TYPE scheduler_calls_total counter
+            scheduler_calls_total{method="book"} 1
+
+        Example:
+            >> print(registry.render())
+        """
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                for labels, values in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + (float("inf"),),
+                                            values):
+                        cumulative += count
+                        le = "+Inf" if bound == float("inf") else repr(bound)
+                        bucket_labels = _format_labels(labels + (("le", le),))
+                        lines.append(f"{name}_bucket{bucket_labels} "
+                                     f"{cumulative}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} "
+                                 f"{values[-2]}")
+                    lines.append(f"{name}_count{_format_labels(labels)} "
+                                 f"{values[-1]}")
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,288 @@
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from typing import Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from schedule_index import Interval, MINUTES_IN_DAY, ScheduleIndex
+
+# Количество дней, обрабатываемых за один векторный шаг поиска окон
+ROWS_PER_BLOCK = 1024
+
+
+def _counted(
+        day_free: Iterable[Tuple[Interval, ...]], counts: List[int]
+) -> Iterator[Tuple[Interval, ...]]:
+    for intervals in day_free:
+        counts.append(len(intervals))
+        yield intervals
+
+
+class OccupancyMatrix:
+    """Матрица свободных минут: строка на день, столбец на минуту суток.
+
+    Минута m свободна, если она входит в свободный интервал дня
+    [start, end). Строки хранятся упакованными по битам (180 байт
+    на день), поэтому матрица на несколько лет занимает сотни
+    килобайт. Поиск окон по многим дням выполняется векторно по блокам
+    строк через префиксные суммы, без обхода дней в Python.
+
+    Attributes:
+        dates (Tuple[str, ...]): отсортированные даты строк.
+        date_pos (Dict[str, int]): номер строки по дате.
+        bits (np.ndarray): упакованные строки, форма (дни, 180).
+        version (int | None): версия индекса, по которому построена
+            матрица.
+
+    Example:
+        >> matrix = OccupancyMatrix.from_index(index, "2025-01-01",
+        >>                                     "2025-12-31")
+        >> matrix.find_windows(90, time_from=600, time_to=960)
+    """
+    __slots__ = ("dates", "date_pos", "bits", "version")
+
+    def __init__(self, dates: Sequence[str], bits: np.ndarray,
+                 version: int | None = None):
+        self.dates = tuple(dates)
+        self.date_pos = {date: pos for pos, date in enumerate(self.dates)}
+        self.bits = bits
+        self.version = version
+
+    @classmethod
+    def from_intervals(
+            cls, dates: Sequence[str],
+            day_free: Iterable[Tuple[Interval, ...]],
+            version: int | None = None
+    ) -> "OccupancyMatrix":
+        """
+        Строит матрицу по свободным интервалам дней.
+
+        Args:
+            dates (Sequence[str]): отсортированные даты.
+            day_free (Iterable[Tuple[Tuple[int, int], ...]]): свободные
+                интервалы каждой даты в том же порядке.
+            version (int | None, default=None): версия данных.
+
+        Returns:
+            OccupancyMatrix
+
+        Example:
+            >> OccupancyMatrix.from_intervals(["2025-02-17"],
+            >>                                [((540, 750),)])
+        """
+        counts = []
+        flat = np.fromiter(chain.from_iterable(
+            chain.from_iterable(intervals)
+            for intervals in _counted(day_free, counts)
+        ), dtype=np.int64).reshape(-1, 2)
+        # Смещение строки в плоской матрице границ (дни, 1441)
+        offsets = np.repeat(
+            np.arange(len(counts), dtype=np.int64) * (MINUTES_IN_DAY + 1),
+            counts
+        )
+        size = len(dates) * (MINUTES_IN_DAY + 1)
+        edges = (np.bincount(offsets + flat[:, 0], minlength=size) -
+                 np.bincount(offsets + flat[:, 1], minlength=size))
+        free = np.cumsum(edges.reshape(len(dates), MINUTES_IN_DAY + 1)
+                         [:, :MINUTES_IN_DAY], axis=1) > 0
+        return cls(dates, np.packbits(free, axis=1), version)
+
+    @classmethod
+    def from_index(
+            cls, index: ScheduleIndex,
+            date_from: str | None = None, date_to: str | None = None
+    ) -> "OccupancyMatrix":
+        """
+        Строит матрицу по индексу расписания, включая дни по правилам.
+
+        Args:
+            index (ScheduleIndex): индекс расписания.
+            date_from (str | None, default=None): первая дата
+                включительно. None - без ограничения.
+            date_to (str | None, default=None): последняя дата
+                включительно. None - без ограничения.
+
+        Returns:
+            OccupancyMatrix
+
+        Example:
+            >> matrix = OccupancyMatrix.from_index(index)
+        """
+        dates = list(index.iter_dates(date_from, date_to))
+        return cls.from_intervals(dates,
+                                  (index.day_free(date) for date in dates),
+                                  index.version)
+
+    @property
+    def nbytes(self) -> int:
+        """Размер упакованной матрицы в байтах."""
+        return self.bits.nbytes
+
+    def rows(self, lo: int = 0, hi: int | None = None) -> np.ndarray:
+        """
+        Распаковывает строки матрицы.
+
+        Args:
+            lo (int, default=0): первая строка.
+            hi (int | None, default=None): строка, следующая за
+                последней. None - до конца матрицы.
+
+        Returns:
+            np.ndarray. bool, форма (дни, 1440): True - минута свободна.
+
+        Example:
+            >> free = matrix.rows(0, 7)
+        """
+        return np.unpackbits(self.bits[lo:hi], axis=1,
+                             count=MINUTES_IN_DAY).view(bool)
+
+    def day_free(self, date: str) -> Tuple[Interval, ...]:
+        """
+        Возвращает свободные интервалы дня, восстановленные из строки.
+
+        Args:
+            date (str, example="2025-02-17"): дата.
+
+        Returns:
+            Tuple[Tuple[int, int], ...]. ((540, 750),), пустой кортеж -
+                если даты нет в матрице.
+
+        Example:
+            >> matrix.day_free("2025-02-17")
+        """
+        pos = self.date_pos.get(date)
+        if pos is None:
+            return ()
+        edges = np.diff(self.rows(pos, pos + 1)[0].astype(np.int8),
+                        prepend=0, append=0)
+        return tuple(zip(np.flatnonzero(edges == 1).tolist(),
+                         np.flatnonzero(edges == -1).tolist()))
+
+    def are_available(
+            self, dates: Sequence[str], starts: Sequence[int],
+            ends: Sequence[int]
+    ) -> np.ndarray:
+        """
+        Проверяет слоты на доступность одной векторной операцией.
+
+        Args:
+            dates (Sequence[str]): даты слотов.
+            starts (Sequence[int]): начала слотов в минутах.
+            ends (Sequence[int]): окончания слотов в минутах.
+
+        Returns:
+            np.ndarray. bool для каждого слота: True - все минуты слота
+                свободны. Даты вне матрицы недоступны.
+
+        Example:
+            >> matrix.are_available(["2025-02-17"], [540], [600])
+        """
+        rows = np.fromiter((self.date_pos.get(date, -1) for date in dates),
+                           dtype=np.int64, count=len(dates))
+        starts = np.asarray(starts, dtype=np.int64)
+        ends = np.asarray(ends, dtype=np.int64)
+        known = rows >= 0
+        result = np.zeros(len(rows), dtype=bool)
+        if not known.any():
+            return result
+        free = np.unpackbits(self.bits[rows[known]], axis=1,
+                             count=MINUTES_IN_DAY).view(bool)
+        counts = np.zeros((len(free), MINUTES_IN_DAY + 1), dtype=np.int16)
+        np.cumsum(free, axis=1, out=counts[:, 1:])
+        lengths = ends[known] - starts[known]
+        picked = np.arange(len(free))
+        result[known] = ((lengths > 0) &
+                         (counts[picked, ends[known]] -
+                          counts[picked, starts[known]] == lengths))
+        return result
+
+    def is_available(self, date: str, start: int, end: int) -> bool:
+        """
+        Проверяет, свободны ли все минуты слота.
+
+        Args:
+            date (str, example="2025-02-17"): дата слота.
+            start (int): начало слота в минутах.
+            end (int): окончание слота в минутах.
+
+        Returns:
+            bool
+
+        Example:
+            >> matrix.is_available("2025-02-17", 540, 600)
+        """
+        pos = self.date_pos.get(date)
+        if pos is None or start >= end:
+            return False
+        return bool(self.rows(pos, pos + 1)[0, start:end].all())
+
+    def find_windows(
+            self, duration: int, time_from: int = 0,
+            time_to: int = MINUTES_IN_DAY,
+            granularity: int | None = None,
+            date_from: str | None = None, date_to: str | None = None,
+            limit: int | None = None
+    ) -> List[Tuple[str, int, int]]:
+        """
+        Находит в каждом дне самое раннее свободное окно duration минут.
+
+        Окно [start, start + duration) должно лежать в пределах
+        [time_from, time_to). Для блока дней считаются префиксные
+        суммы свободных минут, окно подходит, если сумма по нему равна
+        duration. Окончание результата - конец свободного интервала,
+        содержащего окно, но не позже time_to.
+
+        Args:
+            duration (int): длина окна в минутах.
+            time_from (int, default=0): начало периода дня в минутах.
+            time_to (int, default=1440): окончание периода дня в минутах.
+            granularity (int | None, default=None): шаг сетки, на которую
+                выравнивается начало окна, в минутах.
+            date_from (str | None, default=None): первая дата
+                включительно.
+            date_to (str | None, default=None): последняя дата
+                включительно.
+            limit (int | None, default=None): максимальное количество
+                дней в результате.
+
+        Returns:
+            List[Tuple[str, int, int]]. Дата, начало окна и окончание
+                свободного интервала по возрастанию дат.
+
+        Example:
+            >> matrix.find_windows(90, time_from=600, time_to=960)
+        """
+        width = time_to - time_from
+        if duration <= 0 or duration > width:
+            return []
+        lo = 0 if date_from is None else bisect_left(self.dates, date_from)
+        hi = len(self.dates) if date_to is None else \
+            bisect_right(self.dates, date_to)
+        starts = np.arange(width - duration + 1)
+        if granularity:
+            starts = starts[(time_from + starts) % granularity == 0]
+            if not len(starts):
+                return []
+        found = []
+        for block in range(lo, hi, ROWS_PER_BLOCK):
+            free = self.rows(block, min(block + ROWS_PER_BLOCK,
+                                        hi))[:, time_from:time_to]
+            counts = np.zeros((len(free), width + 1), dtype=np.int16)
+            np.cumsum(free, axis=1, out=counts[:, 1:])
+            fits = counts[:, starts + duration] - counts[:, starts] == duration
+            fitting = np.flatnonzero(fits.any(axis=1))
+            if not len(fitting):
+                continue
+            first = starts[fits[fitting].argmax(axis=1)]
+            # Конец свободного интервала: первая занятая минута после окна
+            busy_at = np.where(free[fitting], width, np.arange(width))
+            next_busy = np.minimum.accumulate(busy_at[:, ::-1],
+                                              axis=1)[:, ::-1]
+            ends = next_busy[np.arange(len(fitting)), first + duration - 1]
+            for row, start, end in zip((fitting + block).tolist(),
+                                       (first + time_from).tolist(),
+                                       (ends + time_from).tolist()):
+                found.append((self.dates[row], start, end))
+                if limit is not None and len(found) == limit:
+                    return found
+        return found
@@ -0,0 +1,1580 @@
+import heapq
+from bisect import bisect_left, bisect_right
+from collections.abc import Mapping
+from itertools import chain
+from math import isqrt
+from typing import (Dict, Iterable, Iterator, List, Set, TYPE_CHECKING,
+                    Tuple)
+
+from metrics import instrument
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from schedule_rules import RecurringSchedule
+
+MINUTES_IN_DAY = 1440
+DAY_LAST_MINUTE = MINUTES_IN_DAY - 1
+
+_TIME_STRINGS = tuple(f"{minute // 60:02d}:{minute % 60:02d}"
+                      for minute in range(MINUTES_IN_DAY))
+# Общие объекты int для минут суток: интервалы индекса ссылаются на них,
+# а не хранят собственные копии чисел
+_MINUTES = tuple(range(MINUTES_IN_DAY))
+_MINUTE_OBJECTS = np.array(_MINUTES, dtype=object)
+
+Interval = Tuple[int, int]
+Timeslot = Tuple[str, int, int]
+
+
+def time_to_minutes(time_string: str) -> int:
+    """
+    Переводит строку времени в количество минут от начала суток.
+
+    Args:
+        time_string (str, example="13:25"): Время в формате HH:MM.
+
+    Returns:
+        int. 805
+
+    Example:
+        >> time_to_minutes("13:25")
+    """
+    return int(time_string[:2]) * 60 + int(time_string[3:5])
+
+
+def _shared_minutes(minutes: np.ndarray) -> List[int]:
+    """Переводит массив минут в список общих объектов int."""
+    if len(minutes) and minutes.max() >= MINUTES_IN_DAY:
+        return minutes.tolist()
+    return _MINUTE_OBJECTS[minutes].tolist()
+
+
+def _shared_minute(minutes: int) -> int:
+    return _MINUTES[minutes] if 0 <= minutes < MINUTES_IN_DAY else minutes
+
+
+def minutes_to_time(minutes: int) -> str:
+    """
+    Переводит количество минут от начала суток в строку времени.
+
+    Args:
+        minutes (int, example=805): Минуты от начала суток.
+
+    Returns:
+        str. "13:25"
+
+    Example:
+        >> minutes_to_time(805)
+    """
+    return _TIME_STRINGS[minutes]
+
+
+def times_to_minutes(time_strings: List[str]) -> np.ndarray:
+    """
+    Переводит список строк времени в массив минут от начала суток.
+
+    Строки разбираются одной векторной операцией над кодами символов.
+
+    Args:
+        time_strings (List[str], example=["09:00", "13:25"]): Время
+            в формате HH:MM.
+
+    Returns:
+        np.ndarray. array([540, 805])
+
+    Example:
+        >> times_to_minutes(["09:00", "13:25"])
+    """
+    if not time_strings:
+        return np.zeros(0, dtype=np.int64)
+    digits = (np.array(time_strings, dtype="<U5").view(np.uint32)
+              .reshape(-1, 5).astype(np.int64) - ord("0"))
+    return ((digits[:, 0] * 10 + digits[:, 1]) * 60 +
+            digits[:, 3] * 10 + digits[:, 4])
+
+
+def _running_max_by_day(day: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Нарастающий максимум values в пределах дня по отсортированным дням."""
+    if not len(values):
+        return values
+    offset = day.astype(np.int64) * (int(values.max()) + 1)
+    return np.maximum.accumulate(offset + values) - offset
+
+
+def _merge_sorted_by_day(
+        day: np.ndarray, start: np.ndarray, end: np.ndarray
+) -> Tuple[Tuple[np.ndarray, np.ndarray, np.ndarray],
+           Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """Объединяет интервалы, отсортированные по (день, начало)."""
+    reach = _running_max_by_day(day, end)
+    first = np.ones(len(day), dtype=bool)
+    first[1:] = day[1:] != day[:-1]
+    prev_reach = np.zeros_like(reach)
+    prev_reach[1:] = reach[:-1]
+    opens = first | (start > prev_reach)
+    overlap = ~first & (start < prev_reach)
+    closes = np.ones(len(day), dtype=bool)
+    closes[:-1] = opens[1:]
+    return ((day[opens], start[opens], reach[closes]),
+            (day[overlap], start[overlap],
+             np.minimum(end, prev_reach)[overlap]))
+
+
+def merge_intervals_by_day(
+        day_idx: np.ndarray, start: np.ndarray, end: np.ndarray
+) -> Tuple[Tuple[np.ndarray, np.ndarray, np.ndarray],
+           Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Объединяет занятые интервалы всех дней за один векторный проход.
+
+    Интервалы сортируются по (день, начало, окончание), после чего
+    нарастающий максимум окончаний в пределах дня отмечает начала
+    непересекающихся блоков: интервал открывает новый блок, если
+    начинается позже окончания всех предыдущих. Примыкающие интервалы
+    объединяются, пересекающиеся дополнительно возвращаются как участки
+    двойной занятости. Пустые интервалы (начало не раньше окончания)
+    отбрасываются.
+
+    Args:
+        day_idx (np.ndarray): порядковый номер даты интервала.
+        start (np.ndarray): начало интервала в минутах.
+        end (np.ndarray): окончание интервала в минутах.
+
+    Returns:
+        Tuple[Tuple[np.ndarray, np.ndarray, np.ndarray],
+              Tuple[np.ndarray, np.ndarray, np.ndarray]]. Номер даты,
+            начало и окончание объединённых интервалов и участков
+            пересечения, отсортированные по дате и началу.
+
+    Example:
+        >> (day, start, end), overlaps = merge_intervals_by_day(
+        >>     slot_day_idx, slot_start, slot_end
+        >> )
+    """
+    valid = start < end
+    day_idx, start, end = day_idx[valid], start[valid], end[valid]
+    order = np.lexsort((end, start, day_idx))
+    merged, overlaps = _merge_sorted_by_day(day_idx[order], start[order],
+                                            end[order])
+    overlaps, _ = _merge_sorted_by_day(*overlaps)
+    return merged, overlaps
+
+
+def merge_intervals(
+        intervals: Iterable[Interval]
+) -> Tuple[Tuple[Interval, ...], Tuple[Interval, ...]]:
+    """
+    Объединяет занятые интервалы одного дня.
+
+    Скалярный аналог merge_intervals_by_day: интервалы сортируются,
+    пересекающиеся и примыкающие объединяются за один проход.
+
+    Args:
+        intervals (Iterable[Tuple[int, int]]): занятые интервалы
+            в минутах.
+
+    Returns:
+        Tuple[Tuple[Tuple[int, int], ...], Tuple[Tuple[int, int], ...]].
+            Объединённые интервалы и участки пересечения
+            (((660, 960),), ((840, 900),))
+
+    Example:
+        >> merge_intervals([(660, 900), (840, 960)])
+    """
+    merged: List[Interval] = []
+    overlaps: List[Interval] = []
+    for start, end in sorted(intervals):
+        if start >= end:
+            continue
+        if not merged or start > merged[-1][1]:
+            merged.append((start, end))
+            continue
+        last_start, last_end = merged[-1]
+        if start < last_end:
+            overlap_end = min(end, last_end)
+            if overlaps and start <= overlaps[-1][1]:
+                overlaps[-1] = (overlaps[-1][0],
+                                max(overlaps[-1][1], overlap_end))
+            else:
+                overlaps.append((start, overlap_end))
+        if end > last_end:
+            merged[-1] = (last_start, end)
+    return tuple(merged), tuple(overlaps)
+
+
+def free_intervals_by_day(
+        day_idx: np.ndarray, day_start: np.ndarray, day_end: np.ndarray,
+        slot_day_idx: np.ndarray, slot_start: np.ndarray,
+        slot_end: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Вычисляет свободные интервалы всех дней за один векторный проход.
+
+    Векторный аналог free_intervals: служебные интервалы всех дней
+    и занятые интервалы объединяются, сортируются по (день, начало,
+    окончание), после чего свободные промежутки между нарастающим
+    максимумом окончаний и началом следующего интервала выбираются
+    маской в пределах одного дня. Дата может иметь несколько рабочих
+    интервалов, пересекающиеся рабочие интервалы объединяются.
+
+    Args:
+        day_idx (np.ndarray): порядковый номер даты рабочего дня.
+        day_start (np.ndarray): начало рабочего дня в минутах.
+        day_end (np.ndarray): окончание рабочего дня в минутах.
+        slot_day_idx (np.ndarray): порядковый номер даты таймслота.
+        slot_start (np.ndarray): начало таймслота в минутах.
+        slot_end (np.ndarray): окончание таймслота в минутах.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]. Номер даты, начало
+            и окончание свободных интервалов, отсортированные по дате
+            и началу.
+
+    Example:
+        >> gap_day, gap_start, gap_end = free_intervals_by_day(
+        >>     day_idx, day_start, day_end, slot_day_idx, slot_start, slot_end
+        >> )
+    """
+    order = np.lexsort((day_start, day_idx))
+    day_idx, day_start, day_end = \
+        day_idx[order], day_start[order], day_end[order]
+    first = np.ones(len(day_idx), dtype=bool)
+    first[1:] = day_idx[1:] != day_idx[:-1]
+    last = np.ones(len(day_idx), dtype=bool)
+    last[:-1] = first[1:]
+    reach = _running_max_by_day(day_idx, day_end)
+    prev_end = np.zeros_like(reach)
+    prev_end[1:] = reach[:-1]
+    prev_end[first] = 0
+    # Между пересекающимися рабочими интервалами служебного нет
+    between = prev_end <= day_start
+    day = np.concatenate((slot_day_idx, day_idx[between], day_idx[last]))
+    start = np.concatenate((slot_start, prev_end[between], reach[last]))
+    end = np.concatenate((slot_end, day_start[between],
+                          np.full_like(reach[last], DAY_LAST_MINUTE)))
+    order = np.lexsort((end, start, day))
+    day, start, end = day[order], start[order], end[order]
+    gap_start = _running_max_by_day(day, end)[:-1]
+    gap_end = start[1:]
+    mask = (gap_start < gap_end) & (day[:-1] == day[1:])
+    return day[1:][mask], gap_start[mask], gap_end[mask]
+
+
+def free_intervals(
+        day_bounds: Iterable[Interval], busy: Iterable[Interval]
+) -> Tuple[Interval, ...]:
+    """
+    Вычисляет свободные интервалы одного дня.
+
+    Время вне рабочих интервалов дня заполняется служебными
+    интервалами (00:00, start), (end, start) между рабочими интервалами
+    и (end, 23:59), после чего все интервалы сортируются, а свободным
+    считается промежуток между наибольшим окончанием предыдущих
+    интервалов и началом следующего. Пересекающиеся рабочие интервалы
+    объединяются.
+
+    Args:
+        day_bounds (Iterable[Tuple[int, int]]): начало и окончание
+            рабочего дня в минутах.
+        busy (Iterable[Tuple[int, int]]): занятые интервалы в минутах.
+
+    Returns:
+        Tuple[Tuple[int, int], ...]. ((720, 1050), (1200, 1260))
+
+    Example:
+        >> free_intervals([(540, 1260)], [(1050, 1200), (540, 720)])
+    """
+    intervals = list(busy)
+    prev_end = 0
+    for day_start, day_end in sorted(day_bounds):
+        if prev_end <= day_start:
+            intervals.append((prev_end, day_start))
+        prev_end = max(prev_end, day_end)
+    intervals.append((prev_end, DAY_LAST_MINUTE))
+    intervals.sort()
+    free = []
+    reach = 0
+    for start, end in intervals:
+        if reach < start:
+            free.append((reach, start))
+        reach = max(reach, end)
+    return tuple(free)
+
+
+def intervals_covered_by(
+        day_intervals: Iterable[Tuple[Interval, ...]], min_count: int
+) -> Tuple[Interval, ...]:
+    """
+    Находит интервалы, покрытые не менее чем min_count наборами.
+
+    Алгоритм заметающей прямой: концы всех интервалов сортируются
+    как события +1/-1, интервалы со счётчиком не меньше min_count
+    объединяются, если примыкают друг к другу.
+
+    Args:
+        day_intervals (Iterable[Tuple[Tuple[int, int], ...]]): наборы
+            непересекающихся интервалов одного дня, например свободные
+            интервалы нескольких расписаний.
+        min_count (int): минимальное количество наборов, покрывающих
+            интервал.
+
+    Returns:
+        Tuple[Tuple[int, int], ...]. ((600, 660),)
+
+    Example:
+        >> intervals_covered_by([((540, 720),), ((600, 660),)], 2)
+    """
+    events = []
+    for intervals in day_intervals:
+        for start, end in intervals:
+            events.append((start, 1))
+            events.append((end, -1))
+    events.sort()
+    covered = []
+    count = 0
+    opened = None
+    pos = 0
+    while pos < len(events):
+        minute = events[pos][0]
+        while pos < len(events) and events[pos][0] == minute:
+            count += events[pos][1]
+            pos += 1
+        if count >= min_count and opened is None:
+            opened = minute
+        elif count < min_count and opened is not None:
+            covered.append((opened, minute))
+            opened = None
+    return tuple(covered)
+
+
+def align_up(minutes: int, granularity: int | None) -> int:
+    """
+    Округляет время вверх до ближайшей границы сетки.
+
+    Args:
+        minutes (int, example=725): Минуты от начала суток.
+        granularity (int | None, example=15): Шаг сетки в минутах.
+            None - без округления.
+
+    Returns:
+        int. 735
+
+    Example:
+        >> align_up(725, 15)
+    """
+    if not granularity:
+        return minutes
+    return -(-minutes // granularity) * granularity
+
+
+def is_covered(
+        intervals: Tuple[Interval, ...], start: int, end: int
+) -> bool:
+    """
+    Проверяет, входит ли интервал целиком в один из интервалов дня.
+
+    Интервалы дня отсортированы и не пересекаются, поэтому достаточно
+    двоичным поиском найти последний интервал, начинающийся не позже
+    start, и сравнить его окончание с end.
+
+    Args:
+        intervals (Tuple[Tuple[int, int], ...]): отсортированные
+            непересекающиеся интервалы в минутах.
+        start (int): начало проверяемого интервала в минутах.
+        end (int): окончание проверяемого интервала в минутах.
+
+    Returns:
+        bool. True - если интервал входит в один из интервалов дня
+
+    Example:
+        >> is_covered(((720, 1050), (1200, 1260)), 780, 1050)
+    """
+    pos = bisect_right(intervals, (start, MINUTES_IN_DAY)) - 1
+    return pos >= 0 and intervals[pos][1] >= end
+
+
+class ScheduleArrays:
+    """Колоночное представление расписания в минутах от начала суток.
+
+    Даты хранятся один раз в отсортированной таблице, дни ссылаются
+    на неё порядковым номером. Таймслоты хранятся в порядке ответа API,
+    включая таймслоты с неизвестным day_id.
+
+    Attributes:
+        dates (List[str]): отсортированные уникальные даты рабочих дней.
+        day_id (np.ndarray): id рабочего дня.
+        day_date (np.ndarray): номер даты рабочего дня в dates.
+        day_start (np.ndarray): начало рабочего дня в минутах.
+        day_end (np.ndarray): окончание рабочего дня в минутах.
+        slot_id (np.ndarray): id таймслота.
+        slot_day_id (np.ndarray): id рабочего дня таймслота.
+        slot_start (np.ndarray): начало таймслота в минутах.
+        slot_end (np.ndarray): окончание таймслота в минутах.
+    """
+    __slots__ = ("dates", "day_id", "day_date", "day_start", "day_end",
+                 "slot_id", "slot_day_id", "slot_start", "slot_end")
+
+    dates: List[str]
+    day_id: np.ndarray
+    day_date: np.ndarray
+    day_start: np.ndarray
+    day_end: np.ndarray
+    slot_id: np.ndarray
+    slot_day_id: np.ndarray
+    slot_start: np.ndarray
+    slot_end: np.ndarray
+
+    def __init__(self, dates: List[str],
+                 day_id: np.ndarray, day_date: np.ndarray,
+                 day_start: np.ndarray, day_end: np.ndarray,
+                 slot_id: np.ndarray, slot_day_id: np.ndarray,
+                 slot_start: np.ndarray, slot_end: np.ndarray):
+        self.dates = dates
+        self.day_id = day_id
+        self.day_date = day_date
+        self.day_start = day_start
+        self.day_end = day_end
+        self.slot_id = slot_id
+        self.slot_day_id = slot_day_id
+        self.slot_start = slot_start
+        self.slot_end = slot_end
+
+    @classmethod
+    def from_schedule_data(
+            cls, schedule_data: Dict[str, List[Dict[str, str | int]]]
+    ) -> "ScheduleArrays":
+        """
+        Переводит ответ API в колоночное представление.
+
+        Args:
+            schedule_data (Dict[str, List[Dict[str, str | int]]]):
+                ответ API с ключами days и timeslots.
+
+        Returns:
+            ScheduleArrays
+
+        Example:
+            >> arrays = ScheduleArrays.from_schedule_data(schedule_data)
+        """
+        days = schedule_data["days"]
+        timeslots = schedule_data["timeslots"]
+        dates = sorted({day["date"] for day in days})
+        date_pos = {date: pos for pos, date in enumerate(dates)}
+        return cls(
+            dates=dates,
+            day_id=np.fromiter((day["id"] for day in days),
+                               dtype=np.int64, count=len(days)),
+            day_date=np.fromiter((date_pos[day["date"]] for day in days),
+                                 dtype=np.int32, count=len(days)),
+            day_start=times_to_minutes(
+                [day["start"] for day in days]
+            ).astype(np.uint16),
+            day_end=times_to_minutes(
+                [day["end"] for day in days]
+            ).astype(np.uint16),
+            slot_id=np.fromiter((timeslot["id"] for timeslot in timeslots),
+                                dtype=np.int64, count=len(timeslots)),
+            slot_day_id=np.fromiter(
+                (timeslot["day_id"] for timeslot in timeslots),
+                dtype=np.int64, count=len(timeslots)
+            ),
+            slot_start=times_to_minutes(
+                [timeslot["start"] for timeslot in timeslots]
+            ).astype(np.uint16),
+            slot_end=times_to_minutes(
+                [timeslot["end"] for timeslot in timeslots]
+            ).astype(np.uint16)
+        )
+
+    def to_schedule_data(self) -> Dict[str, List[Dict[str, str | int]]]:
+        """
+        Переводит колоночное представление в формат ответа API.
+
+        Returns:
+            Dict[str, List[Dict[str, str | int]]]
+
+        Example:
+            >> schedule_data = arrays.to_schedule_data()
+        """
+        dates = self.dates
+        return {
+            "days": [{"date": dates[pos],
+                      "end": _TIME_STRINGS[end],
+                      "id": day_id,
+                      "start": _TIME_STRINGS[start]}
+                     for day_id, pos, start, end in zip(
+                         self.day_id.tolist(), self.day_date.tolist(),
+                         self.day_start.tolist(), self.day_end.tolist())],
+            "timeslots": [{"day_id": day_id,
+                           "end": _TIME_STRINGS[end],
+                           "id": slot_id,
+                           "start": _TIME_STRINGS[start]}
+                          for slot_id, day_id, start, end in zip(
+                              self.slot_id.tolist(),
+                              self.slot_day_id.tolist(),
+                              self.slot_start.tolist(),
+                              self.slot_end.tolist())]
+        }
+
+    def slot_date(self) -> np.ndarray:
+        """
+        Возвращает номер даты каждого таймслота в dates.
+
+        Returns:
+            np.ndarray. -1 для таймслотов с неизвестным day_id.
+
+        Example:
+            >> slot_date = arrays.slot_date()
+        """
+        if not len(self.day_id):
+            return np.full(len(self.slot_id), -1, dtype=np.int64)
+        order = np.argsort(self.day_id, kind="stable")
+        sorted_ids = self.day_id[order]
+        pos = np.searchsorted(sorted_ids, self.slot_day_id, side="right") - 1
+        pos = np.clip(pos, 0, len(sorted_ids) - 1)
+        found = sorted_ids[pos] == self.slot_day_id
+        return np.where(found, self.day_date[order][pos],
+                        -1).astype(np.int64)
+
+
+class OverlayMap(Mapping):
+    """Словарь индекса, не изменяющийся после публикации.
+
+    Новая версия не копирует все значения: она разделяет базовый
+    словарь с прежней и хранит изменённые ключи в отдельном словаре
+    поверх него (None - ключ удалён). Когда изменений становится
+    больше корня из размера базового словаря, они сливаются в новый
+    базовый словарь, поэтому изменение стоит O(sqrt(n)) в среднем.
+
+    Порядок перебора такой же, как у словаря, из которого изменённые
+    ключи удалены и вставлены в конец.
+
+    Example:
+        >> timeslots = timeslots.updated([3], [(10, ("2025-02-17", 720,
+        >>                                           780))])
+    """
+    __slots__ = ("_base", "_changes", "_len")
+
+    _base: Dict
+    _changes: Dict
+    _len: int
+
+    def __init__(self, base: Dict, changes: Dict | None = None,
+                 length: int | None = None):
+        self._base = base
+        self._changes = changes or {}
+        self._len = len(base) if length is None else length
+
+    def __getitem__(self, key):
+        changes = self._changes
+        if key in changes:
+            value = changes[key]
+            if value is None:
+                raise KeyError(key)
+            return value
+        return self._base[key]
+
+    def __contains__(self, key) -> bool:
+        changes = self._changes
+        if key in changes:
+            return changes[key] is not None
+        return key in self._base
+
+    def __iter__(self) -> Iterator:
+        changes = self._changes
+        if not changes:
+            return iter(self._base)
+        return chain(
+            (key for key in self._base if key not in changes),
+            (key for key, value in changes.items() if value is not None)
+        )
+
+    def __len__(self) -> int:
+        return self._len
+
+    def get(self, key, default=None):
+        changes = self._changes
+        if key in changes:
+            value = changes[key]
+            return default if value is None else value
+        return self._base.get(key, default)
+
+    def values(self):
+        return self._base.values() if not self._changes else super().values()
+
+    def items(self):
+        return self._base.items() if not self._changes else super().items()
+
+    def updated(self, removed: Iterable,
+                added: Iterable[Tuple]) -> "OverlayMap":
+        """
+        Возвращает словарь с удалёнными и добавленными ключами.
+
+        Args:
+            removed (Iterable): удаляемые ключи. Отсутствующие
+                пропускаются.
+            added (Iterable[Tuple]): ключи и значения, добавляются
+                в конец. Значение имеющегося ключа заменяется.
+
+        Returns:
+            OverlayMap
+
+        Example:
+            >> timeslots = timeslots.updated([3], [])
+        """
+        base = self._base
+        changes = dict(self._changes)
+        length = self._len
+        for key in removed:
+            if key in changes:
+                if changes[key] is None:
+                    continue
+                # Ключ, добавленный поверх базового словаря, удаляется
+                # без пометки
+                del changes[key]
+                if key in base:
+                    changes[key] = None
+            elif key in base:
+                changes[key] = None
+            else:
+                continue
+            length -= 1
+        for key, value in added:
+            if key in changes:
+                if changes.pop(key) is not None:
+                    length -= 1
+            elif key in base:
+                length -= 1
+            changes[key] = value
+            length += 1
+        updated = OverlayMap(base, changes, length)
+        if len(changes) > max(64, isqrt(len(base))):
+            return OverlayMap(dict(updated.items()))
+        return updated
+
+
+class GapIndex:
+    """Дерево отрезков максимальной длины свободного интервала по дням.
+
+    Позволяет за O(log n) найти первый день диапазона, в котором есть
+    свободный интервал не короче заданного, и за O(log n) обновить
+    значение одного дня.
+
+    updated не меняет дерево: новая версия разделяет с ним список
+    узлов и хранит поверх него только узлы путей от изменённых листьев
+    к корню. Когда таких узлов становится больше корня из n * log n,
+    они сливаются в новый список.
+
+    Attributes:
+        size (int): количество листьев дерева (степень двойки).
+        tree (List[int]): максимумы узлов, корень - tree[1]. Узлы
+            из _changes заменяют значения списка.
+    """
+    __slots__ = ("size", "tree", "_changes")
+
+    size: int
+    tree: List[int]
+    _changes: Dict[int, int]
+
+    def __init__(self, max_gaps: List[int]):
+        self.size = 1
+        while self.size < len(max_gaps):
+            self.size *= 2
+        self.tree = [0] * (2 * self.size)
+        self.tree[self.size:self.size + len(max_gaps)] = max_gaps
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = max(self.tree[2 * node],
+                                  self.tree[2 * node + 1])
+        self._changes = {}
+
+    def __getitem__(self, pos: int) -> int:
+        node = pos + self.size
+        changes = self._changes
+        return changes[node] if node in changes else self.tree[node]
+
+    def leaves(self, count: int) -> List[int]:
+        """
+        Возвращает максимальные длины первых count дней.
+
+        Args:
+            count (int): количество дней.
+
+        Returns:
+            List[int]
+
+        Example:
+            >> max_gaps = gaps.leaves(len(index.dates))
+        """
+        size = self.size
+        leaves = self.tree[size:size + count]
+        for node, max_gap in self._changes.items():
+            if size <= node < size + count:
+                leaves[node - size] = max_gap
+        return leaves
+
+    def update(self, pos: int, max_gap: int) -> None:
+        """
+        Обновляет максимальную длину свободного интервала дня на месте.
+
+        Только для деревьев, которые не разделяются с другими версиями.
+
+        Args:
+            pos (int): порядковый номер дня.
+            max_gap (int): новая максимальная длина в минутах.
+
+        Example:
+            >> gaps.update(3, 120)
+        """
+        if self._changes:
+            self.tree = self.tree.copy()
+            for node, value in self._changes.items():
+                self.tree[node] = value
+            self._changes = {}
+        tree = self.tree
+        node = pos + self.size
+        tree[node] = max_gap
+        node //= 2
+        while node:
+            tree[node] = max(tree[2 * node], tree[2 * node + 1])
+            node //= 2
+
+    def updated(self, max_gaps: Iterable[Tuple[int, int]]) -> "GapIndex":
+        """
+        Возвращает дерево с новыми максимальными длинами дней.
+
+        Пересчитываются только узлы на пути от листа к корню, пока
+        значение узла меняется.
+
+        Args:
+            max_gaps (Iterable[Tuple[int, int]]): порядковый номер дня
+                и его новая максимальная длина в минутах.
+
+        Returns:
+            GapIndex
+
+        Example:
+            >> gaps = index.gaps.updated([(3, 120)])
+        """
+        tree = self.tree
+        changes = dict(self._changes)
+        for pos, max_gap in max_gaps:
+            node = pos + self.size
+            while node:
+                value = changes[node] if node in changes else tree[node]
+                if value == max_gap:
+                    break
+                changes[node] = max_gap
+                sibling = node ^ 1
+                if node > 1:
+                    max_gap = max(max_gap, changes[sibling]
+                                  if sibling in changes else tree[sibling])
+                node //= 2
+        gaps = GapIndex.__new__(GapIndex)
+        gaps.size = self.size
+        if len(changes) > max(64, isqrt(len(tree) * self.size.bit_length())):
+            tree = tree.copy()
+            for node, value in changes.items():
+                tree[node] = value
+            changes = {}
+        gaps.tree = tree
+        gaps._changes = changes
+        return gaps
+
+    def first_fit(self, length: int, lo: int, hi: int) -> int:
+        """
+        Находит первый день диапазона со свободным интервалом
+            не короче length.
+
+        Args:
+            length (int): необходимая длина в минутах.
+            lo (int): первый день диапазона.
+            hi (int): день, следующий за последним днём диапазона.
+
+        Returns:
+            int. Порядковый номер дня или -1, если такого дня нет.
+
+        Example:
+            >> gaps.first_fit(120, 0, 365)
+        """
+        tree = self.tree
+        changes = self._changes
+        stack = [(1, 0, self.size)]
+        while stack:
+            node, node_lo, node_hi = stack.pop()
+            if node_hi <= lo or hi <= node_lo:
+                continue
+            if (changes[node] if node in changes else tree[node]) < length:
+                continue
+            if node >= self.size:
+                return node_lo
+            mid = (node_lo + node_hi) // 2
+            stack.append((2 * node + 1, mid, node_hi))
+            stack.append((2 * node, node_lo, mid))
+        return -1
+
+
+class ScheduleIndex:
+    """Индекс занятых и свободных интервалов по дням.
+
+    Строится один раз по данным API, все запросы к расписанию
+    отвечаются из него без повторного разбора строк. Изменения
+    таймслотов применяются по дням: производные данные затронутого дня
+    пересчитываются и заменяются целиком, остальные дни не трогаются.
+
+    Индекс не меняется после публикации, поэтому читатели
+    не блокируются: apply_delta, with_day и with_rules возвращают новый
+    индекс, который разделяет с прежним данные незатронутых дней,
+    и он публикуется одним присваиванием.
+
+    Дни, которых нет в ответе API, могут задаваться правилами rules:
+    их свободные интервалы берутся из правила дня при запросе.
+    День из ответа API заменяет правило целиком.
+
+    Attributes:
+        dates (Tuple[str, ...]): отсортированные даты рабочих дней.
+        date_pos (Dict[str, int]): порядковый номер рабочего дня по дате.
+        day_dates (Dict[int, str]): дата рабочего дня по его id.
+        day_ids (Dict[str, int]): id первого рабочего дня с этой датой.
+        bounds (Dict[str, Tuple[Tuple[int, int], ...]]): начало
+            и окончание рабочего дня в минутах.
+        timeslots (OverlayMap[int, Tuple[str, int, int]]): дата, начало
+            и окончание таймслота по его id в порядке ответа API.
+        busy (OverlayMap[str, Dict[int, Tuple[int, int]]]): занятые
+            интервалы дня в минутах по id таймслота в порядке ответа API.
+        overlaps (OverlayMap[str, Tuple[Tuple[int, int], ...]]): участки
+            пересечения таймслотов. Только дни с пересечениями.
+        free (OverlayMap[str, Tuple[Tuple[int, int], ...]]):
+            отсортированные свободные интервалы дня в минутах.
+        gaps (GapIndex): максимальная длина свободного интервала по дням.
+        rules (RecurringSchedule | None): рабочие дни, заданные
+            правилами.
+        version (int): номер изменения индекса.
+    """
+    __slots__ = ("dates", "date_pos", "day_dates", "day_ids", "bounds",
+                 "timeslots", "last_timeslot_id", "busy", "overlaps",
+                 "free", "gaps", "rules", "version", "_gaps_by_length")
+
+    dates: Tuple[str, ...]
+    date_pos: Dict[str, int]
+    day_dates: Dict[int, str]
+    day_ids: Dict[str, int]
+    bounds: Dict[str, Tuple[Interval, ...]]
+    timeslots: OverlayMap
+    last_timeslot_id: int
+    busy: OverlayMap
+    overlaps: OverlayMap
+    free: OverlayMap
+    gaps: GapIndex
+    rules: "RecurringSchedule | None"
+    version: int
+    _gaps_by_length: Tuple[int, List[Tuple[int, int, int, int]],
+                           List[Tuple[np.ndarray, np.ndarray]] | None] | None
+
+    def __init__(self,
+                 day_dates: Dict[int, str],
+                 bounds: Dict[str, Tuple[Interval, ...]],
+                 timeslots: Dict[int, Timeslot],
+                 busy: Dict[str, Dict[int, Interval]],
+                 overlaps: Dict[str, Tuple[Interval, ...]],
+                 free: Dict[str, Tuple[Interval, ...]],
+                 last_timeslot_id: int = 0,
+                 rules: "RecurringSchedule | None" = None):
+        self.dates = tuple(sorted(bounds))
+        self.date_pos = {date: pos for pos, date in enumerate(self.dates)}
+        self.day_dates = day_dates
+        self.day_ids = {}
+        for day_id, date in day_dates.items():
+            self.day_ids.setdefault(date, day_id)
+        self.bounds = bounds
+        self.timeslots = OverlayMap(timeslots)
+        self.last_timeslot_id = max(last_timeslot_id, max(timeslots,
+                                                          default=0))
+        self.busy = OverlayMap(busy)
+        self.overlaps = OverlayMap(overlaps)
+        self.free = OverlayMap(free)
+        self.gaps = GapIndex([self._max_gap(date) for date in self.dates])
+        self.rules = rules
+        self.version = 0
+        self._gaps_by_length = None
+
+    def _copy(self) -> "ScheduleIndex":
+        index = ScheduleIndex.__new__(ScheduleIndex)
+        for name in ScheduleIndex.__slots__:
+            setattr(index, name, getattr(self, name))
+        return index
+
+    def _max_gap(self, date: str) -> int:
+        return max((end - start for start, end in self.free[date]),
+                   default=0)
+
+    @classmethod
+    def from_schedule_data(
+            cls, schedule_data: Dict[str, List[Dict[str, str | int]]],
+            rules: "RecurringSchedule | None" = None
+    ) -> "ScheduleIndex":
+        """
+        Строит индекс по ответу API.
+
+        Args:
+            schedule_data (Dict[str, List[Dict[str, str | int]]]):
+                ответ API с ключами days и timeslots.
+            rules (RecurringSchedule | None, default=None): рабочие дни,
+                заданные правилами.
+
+        Returns:
+            ScheduleIndex
+
+        Example:
+            >> index = ScheduleIndex.from_schedule_data(schedule_data)
+        """
+        return cls.from_arrays(ScheduleArrays.from_schedule_data(
+            schedule_data
+        ), rules)
+
+    @classmethod
+    @instrument(name="build_index")
+    def from_arrays(
+            cls, arrays: "ScheduleArrays",
+            rules: "RecurringSchedule | None" = None
+    ) -> "ScheduleIndex":
+        """
+        Строит индекс по колоночному представлению расписания.
+
+        Таймслоты каждого дня объединяются в непересекающиеся занятые
+        интервалы, свободные интервалы вычисляются по объединённым,
+        а участки пересечения сохраняются для проверки данных.
+
+        Args:
+            arrays (ScheduleArrays): дни и таймслоты в виде массивов.
+            rules (RecurringSchedule | None, default=None): рабочие дни,
+                заданные правилами.
+
+        Returns:
+            ScheduleIndex
+
+        Example:
+            >> index = ScheduleIndex.from_arrays(arrays)
+        """
+        dates = arrays.dates
+        day_ids = arrays.day_id.tolist()
+        day_dates = {day_id: dates[pos]
+                     for day_id, pos in zip(day_ids,
+                                            arrays.day_date.tolist())}
+        bounds: Dict[str, List[Interval]] = {date: [] for date in dates}
+        for day_id, start, end in zip(day_ids,
+                                      _shared_minutes(arrays.day_start),
+                                      _shared_minutes(arrays.day_end)):
+            bounds[day_dates[day_id]].append((start, end))
+        slot_date = arrays.slot_date()
+        known = slot_date >= 0
+        slot_date = slot_date[known]
+        slot_start = arrays.slot_start[known].astype(np.int64)
+        slot_end = arrays.slot_end[known].astype(np.int64)
+        merged, overlaps = merge_intervals_by_day(slot_date, slot_start,
+                                                  slot_end)
+        gap_day, gap_start, gap_end = free_intervals_by_day(
+            arrays.day_date.astype(np.int64),
+            arrays.day_start.astype(np.int64),
+            arrays.day_end.astype(np.int64),
+            *merged
+        )
+
+        def by_date(day: np.ndarray, start: np.ndarray, end: np.ndarray
+                    ) -> Iterator[Tuple[int, Tuple[Interval, ...]]]:
+            intervals = list(zip(_shared_minutes(start),
+                                 _shared_minutes(end)))
+            positions = np.searchsorted(day, np.arange(len(dates) + 1))
+            for pos, (first, last) in enumerate(zip(positions[:-1].tolist(),
+                                                    positions[1:].tolist())):
+                yield pos, tuple(intervals[first:last])
+        timeslots = {}
+        busy: Dict[str, Dict[int, Interval]] = {date: {} for date in dates}
+        for slot_id, pos, start, end in zip(arrays.slot_id[known].tolist(),
+                                            slot_date.tolist(),
+                                            _shared_minutes(slot_start),
+                                            _shared_minutes(slot_end)):
+            date = dates[pos]
+            timeslots[slot_id] = (date, start, end)
+            busy[date][slot_id] = (start, end)
+        return cls(
+            day_dates=day_dates,
+            bounds={date: tuple(day_bounds)
+                    for date, day_bounds in bounds.items()},
+            timeslots=timeslots,
+            busy=busy,
+            overlaps={dates[pos]: intervals
+                      for pos, intervals in by_date(*overlaps) if intervals},
+            free={dates[pos]: intervals
+                  for pos, intervals in by_date(gap_day, gap_start,
+                                                gap_end)},
+            last_timeslot_id=int(arrays.slot_id.max(initial=0)),
+            rules=rules
+        )
+
+    def to_arrays(self) -> "ScheduleArrays":
+        """
+        Переводит индекс в колоночное представление расписания.
+
+        Таймслоты относятся к первому рабочему дню своей даты.
+
+        Returns:
+            ScheduleArrays
+
+        Example:
+            >> schedule_data = index.to_arrays().to_schedule_data()
+        """
+        dates = list(self.dates)
+        day_bound_pos: Dict[str, int] = {}
+        day_start = []
+        day_end = []
+        for date in self.day_dates.values():
+            pos = day_bound_pos.get(date, 0)
+            day_bound_pos[date] = pos + 1
+            start, end = self.bounds[date][pos]
+            day_start.append(start)
+            day_end.append(end)
+        timeslots = self.timeslots
+        return ScheduleArrays(
+            dates=dates,
+            day_id=np.fromiter(self.day_dates, dtype=np.int64,
+                               count=len(self.day_dates)),
+            day_date=np.fromiter(
+                (self.date_pos[date] for date in self.day_dates.values()),
+                dtype=np.int32, count=len(self.day_dates)
+            ),
+            day_start=np.array(day_start, dtype=np.uint16),
+            day_end=np.array(day_end, dtype=np.uint16),
+            slot_id=np.fromiter(timeslots, dtype=np.int64,
+                                count=len(timeslots)),
+            slot_day_id=np.fromiter(
+                (self.day_ids[date] for date, _, _ in timeslots.values()),
+                dtype=np.int64, count=len(timeslots)
+            ),
+            slot_start=np.fromiter(
+                (start for _, start, _ in timeslots.values()),
+                dtype=np.uint16, count=len(timeslots)
+            ),
+            slot_end=np.fromiter(
+                (end for _, _, end in timeslots.values()),
+                dtype=np.uint16, count=len(timeslots)
+            )
+        )
+
+    def apply_delta(
+            self, removed_ids: Iterable[int],
+            added: Iterable[Dict[str, str | int]]
+    ) -> Tuple["ScheduleIndex", Set[str]]:
+        """
+        Возвращает индекс с изменениями таймслотов.
+
+        Этот индекс не меняется: новый разделяет с ним данные
+        незатронутых дней, пересчитываются только затронутые дни.
+        Таймслот из added с уже известным id заменяет прежний.
+
+        Args:
+            removed_ids (Iterable[int]): id удалённых таймслотов.
+            added (Iterable[Dict[str, str | int]]): добавленные таймслоты
+                в формате ответа API.
+
+        Returns:
+            Tuple[ScheduleIndex, Set[str]]. Новый индекс и даты, данные
+                которых были пересчитаны. Если ничего не изменилось,
+                возвращается этот же индекс.
+
+        Example:
+            >> index, changed = index.apply_delta(
+            >>     [3], [{"day_id": 2, "end": "13:00", "id": 10,
+            >>            "start": "12:00"}]
+            >> )
+        """
+        timeslots = self.timeslots
+        busy = self.busy
+        changed: Dict[str, Dict[int, Interval]] = {}
+        added = [(timeslot["id"], timeslot["day_id"],
+                  _shared_minute(time_to_minutes(timeslot["start"])),
+                  _shared_minute(time_to_minutes(timeslot["end"])))
+                 for timeslot in added]
+        last_timeslot_id = self.last_timeslot_id
+        removed: Dict[int, None] = {}
+        for slot_id in chain(removed_ids, [slot[0] for slot in added]):
+            slot = timeslots.get(slot_id)
+            if slot is not None and slot_id not in removed:
+                removed[slot_id] = None
+                date = slot[0]
+                if date not in changed:
+                    changed[date] = dict(busy[date])
+                del changed[date][slot_id]
+        new_slots: Dict[int, Timeslot] = {}
+        for slot_id, day_id, start, end in added:
+            if slot_id > last_timeslot_id:
+                last_timeslot_id = slot_id
+            date = self.day_dates.get(day_id)
+            if date is None:
+                continue
+            if slot_id in new_slots:
+                del changed[new_slots.pop(slot_id)[0]][slot_id]
+            new_slots[slot_id] = (date, start, end)
+            if date not in changed:
+                changed[date] = dict(busy[date])
+            changed[date][slot_id] = (start, end)
+        if not changed and last_timeslot_id == self.last_timeslot_id:
+            return self, set()
+        index = self._copy()
+        index.last_timeslot_id = last_timeslot_id
+        if not changed:
+            return index, set()
+        index.timeslots = timeslots.updated(removed, new_slots.items())
+        index.busy = busy.updated((), changed.items())
+        free = []
+        max_gaps = []
+        removed_overlaps = []
+        added_overlaps = []
+        for date, day_busy in changed.items():
+            merged, overlaps = merge_intervals(day_busy.values())
+            if overlaps:
+                added_overlaps.append((date, overlaps))
+            elif date in self.overlaps:
+                removed_overlaps.append(date)
+            day_free = free_intervals(self.bounds[date], merged)
+            free.append((date, day_free))
+            max_gaps.append((self.date_pos[date],
+                             max([end - start for start, end in day_free],
+                                 default=0)))
+        if removed_overlaps or added_overlaps:
+            index.overlaps = self.overlaps.updated(removed_overlaps,
+                                                   added_overlaps)
+        index.free = self.free.updated((), free)
+        index.gaps = self.gaps.updated(max_gaps)
+        index.version = self.version + 1
+        return index, set(changed)
+
+    def max_gap(self, date: str) -> int:
+        """
+        Возвращает длину самого длинного свободного интервала дня.
+
+        Args:
+            date (str, example="2025-02-17"): дата.
+
+        Returns:
+            int. Длина в минутах, 0 - если дня нет в расписании.
+
+        Example:
+            >> index.max_gap("2025-02-17")
+        """
+        pos = self.date_pos.get(date)
+        if pos is None:
+            rule = self._rule_for(date)
+            return rule.max_gap if rule is not None else 0
+        return self.gaps[pos]
+
+    def _rule_for(self, date: str):
+        """Служебная функция для поиска правила дня без данных API."""
+        rules = self.rules
+        if rules is None or date in self.date_pos:
+            return None
+        return rules.rule_for(date)
+
+    def has_day(self, date: str) -> bool:
+        """
+        Проверяет, есть ли рабочий день в расписании или в правилах.
+
+        Args:
+            date (str, example="2025-02-17"): дата.
+
+        Returns:
+            bool
+
+        Example:
+            >> index.has_day("2025-02-17")
+        """
+        return date in self.date_pos or self._rule_for(date) is not None
+
+    def day_free(self, date: str) -> Tuple[Interval, ...]:
+        """
+        Возвращает свободные интервалы дня.
+
+        Args:
+            date (str, example="2025-02-17"): дата.
+
+        Returns:
+            Tuple[Tuple[int, int], ...]. ((540, 750),), пустой кортеж -
+                если рабочего дня нет.
+
+        Example:
+            >> index.day_free("2025-02-17")
+        """
+        free = self.free.get(date)
+        if free is not None:
+            return free
+        rule = self._rule_for(date)
+        return rule.free if rule is not None else ()
+
+    def day_bounds(self, date: str) -> Tuple[Interval, ...]:
+        """
+        Возвращает рабочие интервалы дня.
+
+        Args:
+            date (str, example="2025-02-17"): дата.
+
+        Returns:
+            Tuple[Tuple[int, int], ...]. ((540, 1260),), пустой кортеж -
+                если рабочего дня нет.
+
+        Example:
+            >> index.day_bounds("2025-02-17")
+        """
+        bounds = self.bounds.get(date)
+        if bounds is not None:
+            return bounds
+        rule = self._rule_for(date)
+        return rule.bounds if rule is not None else ()
+
+    def day_busy(self, date: str) -> Dict[int, Interval]:
+        """
+        Возвращает занятые интервалы дня по id таймслота.
+
+        Дни, заданные правилами, таймслотов не содержат.
+
+        Args:
+            date (str, example="2025-02-17"): дата.
+
+        Returns:
+            Dict[int, Tuple[int, int]]. {5: (750, 1080)}
+
+        Example:
+            >> index.day_busy("2025-02-17")
+        """
+        return self.busy.get(date, {})
+
+    def day_merged(self, date: str) -> Tuple[Interval, ...]:
+        """
+        Возвращает объединённые занятые интервалы дня.
+
+        Вычисляются по таймслотам дня при вызове: запросы к расписанию
+        используют свободные интервалы, уже построенные по объединённым.
+
+        Args:
+            date (str, example="2025-02-18"): дата.
+
+        Returns:
+            Tuple[Tuple[int, int], ...]. ((600, 660), (690, 960))
+
+        Example:
+            >> index.day_merged("2025-02-18")
+        """
+        return merge_intervals(self.day_busy(date).values())[0]
+
+    def iter_dates(
+            self, date_from: str | None = None, date_to: str | None = None
+    ) -> Iterable[str]:
+        """
+        Перечисляет даты рабочих дней по возрастанию.
+
+        Даты дней, заданных правилами, вычисляются при переборе.
+
+        Args:
+            date_from (str | None, default=None): первая дата
+                включительно. None - без ограничения.
+            date_to (str | None, default=None): последняя дата
+                включительно. None - без ограничения.
+
+        Returns:
+            Iterable[str]. ("2025-02-16", "2025-02-17")
+
+        Example:
+            >> list(index.iter_dates("2025-02-16", "2025-02-18"))
+        """
+        lo, hi = self.date_range(date_from, date_to)
+        dates = self.dates[lo:hi]
+        rules = self.rules
+        if rules is None:
+            return dates
+        date_pos = self.date_pos
+        return heapq.merge(dates, (date for date, _ in rules.iter_days(
+            date_from, date_to
+        ) if date not in date_pos))
+
+    def with_rules(
+            self, rules: "RecurringSchedule | None"
+    ) -> "ScheduleIndex":
+        """
+        Возвращает индекс с теми же данными API и другими правилами.
+
+        Args:
+            rules (RecurringSchedule | None): рабочие дни, заданные
+                правилами.
+
+        Returns:
+            ScheduleIndex
+
+        Example:
+            >> index = index.with_rules(rules)
+        """
+        index = self._copy()
+        index.rules = rules
+        index.version = self.version + 1
+        return index
+
+    def with_day(self, date: str) -> "ScheduleIndex":
+        """
+        Возвращает индекс, в котором день по правилу стал днём расписания.
+
+        Каждый рабочий интервал правила получает новый id рабочего дня,
+        после чего в день можно добавлять таймслоты. Этот индекс
+        не меняется, данные остальных дней общие с ним, пересчитываются
+        только список дат и дерево длин интервалов.
+
+        Args:
+            date (str, example="2025-03-03"): дата дня, заданного
+                правилом.
+
+        Raises:
+            ValueError: если для даты нет правила или день уже есть
+                в расписании.
+
+        Returns:
+            ScheduleIndex
+
+        Example:
+            >> index = index.with_day("2025-03-03")
+        """
+        rule = self._rule_for(date)
+        if rule is None:
+            raise ValueError(f"No rule defines working hours of {date}")
+        first_id = max(self.day_dates, default=0) + 1
+        index = self._copy()
+        index.bounds = {**self.bounds, date: rule.bounds}
+        index.busy = self.busy.updated((), [(date, {})])
+        index.free = self.free.updated((), [(date, rule.free)])
+        index.day_dates = dict(self.day_dates)
+        for day_id in range(first_id, first_id + len(rule.bounds)):
+            index.day_dates[day_id] = date
+        index.day_ids = {**self.day_ids, date: first_id}
+        pos = bisect_left(self.dates, date)
+        max_gaps = self.gaps.leaves(len(self.dates))
+        max_gaps.insert(pos, rule.max_gap)
+        index.dates = self.dates[:pos] + (date,) + self.dates[pos:]
+        index.date_pos = {day: pos for pos, day in enumerate(index.dates)}
+        index.gaps = GapIndex(max_gaps)
+        index.version = self.version + 1
+        index._gaps_by_length = None
+        return index
+
+    def find_timeslot(self, date: str, start: int, end: int) -> int | None:
+        """
+        Находит id таймслота дня по точному совпадению времени.
+
+        Args:
+            date (str, example="2025-02-17"): дата таймслота.
+            start (int): начало таймслота в минутах.
+            end (int): окончание таймслота в минутах.
+
+        Returns:
+            int. id таймслота
+            None. Если таймслот не найден
+
+        Example:
+            >> index.find_timeslot("2025-02-17", 750, 1080)
+        """
+        for slot_id, interval in self.busy.get(date, {}).items():
+            if interval == (start, end):
+                return slot_id
+        return None
+
+    def date_range(
+            self, date_from: str | None, date_to: str | None
+    ) -> Tuple[int, int]:
+        """
+        Переводит границы дат в диапазон порядковых номеров дней.
+
+        Args:
+            date_from (str | None, example="2025-02-16"): первая дата
+                диапазона включительно. None - без ограничения.
+            date_to (str | None, example="2025-02-18"): последняя дата
+                диапазона включительно. None - без ограничения.
+
+        Returns:
+            Tuple[int, int]. Первый день и день, следующий за последним.
+
+        Example:
+            >> lo, hi = index.date_range("2025-02-16", "2025-02-18")
+        """
+        lo = 0 if date_from is None else bisect_left(self.dates, date_from)
+        hi = len(self.dates) if date_to is None else \
+            bisect_right(self.dates, date_to)
+        return lo, max(lo, hi)
+
+    def find_gaps(
+            self, duration: int, strategy: str = "earliest",
+            date_from: str | None = None, date_to: str | None = None,
+            granularity: int | None = None, limit: int = 1
+    ) -> List[Tuple[str, int, int]]:
+        """
+        Ищет свободные интервалы, вмещающие duration минут.
+
+        Интервалы дней, заданных правилами, перебираются лениво
+        и объединяются с интервалами дней расписания в порядке стратегии.
+
+        Args:
+            duration (int): необходимая длина в минутах.
+            strategy (str, default="earliest"): earliest - самые ранние
+                интервалы, best - самые короткие из подходящих.
+            date_from (str | None, default=None): первая дата поиска
+                включительно. None - без ограничения.
+            date_to (str | None, default=None): последняя дата поиска
+                включительно. None - без ограничения.
+            granularity (int | None, default=None): шаг сетки, на которую
+                выравнивается начало интервала, в минутах.
+            limit (int, default=1): максимальное количество результатов.
+
+        Returns:
+            List[Tuple[str, int, int]]. Дата, выровненное начало
+                и окончание свободного интервала.
+
+        Example:
+            >> index.find_gaps(60, strategy="best", limit=3)
+        """
+        lo, hi = self.date_range(date_from, date_to)
+        if strategy == "best":
+            candidates = self._best_fit(duration, lo, hi)
+        else:
+            candidates = self._earliest_fit(duration, lo, hi)
+        if self.rules is not None:
+            candidates = self._merge_rule_gaps(candidates, duration,
+                                               strategy, date_from, date_to)
+        found = []
+        for date, start, end in candidates:
+            start = align_up(start, granularity)
+            if start + duration <= end:
+                found.append((date, start, end))
+                if len(found) == limit:
+                    break
+        return found
+
+    def _earliest_fit(
+            self, duration: int, lo: int, hi: int
+    ) -> Iterator[Tuple[str, int, int]]:
+        gaps = self.gaps
+        pos = gaps.first_fit(duration, lo, hi)
+        while pos != -1:
+            date = self.dates[pos]
+            for start, end in self.free[date]:
+                if start + duration <= end:
+                    yield date, start, end
+            pos = gaps.first_fit(duration, pos + 1, hi)
+
+    def _best_fit(
+            self, duration: int, lo: int, hi: int
+    ) -> Iterator[Tuple[str, int, int]]:
+        if lo >= hi:
+            return
+        by_length, levels = self._sorted_gaps(lo > 0 or hi < len(self.dates))
+        first = bisect_left(by_length, (duration,))
+        if levels is None:
+            ranks = range(first, len(by_length))
+        else:
+            # Диапазон дней раскладывается на O(log n) узлов дерева,
+            # подходящие интервалы узлов уже упорядочены по длине
+            tails = []
+            level = 0
+            while lo < hi:
+                if lo & 1:
+                    tails.append((level, lo))
+                    lo += 1
+                if hi & 1:
+                    hi -= 1
+                    tails.append((level, hi))
+                lo >>= 1
+                hi >>= 1
+                level += 1
+            ranks = heapq.merge(*(
+                iter(node[np.searchsorted(node, first):])
+                for node in (levels[level][0][levels[level][1][pos]:
+                                              levels[level][1][pos + 1]]
+                             for level, pos in tails)
+            ))
+        dates = self.dates
+        for rank in ranks:
+            _, pos, start, end = by_length[rank]
+            yield dates[pos], start, end
+
+    def _sorted_gaps(
+            self, with_levels: bool
+    ) -> Tuple[List[Tuple[int, int, int, int]],
+               List[Tuple[np.ndarray, np.ndarray]] | None]:
+        """
+        Служебная функция для кэша свободных интервалов по длине.
+
+        by_length - интервалы всех дней, отсортированные по (длина,
+            номер дня, начало). levels - дерево отрезков по дням:
+            уровень L хранит номера интервалов by_length, сгруппированные
+            по блокам из 2 ** L дней (внутри блока по возрастанию),
+            и границы блоков. Кэш строится один раз на версию индекса,
+            уровни - при первом поиске по диапазону дат.
+        """
+        version = self.version
+        cached = self._gaps_by_length
+        if cached is None or cached[0] != version:
+            cached = (version, sorted(
+                (end - start, pos, start, end)
+                for pos, date in enumerate(self.dates)
+                for start, end in self.free[date]
+            ), None)
+            self._gaps_by_length = cached
+        _, by_length, levels = cached
+        if with_levels and levels is None:
+            gap_pos = np.fromiter((gap[1] for gap in by_length),
+                                  dtype=np.int64, count=len(by_length))
+            levels = []
+            blocks = len(self.dates)
+            level = 0
+            while True:
+                block = gap_pos >> level
+                order = np.argsort(block, kind="stable")
+                levels.append((order.astype(np.int32),
+                               np.searchsorted(block[order],
+                                               np.arange(blocks + 1))))
+                if blocks <= 1:
+                    break
+                blocks = (blocks + 1) // 2
+                level += 1
+            self._gaps_by_length = (version, by_length, levels)
+        return by_length, levels
+
+    def _merge_rule_gaps(
+            self, candidates: Iterator[Tuple[str, int, int]],
+            duration: int, strategy: str,
+            date_from: str | None, date_to: str | None
+    ) -> Iterator[Tuple[str, int, int]]:
+        """
+        Служебная функция для добавления интервалов дней по правилам.
+
+        Для earliest дни правил перебираются по датам, для best -
+        отдельным потоком по каждому подходящему интервалу правила,
+        поскольку у всех дней правила интервалы одинаковы.
+        """
+        rules = self.rules
+        date_pos = self.date_pos
+
+        def rule_days(rule, start: int, end: int):
+            for date, _ in rules.iter_days(date_from, date_to, rule):
+                if date not in date_pos:
+                    yield date, start, end
+
+        if strategy == "best":
+            streams = [candidates]
+            for rule in rules.rules:
+                streams.extend(rule_days(rule, start, end)
+                               for start, end in rule.free
+                               if start + duration <= end)
+            return heapq.merge(*streams, key=lambda gap: (gap[2] - gap[1],
+                                                          gap[0], gap[1]))
+        rule_gaps = (
+            (date, start, end)
+            for date, rule in rules.iter_days(date_from, date_to)
+            if rule.max_gap >= duration and date not in date_pos
+            for start, end in rule.free if start + duration <= end
+        )
+        return heapq.merge(candidates, rule_gaps,
+                           key=lambda gap: (gap[0], gap[1]))
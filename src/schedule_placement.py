@@ -0,0 +1,229 @@
+import heapq
+from typing import Iterable, List, Sequence, Set, Tuple
+
+from schedule_index import GapIndex, Interval, MINUTES_IN_DAY, ScheduleIndex
+
+
+class GapAllocator:
+    """Последовательное размещение встреч в свободных интервалах.
+
+    Свободные интервалы всех дней нумеруются по дате и началу.
+    Встреча занимает начало выбранного интервала, остаток интервала
+    остаётся свободным для следующих встреч, поэтому размещённые
+    встречи не пересекаются между собой и с таймслотами расписания.
+
+    earliest ищет первый интервал нужной длины деревом отрезков
+    GapIndex по длинам интервалов, best - самый короткий подходящий
+    интервал: интервалы разложены по корзинам длины (куча номеров
+    в каждой), первая непустая корзина не короче встречи ищется
+    деревом отрезков по корзинам. Размещение одной встречи занимает
+    O(log n).
+
+    Attributes:
+        dates (Tuple[str, ...]): отсортированные даты.
+        strategy (str): earliest или best.
+        buffer (int): минимальный промежуток в минутах между встречей
+            и соседними таймслотами или встречами.
+        max_per_day (int | None): максимальное количество встреч,
+            размещаемых в один день.
+
+    Example:
+        >> allocator = GapAllocator.from_index(index, strategy="best",
+        >>                                     buffer=10)
+        >> allocator.place(60)
+    """
+    __slots__ = ("dates", "strategy", "buffer", "max_per_day", "_gap_day",
+                 "_starts", "_ends", "_day_gaps", "_placed", "_closed",
+                 "_gaps", "_buckets", "_filled")
+
+    def __init__(self, dates: Sequence[str],
+                 day_bounds: Iterable[Tuple[Interval, ...]],
+                 day_free: Iterable[Tuple[Interval, ...]],
+                 strategy: str = "earliest", buffer: int = 0,
+                 max_per_day: int | None = None):
+        if strategy not in ("earliest", "best"):
+            raise ValueError("strategy must be 'earliest' or 'best'")
+        if not isinstance(buffer, int) or buffer < 0:
+            raise ValueError("buffer must be a non-negative integer")
+        if max_per_day is not None and (not isinstance(max_per_day, int) or
+                                        max_per_day <= 0):
+            raise ValueError("max_per_day must be a positive integer")
+        self.dates = tuple(dates)
+        self.strategy = strategy
+        self.buffer = buffer
+        self.max_per_day = max_per_day
+        self._gap_day: List[int] = []
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        self._day_gaps: List[range] = []
+        for pos, bounds, free in zip(range(len(self.dates)), day_bounds,
+                                     day_free):
+            first = len(self._starts)
+            # Буфер нужен только со стороны занятого времени, а не границы
+            # рабочего дня
+            bound_starts = {start for start, _ in bounds}
+            bound_ends = {end for _, end in bounds}
+            for start, end in free:
+                self._gap_day.append(pos)
+                self._starts.append(start if start in bound_starts
+                                    else start + buffer)
+                self._ends.append(end if end in bound_ends else end - buffer)
+            self._day_gaps.append(range(first, len(self._starts)))
+        self._placed = [0] * len(self.dates)
+        self._closed: Set[int] = set()
+        lengths = [max(end - start, 0)
+                   for start, end in zip(self._starts, self._ends)]
+        if strategy == "best":
+            self._buckets: List[List[int]] = [
+                [] for _ in range(MINUTES_IN_DAY + 1)
+            ]
+            for gap, length in enumerate(lengths):
+                self._buckets[length].append(gap)
+            self._filled = GapIndex([int(bool(gaps))
+                                     for gaps in self._buckets])
+        else:
+            self._gaps = GapIndex(lengths)
+
+    @classmethod
+    def from_index(
+            cls, index: ScheduleIndex,
+            date_from: str | None = None, date_to: str | None = None,
+            strategy: str = "earliest", buffer: int = 0,
+            max_per_day: int | None = None
+    ) -> "GapAllocator":
+        """
+        Строит распределитель по индексу, включая дни по правилам.
+
+        Args:
+            index (ScheduleIndex): индекс расписания.
+            date_from (str | None, default=None): первая дата
+                включительно. None - без ограничения.
+            date_to (str | None, default=None): последняя дата
+                включительно. None - без ограничения.
+            strategy (str, default="earliest"): earliest или best.
+            buffer (int, default=0): промежуток между встречами в минутах.
+            max_per_day (int | None, default=None): максимальное
+                количество встреч в день. None - без ограничения.
+
+        Raises:
+            ValueError: если strategy, buffer или max_per_day не прошли
+                валидацию.
+
+        Returns:
+            GapAllocator
+
+        Example:
+            >> allocator = GapAllocator.from_index(index, "2025-02-01")
+        """
+        dates = list(index.iter_dates(date_from, date_to))
+        return cls(dates, (index.day_bounds(date) for date in dates),
+                   (index.day_free(date) for date in dates),
+                   strategy, buffer, max_per_day)
+
+    def _length(self, gap: int) -> int:
+        return max(self._ends[gap] - self._starts[gap], 0)
+
+    def _find(self, duration: int) -> int:
+        """Служебная функция для выбора интервала по стратегии."""
+        if self.strategy != "best":
+            return self._gaps.first_fit(duration, 0, len(self._starts))
+        buckets = self._buckets
+        while True:
+            length = self._filled.first_fit(1, duration, len(buckets))
+            if length == -1:
+                return -1
+            bucket = buckets[length]
+            # Номера интервалов закрытых дней и изменившейся длины
+            # удаляются из корзины лениво
+            while bucket and (self._gap_day[bucket[0]] in self._closed or
+                              self._length(bucket[0]) != length):
+                heapq.heappop(bucket)
+            if bucket:
+                return bucket[0]
+            self._filled.update(length, 0)
+
+    def _set_length(self, gap: int, length: int) -> None:
+        """Служебная функция для обновления длины интервала в индексе."""
+        if self.strategy != "best":
+            self._gaps.update(gap, length)
+            return
+        if not length:
+            return
+        bucket = self._buckets[length]
+        heapq.heappush(bucket, gap)
+        if len(bucket) == 1:
+            self._filled.update(length, 1)
+
+    def place(self, duration: int) -> Tuple[str, int, int] | None:
+        """
+        Размещает встречу и резервирует её время.
+
+        Args:
+            duration (int): длина встречи в минутах.
+
+        Raises:
+            ValueError: если duration не является int или менее 1.
+
+        Returns:
+            Tuple[str, int, int]. Дата, начало и окончание встречи
+                в минутах ('2025-02-15', 720, 780)
+            None. Если подходящего интервала нет
+
+        Example:
+            >> allocator.place(60)
+        """
+        if not isinstance(duration, int) or isinstance(duration, bool):
+            raise ValueError("duration_minutes must be an integer")
+        if duration <= 0:
+            raise ValueError("duration_minutes must be "
+                             "positive and more than 0")
+        gap = self._find(duration)
+        if gap == -1:
+            return None
+        pos = self._gap_day[gap]
+        start = self._starts[gap]
+        end = start + duration
+        self._starts[gap] = end + self.buffer
+        self._set_length(gap, self._length(gap))
+        self._placed[pos] += 1
+        if self.max_per_day is not None and \
+                self._placed[pos] >= self.max_per_day:
+            self._close_day(pos)
+        return self.dates[pos], start, end
+
+    def _close_day(self, pos: int) -> None:
+        """Служебная функция для исключения дня из дальнейшего поиска."""
+        self._closed.add(pos)
+        if self.strategy == "best":
+            return
+        for gap in self._day_gaps[pos]:
+            self._gaps.update(gap, 0)
+
+    def place_many(
+            self, durations: Iterable[int]
+    ) -> List[Tuple[str, int, int] | None]:
+        """
+        Размещает встречи в порядке durations.
+
+        Args:
+            durations (Iterable[int]): длины встреч в минутах.
+
+        Raises:
+            ValueError: если одна из длин не прошла валидацию.
+
+        Returns:
+            List[Tuple[str, int, int] | None]. Размещение каждой встречи
+                или None, если её не удалось разместить.
+
+        Example:
+            >> allocator.place_many([60, 30, 90])
+        """
+        return [self.place(duration) for duration in durations]
+
+    @property
+    def free(self) -> List[Tuple[str, int, int]]:
+        """Оставшиеся свободные интервалы с учётом буфера."""
+        return [(self.dates[pos], self._starts[gap], self._ends[gap])
+                for pos, gaps in enumerate(self._day_gaps)
+                if pos not in self._closed
+                for gap in gaps if self._length(gap)]
@@ -0,0 +1,220 @@
+from datetime import date as Date
+from typing import FrozenSet, Iterable, Iterator, Tuple
+
+from schedule_index import Interval
+
+from scheduler import parse_date, parse_time
+
+WORKDAYS = (0, 1, 2, 3, 4)
+
+
+def _parse_date(date_string: str) -> int:
+    if not isinstance(date_string, str):
+        raise ValueError("date must be a string")
+    return parse_date(date_string)
+
+
+class DayRule:
+    """Рабочие часы повторяющихся дней недели.
+
+    Свободные интервалы дня по правилу вычисляются один раз и общие для
+    всех дней, к которым правило применяется.
+
+    Attributes:
+        hours (Tuple[Tuple[str, str], ...]): начало и окончание рабочих
+            интервалов дня.
+        weekdays (FrozenSet[int]): дни недели, 0 - понедельник.
+        date_from (str | None): первая дата действия правила.
+        date_to (str | None): последняя дата действия правила.
+        bounds (Tuple[Tuple[int, int], ...]): рабочие интервалы в минутах.
+        free (Tuple[Tuple[int, int], ...]): свободные интервалы дня
+            в минутах - объединённые рабочие интервалы.
+        max_gap (int): длина самого длинного свободного интервала.
+
+    Example:
+        >> DayRule([("09:00", "18:00")])
+        >> DayRule([("10:00", "14:00")], weekdays=[5],
+        >>         date_from="2025-06-01", date_to="2025-08-31")
+    """
+    __slots__ = ("hours", "weekdays", "date_from", "date_to", "bounds",
+                 "free", "max_gap", "_first", "_last")
+
+    hours: Tuple[Tuple[str, str], ...]
+    weekdays: FrozenSet[int]
+    date_from: str | None
+    date_to: str | None
+    bounds: Tuple[Interval, ...]
+    free: Tuple[Interval, ...]
+    max_gap: int
+
+    def __init__(self,
+                 hours: Iterable[Tuple[str, str]],
+                 weekdays: Iterable[int] = WORKDAYS,
+                 date_from: str | None = None,
+                 date_to: str | None = None):
+        self.hours = tuple((start, end) for start, end in hours)
+        if not self.hours:
+            raise ValueError("hours must not be empty")
+        bounds = []
+        for start, end in self.hours:
+            if not isinstance(start, str) or not isinstance(end, str):
+                raise ValueError("time must be a string")
+            start, end = parse_time(start), parse_time(end)
+            if start >= end:
+                raise ValueError("Start time must be before end time")
+            bounds.append((start, end))
+        self.weekdays = frozenset(weekdays)
+        if not self.weekdays <= frozenset(range(7)):
+            raise ValueError("weekdays must be integers from 0 to 6")
+        self.date_from = date_from
+        self.date_to = date_to
+        self._first = _parse_date(date_from) \
+            if date_from is not None else 0
+        self._last = _parse_date(date_to) \
+            if date_to is not None else Date.max.toordinal()
+        self.bounds = tuple(sorted(bounds))
+        free = []
+        for start, end in self.bounds:
+            if free and start <= free[-1][1]:
+                free[-1] = (free[-1][0], max(free[-1][1], end))
+            else:
+                free.append((start, end))
+        self.free = tuple(free)
+        self.max_gap = max((end - start for start, end in self.free),
+                           default=0)
+
+    def __repr__(self) -> str:
+        return (f"DayRule({list(self.hours)!r}, "
+                f"weekdays={sorted(self.weekdays)!r}, "
+                f"date_from={self.date_from!r}, date_to={self.date_to!r})")
+
+    def applies(self, ordinal: int) -> bool:
+        """
+        Проверяет, применяется ли правило к дню.
+
+        Args:
+            ordinal (int): порядковый номер дня.
+
+        Returns:
+            bool
+
+        Example:
+            >> rule.applies(parse_date("2025-02-17"))
+        """
+        return (self._first <= ordinal <= self._last and
+                (ordinal - 1) % 7 in self.weekdays)
+
+
+class RecurringSchedule:
+    """Рабочие дни, заданные правилами на горизонте планирования.
+
+    Дни не разворачиваются в строки расписания: рабочие часы дня
+    определяются по правилам при запросе. К дню применяется первое
+    подходящее правило, поэтому исключения (например, короткая пятница)
+    указываются раньше общих правил. В праздники рабочего дня нет.
+
+    Attributes:
+        rules (Tuple[DayRule, ...]): правила в порядке приоритета.
+        date_from (str): первая дата горизонта.
+        date_to (str): последняя дата горизонта.
+        holidays (FrozenSet[str]): даты без рабочего дня.
+
+    Example:
+        >> rules = RecurringSchedule(
+        >>     [DayRule([("09:00", "16:00")], weekdays=[4]),
+        >>      DayRule([("09:00", "18:00")])],
+        >>     date_from="2025-01-01", date_to="2027-12-31",
+        >>     holidays=["2025-01-01", "2025-05-09"]
+        >> )
+        >> scheduler = Scheduler(rules=rules)
+    """
+    __slots__ = ("rules", "date_from", "date_to", "holidays",
+                 "_first", "_last", "_holidays")
+
+    rules: Tuple[DayRule, ...]
+    date_from: str
+    date_to: str
+    holidays: FrozenSet[str]
+
+    def __init__(self,
+                 rules: Iterable[DayRule],
+                 date_from: str,
+                 date_to: str,
+                 holidays: Iterable[str] = ()):
+        self.rules = tuple(rules)
+        if not all(isinstance(rule, DayRule) for rule in self.rules):
+            raise ValueError("rules must be DayRule instances")
+        self._first = _parse_date(date_from)
+        self._last = _parse_date(date_to)
+        if self._first > self._last:
+            raise ValueError("date_from must not be later than date_to")
+        self.date_from = date_from
+        self.date_to = date_to
+        self.holidays = frozenset(holidays)
+        self._holidays = frozenset(_parse_date(holiday)
+                                   for holiday in self.holidays)
+
+    def _rule(self, ordinal: int) -> DayRule | None:
+        if ordinal in self._holidays:
+            return None
+        for rule in self.rules:
+            if rule.applies(ordinal):
+                return rule
+        return None
+
+    def rule_for(self, date: str) -> DayRule | None:
+        """
+        Возвращает правило, определяющее рабочие часы дня.
+
+        Args:
+            date (str, example="2025-02-17"): дата.
+
+        Returns:
+            DayRule
+            None. Если дата вне горизонта, праздник или ни одно правило
+                к ней не применяется
+
+        Example:
+            >> rules.rule_for("2025-02-17").bounds
+        """
+        try:
+            ordinal = _parse_date(date)
+        except ValueError:
+            return None
+        if not self._first <= ordinal <= self._last:
+            return None
+        return self._rule(ordinal)
+
+    def iter_days(
+            self, date_from: str | None = None,
+            date_to: str | None = None,
+            rule: DayRule | None = None
+    ) -> Iterator[Tuple[str, DayRule]]:
+        """
+        Перечисляет рабочие дни по правилам в порядке дат.
+
+        Args:
+            date_from (str | None, default=None): первая дата
+                включительно. None - начало горизонта.
+            date_to (str | None, default=None): последняя дата
+                включительно. None - конец горизонта.
+            rule (DayRule | None, default=None): перечислять только дни,
+                рабочие часы которых определяет это правило.
+
+        Returns:
+            Iterator[Tuple[str, DayRule]]. Дата и правило дня.
+
+        Example:
+            >> for date, rule in rules.iter_days("2025-03-01"):
+            >>     print(date, rule.bounds)
+        """
+        first = self._first if date_from is None else \
+            max(self._first, _parse_date(date_from))
+        last = self._last if date_to is None else \
+            min(self._last, _parse_date(date_to))
+        for ordinal in range(first, last + 1):
+            if rule is not None and not rule.applies(ordinal):
+                continue
+            day_rule = self._rule(ordinal)
+            if day_rule is not None and (rule is None or day_rule is rule):
+                yield Date.fromordinal(ordinal).isoformat(), day_rule
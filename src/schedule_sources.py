@@ -0,0 +1,372 @@
+"""Источники расписания для Scheduler.
+
+HTTPSource отдаёт ответ API, JSONFileSource - файл в формате ответа
+API, SQLiteSource - базу SQLite с индексами по дате дня и по началу
+таймслота. Для SQLiteSource запросы к расписанию с фильтром по датам
+выполняются индексированным SQL без загрузки всей истории в память.
+"""
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from contextlib import closing
+from pathlib import Path
+from typing import (Dict, Iterable, List, Optional, Sequence,
+                    TYPE_CHECKING, Tuple)
+
+import numpy as np
+
+from schedule_index import ScheduleArrays
+
+from schedule_stream import parse_schedule_stream
+
+from settings import REQUEST_TIMEOUT, STREAM_CHUNK_SIZE
+
+if TYPE_CHECKING:
+    import requests
+
+ScheduleData = Dict[str, List[Dict[str, str | int]]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS days (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    start INTEGER NOT NULL,
+    "end" INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS days_date ON days (date);
+CREATE TABLE IF NOT EXISTS timeslots (
+    id INTEGER PRIMARY KEY,
+    day_id INTEGER NOT NULL,
+    start INTEGER NOT NULL,
+    "end" INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS timeslots_day_start ON timeslots (day_id, start);
+"""
+
+
+class ScheduleSource(ABC):
+    """Источник расписания."""
+
+    @property
+    @abstractmethod
+    def key(self) -> str:
+        """Ключ источника для кэша снимков и журналов."""
+
+    @abstractmethod
+    def load(self) -> ScheduleData | ScheduleArrays:
+        """
+        Загружает расписание целиком.
+
+        Returns:
+            Dict[str, List[Dict[str, str | int]]] | ScheduleArrays.
+                Расписание в формате ответа API или в колоночном
+                представлении.
+        """
+
+
+class PushdownSource(ScheduleSource):
+    """Источник, который умеет загружать только дни выбранных дат.
+
+    Scheduler с таким источником не загружает расписание целиком
+    для запросов по датам.
+    """
+
+    @abstractmethod
+    def load_dates(
+            self, date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            dates: Optional[Sequence[str]] = None
+    ) -> ScheduleArrays:
+        """
+        Загружает дни выбранных дат и их таймслоты.
+
+        Args:
+            date_from (Optional[str], default=None): первая дата
+                включительно.
+            date_to (Optional[str], default=None): последняя дата
+                включительно.
+            dates (Optional[Sequence[str]], default=None): отдельные
+                даты вместо диапазона.
+
+        Returns:
+            ScheduleArrays
+        """
+
+
+class HTTPSource(ScheduleSource):
+    """Ответ API по HTTP.
+
+    Scheduler с этим источником работает так же, как Scheduler(api_url):
+    с условными запросами в refresh и кэшем снимков.
+
+    Attributes:
+        api_url (str): URL Endpoint расписания.
+        session (requests.Session | None): HTTP сессия. None - общая
+            сессия get_session().
+        timeout (float): таймаут запроса в секундах.
+        stream (bool): разбирать ответ по мере получения.
+
+    Example:
+        >> scheduler = Scheduler(source=HTTPSource(api_url, timeout=5))
+    """
+
+    def __init__(self, api_url: str,
+                 session: "requests.Session | None" = None,
+                 timeout: float = REQUEST_TIMEOUT,
+                 stream: bool = False):
+        self.api_url = api_url
+        self.session = session
+        self.timeout = timeout
+        self.stream = stream
+
+    @property
+    def key(self) -> str:
+        return self.api_url
+
+    def load(self) -> ScheduleData | ScheduleArrays:
+        """
+        Загружает ответ API.
+
+        Raises:
+            requests.RequestException: если запрос к API не удался.
+            ValueError: если ответ API не является объектом JSON.
+
+        Returns:
+            Dict[str, List[Dict[str, str | int]]] | ScheduleArrays.
+                ScheduleArrays - если включён stream и в ответе есть days.
+
+        Example:
+            >> schedule_data = HTTPSource(api_url).load()
+        """
+        from scheduler import get_session
+
+        session = self.session if self.session is not None \
+            else get_session()
+        with session.get(self.api_url, timeout=self.timeout,
+                         stream=self.stream) as response:
+            response.raise_for_status()
+            if not self.stream:
+                return response.json()
+            arrays, data = parse_schedule_stream(
+                response.iter_content(STREAM_CHUNK_SIZE)
+            )
+        return arrays if arrays is not None else data
+
+
+class JSONFileSource(ScheduleSource):
+    """Файл JSON в формате ответа API.
+
+    Attributes:
+        path (Path): путь к файлу.
+
+    Example:
+        >> scheduler = Scheduler(source=JSONFileSource("schedule.json"))
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path).resolve()
+
+    @property
+    def key(self) -> str:
+        return self.path.as_uri()
+
+    def load(self) -> ScheduleData:
+        """
+        Читает файл расписания.
+
+        Raises:
+            OSError: если файл не читается.
+            ValueError: если файл не является объектом JSON.
+
+        Returns:
+            Dict[str, List[Dict[str, str | int]]]
+
+        Example:
+            >> schedule_data = JSONFileSource("schedule.json").load()
+        """
+        with open(self.path, "rb") as f:
+            schedule_data = json.load(f)
+        if not isinstance(schedule_data, dict):
+            raise ValueError("Schedule file must contain a JSON object")
+        return schedule_data
+
+
+class SQLiteSource(PushdownSource):
+    """База SQLite с днями и таймслотами расписания.
+
+    Время хранится в минутах от начала суток. Таблица days
+    проиндексирована по date, timeslots - по (day_id, start), поэтому
+    load_dates читает только строки выбранных дат. Соединение
+    открывается на каждый запрос только для чтения, поэтому источник
+    можно использовать из нескольких потоков.
+
+    Attributes:
+        path (Path): путь к базе.
+
+    Example:
+        >> source = SQLiteSource.create("history.db", schedule_data)
+        >> scheduler = Scheduler(source=source)
+        >> scheduler.get_free_slots("2025-02-17")
+    """
+
+    def __init__(self, path: str | os.PathLike):
+        self.path = Path(path).resolve()
+        if not self.path.is_file():
+            raise FileNotFoundError(f"Schedule database not found: "
+                                    f"{self.path}")
+
+    @property
+    def key(self) -> str:
+        return self.path.as_uri()
+
+    @classmethod
+    def create(
+            cls, path: str | os.PathLike,
+            schedule_data: ScheduleData | ScheduleArrays
+    ) -> "SQLiteSource":
+        """
+        Записывает расписание в базу SQLite.
+
+        Таблицы и индексы создаются, если их нет, прежнее содержимое
+        заменяется в одной транзакции.
+
+        Args:
+            path (str | os.PathLike): путь к базе.
+            schedule_data (Dict[str, List[Dict[str, str | int]]] |
+                ScheduleArrays): расписание в формате ответа API или
+                в колоночном представлении.
+
+        Raises:
+            KeyError: если у дня или таймслота нет обязательного поля.
+            sqlite3.IntegrityError: если id дней или таймслотов
+                повторяются.
+
+        Returns:
+            SQLiteSource
+
+        Example:
+            >> source = SQLiteSource.create("history.db",
+            >>                              HTTPSource(api_url).load())
+        """
+        arrays = schedule_data if isinstance(schedule_data, ScheduleArrays) \
+            else ScheduleArrays.from_schedule_data(schedule_data)
+        dates = arrays.dates
+        with closing(sqlite3.connect(path)) as connection:
+            with connection:
+                connection.executescript(_SCHEMA)
+                connection.execute("DELETE FROM timeslots")
+                connection.execute("DELETE FROM days")
+                connection.executemany(
+                    'INSERT INTO days (id, date, start, "end") '
+                    'VALUES (?, ?, ?, ?)',
+                    zip(arrays.day_id.tolist(),
+                        (dates[pos] for pos in arrays.day_date.tolist()),
+                        arrays.day_start.tolist(), arrays.day_end.tolist())
+                )
+                connection.executemany(
+                    'INSERT INTO timeslots (id, day_id, start, "end") '
+                    'VALUES (?, ?, ?, ?)',
+                    zip(arrays.slot_id.tolist(), arrays.slot_day_id.tolist(),
+                        arrays.slot_start.tolist(), arrays.slot_end.tolist())
+                )
+        return cls(path)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"{self.key}?mode=ro", uri=True)
+
+    def load(self) -> ScheduleArrays:
+        """
+        Загружает расписание целиком.
+
+        Таймслоты возвращаются в порядке id.
+
+        Returns:
+            ScheduleArrays
+
+        Example:
+            >> arrays = SQLiteSource("history.db").load()
+        """
+        with closing(self._connect()) as connection:
+            days = connection.execute(
+                'SELECT id, date, start, "end" FROM days'
+            ).fetchall()
+            timeslots = connection.execute(
+                'SELECT id, day_id, start, "end" FROM timeslots ORDER BY id'
+            ).fetchall()
+        return _to_arrays(days, timeslots)
+
+    def load_dates(
+            self, date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            dates: Optional[Sequence[str]] = None
+    ) -> ScheduleArrays:
+        """
+        Загружает дни выбранных дат и их таймслоты по индексам.
+
+        Args:
+            date_from (Optional[str], default=None, example="2025-02-16"):
+                первая дата включительно.
+            date_to (Optional[str], default=None, example="2025-02-18"):
+                последняя дата включительно.
+            dates (Optional[Sequence[str]], default=None,
+                example=["2025-02-17"]): отдельные даты вместо диапазона.
+
+        Returns:
+            ScheduleArrays
+
+        Example:
+            >> arrays = source.load_dates("2025-02-16", "2025-02-18")
+        """
+        if dates is not None:
+            condition = "date IN (SELECT value FROM json_each(?))"
+            params: Tuple[str, ...] = (json.dumps(list(dates)),)
+        else:
+            conditions = []
+            params = ()
+            if date_from is not None:
+                conditions.append("date >= ?")
+                params += (date_from,)
+            if date_to is not None:
+                conditions.append("date <= ?")
+                params += (date_to,)
+            condition = " AND ".join(conditions) or "1"
+        with closing(self._connect()) as connection:
+            days = connection.execute(
+                f'SELECT id, date, start, "end" FROM days WHERE {condition}',
+                params
+            ).fetchall()
+            timeslots = connection.execute(
+                f'SELECT timeslots.id, day_id, timeslots.start, '
+                f'timeslots."end" FROM timeslots '
+                f'JOIN (SELECT id FROM days WHERE {condition}) AS selected '
+                f'ON day_id = selected.id ORDER BY timeslots.id',
+                params
+            ).fetchall()
+        return _to_arrays(days, timeslots)
+
+
+def _to_arrays(
+        days: Iterable[Tuple[int, str, int, int]],
+        timeslots: Iterable[Tuple[int, int, int, int]]
+) -> ScheduleArrays:
+    """Переводит строки таблиц days и timeslots в ScheduleArrays."""
+    days = list(days)
+    dates = sorted({date for _, date, _, _ in days})
+    date_pos = {date: pos for pos, date in enumerate(dates)}
+    day_id, day_date, day_start, day_end = (
+        zip(*days) if days else ((), (), (), ())
+    )
+    slots = np.array(list(timeslots), dtype=np.int64).reshape(-1, 4)
+    return ScheduleArrays(
+        dates=dates,
+        day_id=np.array(day_id, dtype=np.int64),
+        day_date=np.fromiter((date_pos[date] for date in day_date),
+                             dtype=np.int32, count=len(days)),
+        day_start=np.array(day_start, dtype=np.uint16),
+        day_end=np.array(day_end, dtype=np.uint16),
+        slot_id=slots[:, 0].copy(),
+        slot_day_id=slots[:, 1].copy(),
+        slot_start=slots[:, 2].astype(np.uint16),
+        slot_end=slots[:, 3].astype(np.uint16)
+    )
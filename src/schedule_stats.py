@@ -0,0 +1,276 @@
+from itertools import chain
+from typing import Any, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+from schedule_index import (Interval,
+                            MINUTES_IN_DAY,
+                            ScheduleIndex,
+                            merge_intervals_by_day,
+                            minutes_to_time)
+
+# Границы корзин распределения длин свободных интервалов в минутах
+GAP_BINS = (0, 15, 30, 60, 120, 240, MINUTES_IN_DAY)
+# Свободные интервалы короче этой длины считаются непригодными
+MIN_USABLE_GAP = 15
+
+
+def _flatten(
+        day_intervals: Iterable[Tuple[Interval, ...]]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Переводит интервалы дней в массивы номера дня, начала и окончания."""
+    counts: List[int] = []
+
+    def counted() -> Iterator[Tuple[Interval, ...]]:
+        for intervals in day_intervals:
+            counts.append(len(intervals))
+            yield intervals
+
+    flat = np.fromiter(chain.from_iterable(
+        chain.from_iterable(intervals) for intervals in counted()
+    ), dtype=np.int64).reshape(-1, 2)
+    day = np.repeat(np.arange(len(counts), dtype=np.int64), counts)
+    return day, flat[:, 0], flat[:, 1]
+
+
+def _minutes_by_hour(start: np.ndarray, end: np.ndarray) -> np.ndarray:
+    """Суммирует минуты интервалов всех дней по часам суток."""
+    edges = (np.bincount(start, minlength=MINUTES_IN_DAY + 1) -
+             np.bincount(end, minlength=MINUTES_IN_DAY + 1))
+    return np.cumsum(edges)[:MINUTES_IN_DAY].reshape(24, 60).sum(axis=1)
+
+
+class ScheduleStats:
+    """Показатели загрузки расписания за диапазон дат.
+
+    Все показатели считаются одним векторным проходом по рабочим
+    и свободным интервалам дней. Занятыми считаются минуты рабочего
+    времени, не входящие в свободные интервалы, поэтому таймслоты вне
+    рабочего времени загрузку не увеличивают.
+
+    Attributes:
+        dates (Tuple[str, ...]): отсортированные даты.
+        working (np.ndarray): рабочие минуты каждого дня.
+        busy (np.ndarray): занятые рабочие минуты каждого дня.
+        hour_working (np.ndarray): рабочие минуты по часам суток,
+            форма (24,), сумма по всем дням.
+        hour_busy (np.ndarray): занятые минуты по часам суток,
+            форма (24,), сумма по всем дням.
+        gap_day (np.ndarray): номер дня свободного интервала в dates.
+        gap_start (np.ndarray): начало свободного интервала в минутах.
+        gap_end (np.ndarray): окончание свободного интервала в минутах.
+        version (int | None): версия индекса, по которому посчитаны
+            показатели.
+
+    Example:
+        >> stats = ScheduleStats.from_index(index, "2025-01-01",
+        >>                                  "2025-12-31")
+        >> stats.occupancy
+    """
+    __slots__ = ("dates", "working", "busy", "hour_working", "hour_busy",
+                 "gap_day", "gap_start", "gap_end", "version")
+
+    def __init__(self, dates: Sequence[str],
+                 working: np.ndarray, busy: np.ndarray,
+                 hour_working: np.ndarray, hour_busy: np.ndarray,
+                 gap_day: np.ndarray, gap_start: np.ndarray,
+                 gap_end: np.ndarray, version: int | None = None):
+        self.dates = tuple(dates)
+        self.working = working
+        self.busy = busy
+        self.hour_working = hour_working
+        self.hour_busy = hour_busy
+        self.gap_day = gap_day
+        self.gap_start = gap_start
+        self.gap_end = gap_end
+        self.version = version
+
+    @classmethod
+    def from_intervals(
+            cls, dates: Sequence[str],
+            day_bounds: Iterable[Tuple[Interval, ...]],
+            day_free: Iterable[Tuple[Interval, ...]],
+            version: int | None = None
+    ) -> "ScheduleStats":
+        """
+        Считает показатели по рабочим и свободным интервалам дней.
+
+        Рабочие интервалы одной даты объединяются, если пересекаются.
+
+        Args:
+            dates (Sequence[str]): отсортированные даты.
+            day_bounds (Iterable[Tuple[Tuple[int, int], ...]]): рабочие
+                интервалы каждой даты в том же порядке.
+            day_free (Iterable[Tuple[Tuple[int, int], ...]]): свободные
+                интервалы каждой даты в том же порядке.
+            version (int | None, default=None): версия данных.
+
+        Returns:
+            ScheduleStats
+
+        Example:
+            >> ScheduleStats.from_intervals(["2025-02-17"],
+            >>                              [((540, 1260),)],
+            >>                              [((540, 750),)])
+        """
+        days = len(dates)
+        (work_day, work_start, work_end), _ = merge_intervals_by_day(
+            *_flatten(day_bounds)
+        )
+        gap_day, gap_start, gap_end = _flatten(day_free)
+        working = np.bincount(work_day, weights=work_end - work_start,
+                              minlength=days).astype(np.int64)
+        free = np.bincount(gap_day, weights=gap_end - gap_start,
+                           minlength=days).astype(np.int64)
+        hour_working = _minutes_by_hour(work_start, work_end)
+        return cls(dates, working, working - free, hour_working,
+                   hour_working - _minutes_by_hour(gap_start, gap_end),
+                   gap_day, gap_start, gap_end, version)
+
+    @classmethod
+    def from_index(
+            cls, index: ScheduleIndex,
+            date_from: str | None = None, date_to: str | None = None
+    ) -> "ScheduleStats":
+        """
+        Считает показатели по индексу расписания, включая дни по правилам.
+
+        Args:
+            index (ScheduleIndex): индекс расписания.
+            date_from (str | None, default=None): первая дата
+                включительно. None - без ограничения.
+            date_to (str | None, default=None): последняя дата
+                включительно. None - без ограничения.
+
+        Returns:
+            ScheduleStats
+
+        Example:
+            >> stats = ScheduleStats.from_index(index)
+        """
+        dates = list(index.iter_dates(date_from, date_to))
+        return cls.from_intervals(dates,
+                                  (index.day_bounds(date) for date in dates),
+                                  (index.day_free(date) for date in dates),
+                                  index.version)
+
+    @property
+    def occupancy(self) -> np.ndarray:
+        """Доля занятого рабочего времени каждого дня, 0 - без работы."""
+        return np.divide(self.busy, self.working,
+                         out=np.zeros(len(self.dates)),
+                         where=self.working > 0)
+
+    @property
+    def total_occupancy(self) -> float:
+        """Доля занятого рабочего времени за все дни."""
+        working = int(self.working.sum())
+        return int(self.busy.sum()) / working if working else 0.0
+
+    @property
+    def gap_lengths(self) -> np.ndarray:
+        """Длины свободных интервалов в минутах по дням и времени."""
+        return self.gap_end - self.gap_start
+
+    def gap_histogram(
+            self, bins: Sequence[int] = GAP_BINS
+    ) -> np.ndarray:
+        """
+        Считает распределение длин свободных интервалов.
+
+        Args:
+            bins (Sequence[int], default=GAP_BINS): возрастающие границы
+                корзин в минутах. Корзина i - длины [bins[i], bins[i + 1]),
+                последняя корзина включает правую границу.
+
+        Returns:
+            np.ndarray. Количество интервалов в каждой корзине,
+                форма (len(bins) - 1,).
+
+        Example:
+            >> stats.gap_histogram((0, 30, 60, 1440))
+        """
+        counts, _ = np.histogram(self.gap_lengths, bins=bins)
+        return counts
+
+    def fragments(self, min_gap: int = MIN_USABLE_GAP) -> np.ndarray:
+        """
+        Считает короткие свободные интервалы каждого дня.
+
+        Args:
+            min_gap (int, default=MIN_USABLE_GAP): интервалы короче
+                min_gap минут считаются непригодными.
+
+        Returns:
+            np.ndarray. Количество коротких интервалов по дням.
+
+        Example:
+            >> stats.fragments(10)
+        """
+        short = self.gap_lengths < min_gap
+        return np.bincount(self.gap_day[short], minlength=len(self.dates))
+
+    def longest_gap(self) -> Tuple[str, int, int] | None:
+        """
+        Находит самый длинный свободный интервал.
+
+        Returns:
+            Tuple[str, int, int]. Дата, начало и окончание в минутах,
+                из равных - самый ранний ('2025-02-19', 540, 1080)
+            None. Если свободных интервалов нет
+
+        Example:
+            >> stats.longest_gap()
+        """
+        if not len(self.gap_day):
+            return None
+        pos = int(np.argmax(self.gap_lengths))
+        return (self.dates[self.gap_day[pos]], int(self.gap_start[pos]),
+                int(self.gap_end[pos]))
+
+    def to_dict(
+            self, bins: Sequence[int] = GAP_BINS,
+            min_gap: int = MIN_USABLE_GAP
+    ) -> Dict[str, Any]:
+        """
+        Собирает показатели в словарь, пригодный для JSON.
+
+        Args:
+            bins (Sequence[int], default=GAP_BINS): границы корзин
+                распределения длин свободных интервалов.
+            min_gap (int, default=MIN_USABLE_GAP): длина, короче которой
+                свободный интервал считается непригодным.
+
+        Returns:
+            Dict[str, Any]
+            {
+                "days": [{"date": "2025-02-17", "working": 540,
+                          "busy": 330, "occupancy": 0.61, "fragments": 0}],
+                "occupancy": 0.45,
+                "hours": [0, 0, ..., 60, 45, ...],
+                "gaps": {"bins": [0, 15, ...], "counts": [0, 1, ...]},
+                "longest_gap": ["2025-02-19", "09:00", "18:00"],
+                "fragments": 0
+            }
+
+        Example:
+            >> json.dumps(stats.to_dict())
+        """
+        fragments = self.fragments(min_gap)
+        longest = self.longest_gap()
+        return {
+            "days": [{"date": date, "working": working, "busy": busy,
+                      "occupancy": occupancy, "fragments": count}
+                     for date, working, busy, occupancy, count in zip(
+                         self.dates, self.working.tolist(),
+                         self.busy.tolist(), self.occupancy.tolist(),
+                         fragments.tolist())],
+            "occupancy": self.total_occupancy,
+            "hours": self.hour_busy.tolist(),
+            "gaps": {"bins": list(bins),
+                     "counts": self.gap_histogram(bins).tolist()},
+            "longest_gap": None if longest is None else
+            [longest[0], minutes_to_time(longest[1]),
+             minutes_to_time(longest[2])],
+            "fragments": int(fragments.sum())
+        }
@@ -0,0 +1,179 @@
+import codecs
+import json
+import re
+from array import array
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+import numpy as np
+
+from schedule_index import ScheduleArrays, time_to_minutes
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+class _ChunkReader:
+    """Буфер текста над потоком байтов ответа.
+
+    В буфере хранится только непрочитанный остаток текущего фрагмента
+    и не разобранный до конца элемент, поэтому размер буфера не зависит
+    от размера ответа.
+    """
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks: Iterator[bytes] = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def _read(self) -> bool:
+        if self.eof:
+            return False
+        self.buffer = self.buffer[self.pos:]
+        self.pos = 0
+        for chunk in self._chunks:
+            text = self._decoder.decode(chunk)
+            if text:
+                self.buffer += text
+                return True
+        self.buffer += self._decoder.decode(b"", final=True)
+        self.eof = True
+        return True
+
+    def peek(self) -> str:
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._read():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        char = self.peek()
+        if not char or char not in chars:
+            raise ValueError(
+                f"Invalid schedule payload: expected one of {chars!r} "
+                f"at offset {self.pos}"
+            )
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self._read():
+                    raise
+                continue
+            # Число на границе фрагмента может быть разобрано не целиком
+            if end < len(self.buffer) or not self._read():
+                self.pos = end
+                return value
+
+
+class _ArraysBuilder:
+    """Накопитель колонок ScheduleArrays для потокового разбора."""
+
+    def __init__(self):
+        self.date_pos: Dict[str, int] = {}
+        self.day_id = array("q")
+        self.day_date = array("i")
+        self.day_start = array("H")
+        self.day_end = array("H")
+        self.slot_id = array("q")
+        self.slot_day_id = array("q")
+        self.slot_start = array("H")
+        self.slot_end = array("H")
+
+    def add_day(self, day: Dict[str, str | int]) -> None:
+        self.day_id.append(day["id"])
+        self.day_date.append(self.date_pos.setdefault(day["date"],
+                                                      len(self.date_pos)))
+        self.day_start.append(time_to_minutes(day["start"]))
+        self.day_end.append(time_to_minutes(day["end"]))
+
+    def add_timeslot(self, timeslot: Dict[str, str | int]) -> None:
+        self.slot_id.append(timeslot["id"])
+        self.slot_day_id.append(timeslot["day_id"])
+        self.slot_start.append(time_to_minutes(timeslot["start"]))
+        self.slot_end.append(time_to_minutes(timeslot["end"]))
+
+    def build(self) -> ScheduleArrays:
+        dates = sorted(self.date_pos)
+        rank = {date: pos for pos, date in enumerate(dates)}
+        remap = np.array([rank[date] for date in self.date_pos],
+                         dtype=np.int32)
+        return ScheduleArrays(
+            dates=dates,
+            day_id=np.array(self.day_id, dtype=np.int64),
+            day_date=remap[np.array(self.day_date, dtype=np.int64)],
+            day_start=np.array(self.day_start, dtype=np.uint16),
+            day_end=np.array(self.day_end, dtype=np.uint16),
+            slot_id=np.array(self.slot_id, dtype=np.int64),
+            slot_day_id=np.array(self.slot_day_id, dtype=np.int64),
+            slot_start=np.array(self.slot_start, dtype=np.uint16),
+            slot_end=np.array(self.slot_end, dtype=np.uint16)
+        )
+
+
+def parse_schedule_stream(
+        chunks: Iterable[bytes]
+) -> Tuple[ScheduleArrays | None, Dict[str, Any]]:
+    """
+    Разбирает ответ API по мере получения фрагментов.
+
+    Элементы days и timeslots разбираются по одному и сразу
+    переводятся в колонки минут и id, поэтому в памяти одновременно
+    находится не больше одного словаря таймслота. Остальные ключи
+    верхнего уровня (например, added и removed ответа с изменениями)
+    разбираются целиком.
+
+    Args:
+        chunks (Iterable[bytes]): фрагменты тела ответа в UTF-8.
+
+    Raises:
+        ValueError: если ответ не является объектом JSON.
+        KeyError: если у дня или таймслота нет обязательного поля.
+
+    Returns:
+        Tuple[ScheduleArrays | None, Dict[str, Any]]. Колоночное
+            представление расписания (None, если в ответе нет days)
+            и остальные ключи ответа.
+
+    Example:
+        >> response = session.get(api_url, stream=True)
+        >> arrays, rest = parse_schedule_stream(response.iter_content(65536))
+    """
+    reader = _ChunkReader(chunks)
+    builder = _ArraysBuilder()
+    handlers = {"days": builder.add_day, "timeslots": builder.add_timeslot}
+    rest = {}
+    has_days = False
+    reader.expect("{")
+    if reader.peek() == "}":
+        reader.pos += 1
+        return None, rest
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        handler = handlers.get(key)
+        if handler is not None and reader.peek() == "[":
+            has_days = has_days or key == "days"
+            reader.pos += 1
+            if reader.peek() == "]":
+                reader.pos += 1
+            else:
+                while True:
+                    handler(reader.value())
+                    if reader.expect(",]") == "]":
+                        break
+        else:
+            rest[key] = reader.value()
+        if reader.expect(",}") == "}":
+            break
+    if reader.peek():
+        raise ValueError("Invalid schedule payload: extra data after object")
+    return (builder.build() if has_days else None), rest
@@ -1,29 +1,215 @@
 import re
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import (Dict, Iterable, Iterator, List, Optional, Sequence, Set,
+                    TYPE_CHECKING, Tuple)
 
-import pandas as pd
+from metrics import FETCH_RESPONSE, emit, hooks_enabled, instrument
 
-import requests
+from occupancy import OccupancyMatrix
+
+from schedule_index import (MINUTES_IN_DAY,
+                            ScheduleArrays,
+                            ScheduleIndex,
+                            is_covered,
+                            minutes_to_time,
+                            time_to_minutes)
+
+from schedule_placement import GapAllocator
+
+from schedule_sources import HTTPSource, PushdownSource, ScheduleSource
+
+from schedule_stats import ScheduleStats
+
+from schedule_stream import parse_schedule_stream
 
 from settings import (DATE_PATTERN,
                       DEFAULT_API_URL,
+                      FETCH_CONCURRENCY,
+                      PARSE_CACHE_SIZE,
+                      REQUEST_TIMEOUT,
+                      STREAM_CHUNK_SIZE,
                       TIME_PATTERN,
                       URL_PATTERN)
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+    import requests
+
+    from schedule_rules import RecurringSchedule
+
+    from snapshot_cache import Snapshot, SnapshotCache
+
+_session: "requests.Session | None" = None
+_DATE_RE = re.compile(DATE_PATTERN)
+_TIME_RE = re.compile(TIME_PATTERN)
+
+
+def create_session(
+        pool_size: int = FETCH_CONCURRENCY
+) -> "requests.Session":
+    """
+    Создаёт HTTP сессию с пулом соединений.
+
+    requests импортируется при первом создании сессии, поэтому работа
+    со снимком из кэша не тратит время на его импорт.
+
+    Args:
+        pool_size (int, default=FETCH_CONCURRENCY): Максимальное количество
+            соединений, удерживаемых в пуле для одного хоста.
+
+    Returns:
+        requests.Session
+
+    Example:
+        >> session = create_session(20)
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> "requests.Session":
+    """
+    Возвращает общую для всех экземпляров Scheduler HTTP сессию.
+
+    Повторные запросы к тому же хосту переиспользуют открытые
+    TCP/TLS соединения.
+
+    Returns:
+        requests.Session
+
+    Example:
+        >> get_session().get(DEFAULT_API_URL)
+    """
+    global _session
+    if _session is None:
+        _session = create_session()
+    return _session
+
+
+class _CountingChunks:
+    """Итератор фрагментов ответа, считающий их суммарный размер."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self.size = 0
+
+    def __iter__(self) -> Iterator[bytes]:
+        return self
+
+    def __next__(self) -> bytes:
+        chunk = next(self._chunks)
+        self.size += len(chunk)
+        return chunk
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_date(date_string: str) -> int:
+    """
+    Проверяет строку даты и переводит её в порядковый номер дня.
+
+    Результаты кэшируются, поэтому повторные даты не разбираются заново.
+
+    Args:
+        date_string (str, example="2025-02-17"): Дата в формате YYYY-MM-DD.
+
+    Raises:
+        ValueError: если строка не прошла валидацию или такой даты нет
+            в календаре.
+
+    Returns:
+        int. 739299
+
+    Example:
+        >> parse_date("2025-02-17")
+    """
+    if _DATE_RE.fullmatch(date_string) is None:
+        raise ValueError("Invalid date string. Must be in format YYYY-MM-DD")
+    try:
+        return datetime(int(date_string[:4]), int(date_string[5:7]),
+                        int(date_string[8:10])).toordinal()
+    except ValueError:
+        raise ValueError("Invalid date string. "
+                         "Must be in format YYYY-MM-DD") from None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_time(time_string: str) -> int:
+    """
+    Проверяет строку времени и переводит её в минуты от начала суток.
+
+    Результаты кэшируются, поэтому повторное время не разбирается заново.
+
+    Args:
+        time_string (str, example="13:25"): Время в формате HH:MM.
+
+    Raises:
+        ValueError: если строка не прошла валидацию.
+
+    Returns:
+        int. 805
+
+    Example:
+        >> parse_time("13:25")
+    """
+    if _TIME_RE.fullmatch(time_string) is None:
+        raise ValueError("Invalid time string. Must be in format HH:MM")
+    return time_to_minutes(time_string)
+
 
 class Scheduler:
     """Работа с таймслотами на основе API.
 
     Attributes:
         api_url (str): URL для API запроса.
+        session (requests.Session): HTTP сессия для запросов к API.
+            Общая сессия get_session() берётся при первом запросе.
+        timeout (float): Таймаут запроса к API в секундах.
+        cache (SnapshotCache | None): Кэш снимков расписания на диске.
+        stream (bool): Разбирать ответ API по мере получения, не создавая
+            словари для всех таймслотов.
+        rules (RecurringSchedule | None): Рабочие дни, заданные
+            правилами. Дни и таймслоты ответа API заменяют правила
+            для своих дат.
+        source (ScheduleSource | None): Источник расписания вместо
+            запроса к api_url, например файл JSON или база SQLite.
+            HTTPSource заменяется настройками api_url, session,
+            timeout и stream.
         schedule_data (Dict[str, List[Dict[str, str | int]]]):
-            ответ API на запрос.
-        selected_date (datetime.datetime): Выбранная для обработки дата.
+            ответ API на запрос. Внутри не хранится: восстанавливается
+            из индекса при первом обращении.
+        selected_date (datetime.datetime): Дата, по которой фильтруют
+            _get_df_days и _get_df_timeslots. Запросами к расписанию
+            не изменяется.
+
+    Экземпляр можно использовать из нескольких потоков: запросы
+    к расписанию не меняют состояние экземпляра и не блокируются,
+    а fetch, refresh, book и release выполняются по одному и публикуют
+    изменения атомарно.
     """
     api_url: str
-    schedule_data: Dict[str, List[Dict[str, str | int]]] | None
+    _session: "requests.Session | None"
+    timeout: float
+    cache: "SnapshotCache | None"
+    stream: bool
+    _rules: "RecurringSchedule | None"
+    source: ScheduleSource | None
     selected_date: datetime | None
+    _schedule_data: Dict[str, List[Dict[str, str | int]]] | None
+    _index: ScheduleIndex | None
+    _occupancy: Tuple[ScheduleIndex, int, str | None, str | None,
+                      OccupancyMatrix] | None
+    _etag: str | None
+    _last_modified: str | None
+    _data_version: int
 
     class SchedulerError(Exception):
         """Вызывается в случае возникновения ошибок в работе библиотеки."""
@@ -40,20 +226,403 @@ class Scheduler:
 
     def __init__(self,
                  api_url: str = DEFAULT_API_URL,
-                 auto_fetch: bool = True):
+                 auto_fetch: bool = True,
+                 session: "requests.Session | None" = None,
+                 timeout: float = REQUEST_TIMEOUT,
+                 cache: "SnapshotCache | None" = None,
+                 stream: bool = False,
+                 rules: "RecurringSchedule | None" = None,
+                 source: ScheduleSource | None = None):
+        if isinstance(source, HTTPSource):
+            api_url, session = source.api_url, source.session
+            timeout, stream = source.timeout, source.stream
+            source = None
         self.api_url = api_url
+        self._session = session
+        self.timeout = timeout
+        self.cache = cache
+        self.stream = stream
+        self._rules = rules
+        self.source = source
         self.selected_date = None
+        self._occupancy = None
+        self._etag = None
+        self._last_modified = None
+        self._write_lock = threading.RLock()
+        self._data_version = 0
         self._validate_url()
+        self.schedule_data = None
         if auto_fetch:
-            self.schedule_data = self._fetch_schedule_data()
-        else:
-            self.schedule_data = None
+            self.fetch()
+
+    @classmethod
+    def from_arrays(cls, arrays: ScheduleArrays, **kwargs) -> "Scheduler":
+        """
+        Функция для создания экземпляра по уже загруженному расписанию.
+
+        Индекс строится сразу, запрос к API не выполняется.
+
+        Args:
+            arrays (ScheduleArrays): дни и таймслоты в колоночном
+                представлении.
+            **kwargs: параметры Scheduler, кроме auto_fetch и source.
+
+        Returns:
+            Scheduler
+
+        Example:
+            >> scheduler = Scheduler.from_arrays(
+            >>     ScheduleArrays.from_schedule_data(schedule_data)
+            >> )
+        """
+        scheduler = cls(auto_fetch=False, **kwargs)
+        scheduler._swap_schedule_data(arrays)
+        return scheduler
+
+    @classmethod
+    def from_snapshot(cls, snapshot: "Snapshot", **kwargs) -> "Scheduler":
+        """
+        Функция для создания экземпляра по снимку кэша.
+
+        ETag и Last-Modified снимка используются в условном запросе
+            refresh.
+
+        Args:
+            snapshot (Snapshot): снимок расписания.
+            **kwargs: параметры Scheduler, кроме auto_fetch и source.
+
+        Returns:
+            Scheduler
+
+        Example:
+            >> scheduler = Scheduler.from_snapshot(cache.load(api_url),
+            >>                                     api_url=api_url)
+        """
+        scheduler = cls(auto_fetch=False, **kwargs)
+        scheduler._load_snapshot(snapshot)
+        return scheduler
+
+    @property
+    def session(self) -> "requests.Session":
+        """HTTP сессия для запросов к API."""
+        if self._session is None:
+            self._session = get_session()
+        return self._session
+
+    @session.setter
+    def session(self, value: "requests.Session | None") -> None:
+        self._session = value
+
+    @property
+    def data_version(self) -> int:
+        """
+        Номер изменения расписания.
+
+        Увеличивается при загрузке и изменении расписания или правил
+            (fetch, refresh, book, release, присваивание schedule_data
+            и rules) и не требует построения индекса.
+        """
+        return self._data_version
+
+    @property
+    def rules(self) -> "RecurringSchedule | None":
+        """Рабочие дни, заданные правилами."""
+        return self._rules
+
+    @rules.setter
+    def rules(self, value: "RecurringSchedule | None") -> None:
+        with self._write_lock:
+            self._rules = value
+            if self._index is not None:
+                self._index = self._index.with_rules(value)
+            self._data_version += 1
+
+    @property
+    def schedule_data(self) -> Dict[str, List[Dict[str, str | int]]] | None:
+        """Ответ API на запрос расписания."""
+        schedule_data = self._schedule_data
+        if schedule_data is None and self._index is not None:
+            with self._write_lock:
+                if self._schedule_data is None and self._index is not None:
+                    self._schedule_data = \
+                        self._index.to_arrays().to_schedule_data()
+                schedule_data = self._schedule_data
+        return schedule_data
+
+    @schedule_data.setter
+    def schedule_data(
+            self, value: Dict[str, List[Dict[str, str | int]]] | None
+    ) -> None:
+        # Индекс строится при первом запросе, поэтому список
+        # вызывающего кода копируется и его изменения не попадают
+        # в расписание
+        if isinstance(value, dict) and \
+                isinstance(value.get("timeslots"), list):
+            value = {**value, "timeslots": list(value["timeslots"])}
+        with self._write_lock:
+            self._schedule_data = value
+            self._index = None
+            self._data_version += 1
+
+    def fetch(self) -> None:
+        """
+        Функция для загрузки расписания из API и построения индекса.
+
+        Если задан cache, свежий снимок загружается без запроса к API,
+            а ответ API сохраняется в кэш. Если API недоступен, используется
+            последний снимок независимо от его возраста.
+
+        Если задан source, расписание загружается из него без кэша.
+            PushdownSource не загружается целиком: запросы по датам
+            читают только выбранные дни, остальные запросы загружают
+            расписание при первом обращении.
+
+        Raises:
+            requests.RequestException: если запрос к API не удался,
+                а снимка в кэше нет.
+            OSError: если источник не читается.
+            ValueError: если ответ API не является объектом JSON.
+
+        Example:
+            >> scheduler = Scheduler(auto_fetch=False)
+            >> scheduler.fetch()
+        """
+        if self.source is not None:
+            if isinstance(self.source, PushdownSource):
+                self.schedule_data = None
+            else:
+                self._swap_schedule_data(self.source.load())
+            return
+        if self.cache is None:
+            self._swap_schedule_data(self._fetch_schedule_data())
+            return
+        snapshot = self.cache.load_fresh(self.api_url)
+        if snapshot is None:
+            import requests
+
+            try:
+                schedule_data = self._fetch_schedule_data()
+            except requests.RequestException:
+                snapshot = self.cache.load(self.api_url)
+                if snapshot is None:
+                    raise
+            else:
+                self._swap_schedule_data(schedule_data)
+                self._store_snapshot()
+                return
+        self._load_snapshot(snapshot)
+
+    def _load_snapshot(self, snapshot: "Snapshot") -> None:
+        """
+        Служебная функция для загрузки расписания из снимка кэша.
+
+        Args:
+            snapshot (Snapshot): снимок расписания.
+
+        Example:
+            >> self._load_snapshot(self.cache.load(self.api_url))
+        """
+        with self._write_lock:
+            self._swap_schedule_data(snapshot.arrays)
+            self._etag = snapshot.etag
+            self._last_modified = snapshot.last_modified
+
+    def _store_snapshot(self) -> None:
+        """
+        Служебная функция для сохранения расписания в кэш.
+
+        Ошибка записи на диск не прерывает загрузку расписания.
+
+        Example:
+            >> self._store_snapshot()
+        """
+        try:
+            with self._write_lock:
+                schedule = self._schedule_data
+                if schedule is None:
+                    schedule = self._index.to_arrays()
+                self.cache.store(self.api_url, schedule,
+                                 self._etag, self._last_modified)
+        except OSError:
+            pass
+
+    def _swap_schedule_data(
+            self,
+            schedule_data: Dict[str, List[Dict[str, str | int]]] |
+            ScheduleArrays
+    ) -> None:
+        """
+        Служебная функция для замены расписания и индекса.
+
+        Индекс строится до замены, поэтому параллельные запросы видят
+            либо прежнее расписание, либо новое целиком. Строки ответа
+            разбираются один раз: словари ответа не сохраняются,
+            а schedule_data восстанавливается из индекса при первом
+            обращении.
+
+        Args:
+            schedule_data (Dict[str, List[Dict[str, str | int]]] |
+                ScheduleArrays): новое расписание в формате ответа API
+                или в колоночном представлении.
+
+        Example:
+            >> self._swap_schedule_data(self._fetch_schedule_data())
+        """
+        if not isinstance(schedule_data, ScheduleArrays):
+            schedule_data = ScheduleArrays.from_schedule_data(schedule_data)
+        index = ScheduleIndex.from_arrays(schedule_data, self._rules)
+        with self._write_lock:
+            self._schedule_data = None
+            self._index = index
+            self._data_version += 1
+
+    def refresh(
+            self,
+            delta: Optional[Dict[str, List[Dict[str, str | int] | int]]] = None
+    ) -> bool:
+        """
+        Функция для обновления загруженного расписания.
+
+        Без delta отправляет условный запрос к API с заголовками
+            If-None-Match и If-Modified-Since. Ответ 304 не меняет данные
+            и индекс. Если API вернул изменения таймслотов вместо полного
+            расписания, они применяются так же, как delta. Если задан
+            source, расписание загружается из него заново.
+
+        Args:
+            delta (Optional[Dict], default=None, example={"added": [...],
+                "removed": [3]}): Изменения таймслотов: added - новые или
+                изменённые таймслоты в формате ответа API, removed - id
+                удалённых таймслотов. Пересчитываются только дни,
+                затронутые изменениями.
+
+        Raises:
+            SchedulerError: если delta передан, а данных ещё нет.
+            ValueError: если delta не прошёл валидацию.
+            requests.HTTPError: если API вернул ошибку.
+
+        Returns:
+            bool. True - если данные изменились, False - если нет
 
-    def _fetch_schedule_data(self) \
-            -> Dict[str, List[Dict[str, str | int]]]:
+        Example:
+            >> scheduler.refresh()
+            >> scheduler.refresh({"removed": [3]})
+        """
+        if delta is None:
+            if self.source is not None or \
+                    (self._schedule_data is None and self._index is None):
+                self.fetch()
+                return True
+            data = self._fetch_schedule_data(conditional=True)
+            if data is None:
+                return False
+            if isinstance(data, ScheduleArrays) or "days" in data:
+                self._swap_schedule_data(data)
+                changed = True
+            else:
+                with self._write_lock:
+                    changed = bool(self._apply_delta(data))
+            if changed and self.cache is not None:
+                self._store_snapshot()
+            return changed
+        with self._write_lock:
+            return bool(self._apply_delta(delta))
+
+    def _apply_delta(
+            self, delta: Dict[str, List[Dict[str, str | int] | int]]
+    ) -> Set[str]:
+        """
+        Служебная функция для применения изменений таймслотов.
+
+        Args:
+            delta (Dict[str, List]): Изменения таймслотов с ключами
+                added и removed.
+
+        Raises:
+            SchedulerError: если нет данных из запроса.
+            ValueError: если delta не прошёл валидацию. Данные и индекс
+                при этом не меняются.
+
+        Returns:
+            Set[str]. Даты, данные которых были пересчитаны.
+
+        Example:
+            >> self._apply_delta({"removed": [3]})
+        """
+        removed, added = self._validate_delta(delta)
+        index, changed = self._get_index().apply_delta(removed, added)
+        if index is not self._index:
+            # Прежний schedule_data не меняется и остаётся у читателей
+            # снимком прежней версии, новый восстанавливается из индекса
+            self._schedule_data = None
+            self._index = index
+            self._data_version += 1
+        return changed
+
+    def _validate_delta(
+            self, delta: Dict[str, List[Dict[str, str | int] | int]]
+    ) -> Tuple[List[int], List[Dict[str, str | int]]]:
+        """
+        Служебная функция для валидации изменений таймслотов.
+
+        Все записи проверяются до применения изменений, поэтому
+            неверный delta не меняет ни данные, ни индекс.
+
+        Args:
+            delta (Dict[str, List]): Изменения таймслотов с ключами
+                added и removed.
+
+        Raises:
+            ValueError: если delta не является словарём, added или
+                removed не являются списками.
+            ValueError: если id в removed или id и day_id в added
+                отсутствуют или не являются int.
+            ValueError: если start или end таймслота отсутствует, не
+                прошёл валидацию или start не раньше end.
+
+        Returns:
+            Tuple[List[int], List[Dict[str, str | int]]]. removed и added
+
+        Example:
+            >> removed, added = self._validate_delta({"removed": [3]})
+        """
+        if not isinstance(delta, dict):
+            raise ValueError("delta must be a dict")
+        added = delta.get("added", [])
+        removed = delta.get("removed", [])
+        if not isinstance(added, list) or not isinstance(removed, list):
+            raise ValueError("delta added and removed must be lists")
+        for slot_id in removed:
+            if not isinstance(slot_id, int) or isinstance(slot_id, bool):
+                raise ValueError("delta removed must contain timeslot ids")
+        for timeslot in added:
+            if not isinstance(timeslot, dict) or any(
+                    not isinstance(timeslot.get(key), int) or
+                    isinstance(timeslot[key], bool)
+                    for key in ("id", "day_id")
+            ):
+                raise ValueError("delta timeslot must have integer "
+                                 "id and day_id")
+            start, end = timeslot.get("start"), timeslot.get("end")
+            if start is None or end is None:
+                raise ValueError("delta timeslot must have start and end")
+            if self._validate_time(start) >= self._validate_time(end):
+                raise ValueError("Start time must be before end time")
+        return removed, added
+
+    @instrument
+    def _fetch_schedule_data(self, conditional: bool = False) \
+            -> Dict[str, List[Dict[str, str | int]]] | ScheduleArrays | None:
         """
         Служебная функция для получения данных из запроса к API.
 
+        В режиме stream ответ с расписанием разбирается по фрагментам
+            сразу в колоночное представление.
+
+        Args:
+            conditional (bool, default=False): Отправить условный запрос
+                с ETag и Last-Modified предыдущего ответа.
+
         Returns:
             Dict[str, List[Dict[str, str | int]]]
             {
@@ -67,12 +636,44 @@ class Scheduler:
                                "start": "17:30"}]
             }
 
+            ScheduleArrays. Если включён режим stream и в ответе есть days
+
+            None. Если API ответил 304 Not Modified
+
         Example:
             >> self.schedule_data = self._fetch_schedule_data()
         """
-        response = requests.get(self.api_url)
-        response.raise_for_status()
-        return response.json()
+        headers = {}
+        if conditional:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+        response = self.session.get(self.api_url,
+                                    headers=headers,
+                                    timeout=self.timeout,
+                                    stream=self.stream)
+        with response:
+            response.raise_for_status()
+            data, size = None, 0
+            if response.status_code != 304:
+                self._etag = response.headers.get("ETag")
+                self._last_modified = response.headers.get("Last-Modified")
+                if not self.stream:
+                    data = response.json()
+                    size = len(response.content)
+                else:
+                    chunks = _CountingChunks(
+                        response.iter_content(STREAM_CHUNK_SIZE)
+                    )
+                    arrays, data = parse_schedule_stream(chunks)
+                    size = chunks.size
+                    if arrays is not None:
+                        data = arrays
+        if hooks_enabled():
+            emit(FETCH_RESPONSE, response.elapsed.total_seconds(),
+                 {"status": response.status_code, "bytes": size})
+        return data
 
     def _validate_url(self) -> None:
         """
@@ -89,14 +690,14 @@ class Scheduler:
             raise self.SchedulerError("API URL must be set")
         if not isinstance(self.api_url, str):
             raise ValueError("API URL must be a string")
-        if not re.fullmatch(URL_PATTERN, self.api_url):
+        if not URL_PATTERN.fullmatch(self.api_url):
             raise ValueError("API URL is invalid")
 
     def _validate_date(
             self, date_string: str
-    ) -> None:
+    ) -> int:
         """
-        Служебная функция для валидации даты.
+        Служебная функция для валидации и разбора даты.
 
         Args:
             date_string (str, example="2025-02-17"): Входные данные.
@@ -106,6 +707,9 @@ class Scheduler:
             ValueError: если date_string не является строкой.
             ValueError: если date_string не прошёл валидацию.
 
+        Returns:
+            int. Порядковый номер дня: 739299
+
         Example:
             >> self._validate_date("2025-02-17")
         """
@@ -113,16 +717,13 @@ class Scheduler:
             raise self.SchedulerError("date must be set")
         if not isinstance(date_string, str):
             raise ValueError("date must be a string")
-        if not re.fullmatch(DATE_PATTERN, date_string):
-            raise ValueError(
-                "Invalid date string. Must be in format YYYY-MM-DD"
-            )
+        return parse_date(date_string)
 
     def _validate_time(
             self, time_string: str
-    ):
+    ) -> int:
         """
-        Служебная функция для валидации времени.
+        Служебная функция для валидации и разбора времени.
 
         Args:
             time_string (str, example="13:25"): Входные данные.
@@ -132,6 +733,9 @@ class Scheduler:
             ValueError: если time_string не является строкой.
             ValueError: если time_string не прошёл валидацию.
 
+        Returns:
+            int. Минуты от начала суток: 805
+
         Example:
             >> self._validate_time("13:25")
         """
@@ -139,12 +743,77 @@ class Scheduler:
             raise self.SchedulerError("time must be set")
         if not isinstance(time_string, str):
             raise ValueError("time must be a string")
-        if not re.fullmatch(TIME_PATTERN, time_string):
-            raise ValueError("Invalid time string. Must be in format HH:MM")
+        return parse_time(time_string)
+
+    def _validate_duration(
+            self, duration_minutes: int
+    ) -> None:
+        """
+        Служебная функция для валидации продолжительности.
+
+        Args:
+            duration_minutes (int, example=120): Входные данные.
+
+        Raises:
+            SchedulerError: если duration_minutes отсутствует.
+            ValueError: если duration_minutes не является int или менее 1.
+
+        Example:
+            >> self._validate_duration(120)
+        """
+        if duration_minutes is None:
+            raise self.SchedulerError("duration_minutes must be set")
+        if not isinstance(duration_minutes, int):
+            raise ValueError("duration_minutes must be an integer")
+        if duration_minutes <= 0:
+            raise ValueError("duration_minutes must be "
+                             "positive and more than 0")
+
+    def _get_index(self) -> ScheduleIndex:
+        """
+        Служебная функция для получения индекса интервалов расписания.
+
+        Индекс строится один раз и сбрасывается только при присваивании
+            нового значения schedule_data. Если данных из запроса нет,
+            они загружаются из source, а если нет и source, но rules
+            заданы, индекс строится только по правилам.
+
+        Raises:
+            SchedulerError: если нет данных из запроса и правил.
+
+        Returns:
+            ScheduleIndex
+
+        Example:
+            >> index = self._get_index()
+        """
+        index = self._index
+        if index is None:
+            with self._write_lock:
+                if self._index is None:
+                    schedule_data = self._schedule_data
+                    if schedule_data is None and self.source is not None:
+                        schedule_data = self.source.load()
+                    if schedule_data is None:
+                        if self._rules is None:
+                            raise self.SchedulerError(
+                                "Schedule data didn't fetched"
+                            )
+                        schedule_data = {"days": [], "timeslots": []}
+                    if not isinstance(schedule_data, ScheduleArrays):
+                        schedule_data = ScheduleArrays.from_schedule_data(
+                            schedule_data
+                        )
+                    self._index = ScheduleIndex.from_arrays(
+                        schedule_data, self._rules
+                    )
+                index = self._index
+        return index
 
+    @instrument
     def _get_df_days(
-            self, to_dt=True
-    ) -> pd.DataFrame:
+            self, to_dt=True, date: Optional[str] = None
+    ) -> "pd.DataFrame":
         """
         Служебная функция для получения DataFrame состоящий
             из информации о днях работы.
@@ -152,6 +821,8 @@ class Scheduler:
         Args:
             to_dt (bool, default=True): Необходимо ли преобразовать
                 поля date, start, end в Timestamp.
+            date (Optional[str], default=None, example="2025-02-17"):
+                Дата для фильтрации. По умолчанию берётся selected_date.
 
         Raises:
             SchedulerError: если нет данных из запроса.
@@ -162,6 +833,8 @@ class Scheduler:
         Example:
             >> df_days = self._get_df_days(to_dt=False)
         """
+        import pandas as pd
+
         if self.schedule_data is None:
             raise self.SchedulerError("Schedule data didn't fetched")
         df = pd.DataFrame(self.schedule_data["days"])
@@ -169,13 +842,15 @@ class Scheduler:
             df["start"] = pd.to_datetime(df["start"], format='%H:%M')
             df["end"] = pd.to_datetime(df["end"], format='%H:%M')
             df["date"] = pd.to_datetime(df["date"])
-        if self.selected_date:
-            df = df[df["date"] == self.selected_date]
+        date = date or self.selected_date
+        if date:
+            df = df[df["date"] == date]
         return df
 
+    @instrument
     def _get_df_timeslots(
-            self, to_dt=True
-    ) -> pd.DataFrame:
+            self, to_dt=True, date: Optional[str] = None
+    ) -> "pd.DataFrame":
         """
         Служебная функция для получения DataFrame состоящий из
             информации о занятых таймслотах.
@@ -183,6 +858,8 @@ class Scheduler:
         Args:
             to_dt (bool, default=True): Необходимо ли преобразовать
                 поля date, start, end в Timestamp.
+            date (Optional[str], default=None, example="2025-02-17"):
+                Дата для фильтрации. По умолчанию берётся selected_date.
 
         Raises:
             SchedulerError: если нет данных из запроса.
@@ -193,10 +870,12 @@ class Scheduler:
         Example:
             >> df_timeslots = self._get_df_timeslots(to_dt=False)
         """
+        import pandas as pd
+
         if self.schedule_data is None:
             raise self.SchedulerError("Schedule data didn't fetched")
         df = pd.merge(pd.DataFrame(self.schedule_data["timeslots"]),
-                      self._get_df_days()[["id", "date"]],
+                      self._get_df_days(date=date)[["id", "date"]],
                       left_on='day_id',
                       right_on='id').drop(
             ["day_id", "id_x", "id_y"], axis=1
@@ -206,45 +885,244 @@ class Scheduler:
             df["end"] = pd.to_datetime(df["end"], format='%H:%M')
         return df
 
+    def _parse_slot(
+            self, date: str, time_start: str, time_end: str
+    ) -> Tuple[str, int, int]:
+        """
+        Служебная функция для валидации и разбора проверяемого слота.
+
+        Args:
+            date (str, example='2025-02-18'): дата таймслота.
+            time_start (str, example='17:30'): время начала таймслота.
+            time_end (str, example='20:30'): время окончания таймслота.
+
+        Raises:
+            SchedulerError: если date, time_start или time_end отсутствует.
+            ValueError: если date, time_start или time_end не является
+                строкой или не прошёл валидацию.
+            ValueError: если time_start не раньше time_end.
+
+        Returns:
+            Tuple[str, int, int]. ('2025-02-18', 1050, 1230)
+
+        Example:
+            >> self._parse_slot('2025-02-18', '17:30', '20:30')
+        """
+        self._validate_date(date)
+        time_start = self._validate_time(time_start)
+        time_end = self._validate_time(time_end)
+        if time_start >= time_end:
+            raise ValueError("Start time must be before end time")
+        return date, time_start, time_end
+
     def _check_is_available(
-            self, free_slots: List[List[str]],
-            time_start: str, time_end: str
+            self, index: ScheduleIndex,
+            date: str, time_start: int, time_end: int
     ) -> bool:
         """
         Служебная функция для проверки слота на предмет занятости.
 
         Args:
-            free_slots (List[List[str]]): список свободных слотов.
-            time_start (datetime.datetime): время начала таймслота
-                для проверки
-            time_end (datetime.datetime): время окончания таймслота
-                для проверки
+            index (ScheduleIndex): индекс интервалов расписания.
+            date (str, example='2025-02-18'): дата таймслота для проверки.
+            time_start (int): время начала таймслота для проверки
+                в минутах от начала суток
+            time_end (int): время окончания таймслота для проверки
+                в минутах от начала суток
 
         Returns:
             bool. True - если слот доступен, False - если не доступен
 
         Example:
-            >> self._check_is_available(free_slots, '17:30', '20:30')
+            >> self._check_is_available(index, '2025-02-18', 1050, 1230)
         """
-        for timeslot in free_slots:
-            if (datetime.strptime(timeslot[0], "%H:%M") <= time_start and
-                    datetime.strptime(timeslot[1], "%H:%M") >= time_end):
-                return True
-        return False
+        return is_covered(index.day_free(date), time_start, time_end)
+
+    def _validate_dates(
+            self, date_from: Optional[str], date_to: Optional[str],
+            dates: Optional[Iterable[str]]
+    ) -> List[str] | None:
+        """
+        Служебная функция для валидации дат запроса к расписанию.
+
+        Args:
+            date_from (Optional[str], example="2025-02-16"): первая дата
+                включительно.
+            date_to (Optional[str], example="2025-02-18"): последняя дата
+                включительно.
+            dates (Optional[Iterable[str]], example=["2025-02-17"]):
+                отдельные даты.
+
+        Raises:
+            SchedulerError: если одна из дат отсутствует.
+            ValueError: если dates передан вместе с date_from или date_to.
+            ValueError: если дата не является строкой или не прошла
+                валидацию.
+
+        Returns:
+            List[str]. dates в переданном порядке без повторов
+            None. Если dates не передан
+
+        Example:
+            >> self._validate_dates("2025-02-16", "2025-02-18", None)
+        """
+        if dates is not None:
+            if date_from is not None or date_to is not None:
+                raise ValueError(
+                    "dates cannot be combined with date_from or date_to"
+                )
+            if isinstance(dates, str):
+                raise ValueError("dates must be an iterable of strings")
+            dates = list(dict.fromkeys(dates))
+            for date in dates:
+                self._validate_date(date)
+            return dates
+        if date_from is not None:
+            self._validate_date(date_from)
+        if date_to is not None:
+            self._validate_date(date_to)
+        return None
+
+    def _select_dates(
+            self, index: ScheduleIndex,
+            date_from: Optional[str], date_to: Optional[str],
+            dates: Optional[Iterable[str]]
+    ) -> Sequence[str]:
+        """
+        Служебная функция для выбора дат запроса к расписанию.
+
+        Диапазон дат выбирается двоичным поиском по отсортированным
+            датам индекса, даты дней по правилам добавляются в порядке
+            возрастания.
+
+        Args:
+            index (ScheduleIndex): индекс расписания.
+            date_from (Optional[str], example="2025-02-16"): первая дата
+                включительно.
+            date_to (Optional[str], example="2025-02-18"): последняя дата
+                включительно.
+            dates (Optional[Iterable[str]], example=["2025-02-17"]):
+                отдельные даты.
+
+        Raises:
+            SchedulerError: если одна из дат отсутствует.
+            ValueError: если dates передан вместе с date_from или date_to.
+            ValueError: если дата не является строкой или не прошла
+                валидацию.
+
+        Returns:
+            Sequence[str]. Даты диапазона по возрастанию или dates в
+                переданном порядке без повторов.
+
+        Example:
+            >> self._select_dates(index, "2025-02-16", "2025-02-18", None)
+        """
+        dates = self._validate_dates(date_from, date_to, dates)
+        if dates is not None:
+            return dates
+        selected = index.iter_dates(date_from, date_to)
+        return selected if isinstance(selected, tuple) else list(selected)
+
+    def _query_index(
+            self, date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            dates: Optional[List[str]] = None
+    ) -> ScheduleIndex:
+        """
+        Служебная функция для получения индекса запроса по датам.
+
+        Если расписание ещё не загружено, а source - PushdownSource,
+            индекс строится только по дням выбранных дат,
+            прочитанным из источника. Иначе возвращается индекс всего
+            расписания.
+
+        Args:
+            date_from (Optional[str], example="2025-02-16"): первая дата
+                включительно.
+            date_to (Optional[str], example="2025-02-18"): последняя дата
+                включительно.
+            dates (Optional[List[str]], example=["2025-02-17"]):
+                проверенные отдельные даты.
+
+        Raises:
+            SchedulerError: если нет данных для анализа.
+
+        Returns:
+            ScheduleIndex
+
+        Example:
+            >> index = self._query_index(dates=["2025-02-17"])
+        """
+        source = self.source
+        if not isinstance(source, PushdownSource) or \
+                self._index is not None or \
+                self._schedule_data is not None or \
+                (date_from is None and date_to is None and dates is None):
+            return self._get_index()
+        return ScheduleIndex.from_arrays(
+            source.load_dates(date_from, date_to, dates), self._rules
+        )
+
+    def _validate_single_date(
+            self, date: Optional[str], date_from: Optional[str],
+            date_to: Optional[str], dates: Optional[Iterable[str]]
+    ) -> None:
+        """
+        Служебная функция для валидации даты одного дня.
+
+        Args:
+            date (Optional[str], example="2025-02-17"): дата.
+            date_from (Optional[str]): первая дата диапазона.
+            date_to (Optional[str]): последняя дата диапазона.
+            dates (Optional[Iterable[str]]): отдельные даты.
+
+        Raises:
+            ValueError: если date передан вместе с date_from, date_to
+                или dates.
+            ValueError: если date не является строкой или не прошёл
+                валидацию.
+
+        Example:
+            >> self._validate_single_date(date, None, None, None)
+        """
+        if date_from is not None or date_to is not None or dates is not None:
+            raise ValueError(
+                "date cannot be combined with date_from, date_to or dates"
+            )
+        self._validate_date(date)
 
     def get_busy_slots(
-            self, date: Optional[str] = None
+            self, date: Optional[str] = None,
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            dates: Optional[Iterable[str]] = None,
+            merged: bool = False
     ) -> List[List[str]]:
         """
         Функция для получения занятых таймслотов.
 
+        Без аргументов таймслоты возвращаются в порядке ответа API.
+            С date_from, date_to или dates - по дням в порядке дат,
+            внутри дня в порядке ответа API. С merged - объединённые
+            занятые интервалы дня по возрастанию времени.
+
         Args:
             date (Optional[str], default=None, example="2025-02-17"):
                 Дата для получения занятых слотов.
+            date_from (Optional[str], default=None, example="2025-02-16"):
+                Первая дата диапазона включительно.
+            date_to (Optional[str], default=None, example="2025-02-18"):
+                Последняя дата диапазона включительно.
+            dates (Optional[Iterable[str]], default=None,
+                example=["2025-02-15", "2025-02-17"]): Отдельные даты.
+            merged (bool, default=False): Объединить пересекающиеся
+                и примыкающие таймслоты.
 
         Raises:
             SchedulerError: если нет данных для анализа или date отсутствует.
             ValueError: если date не является строкой или не прошёл валидацию.
+            ValueError: если date передан вместе с date_from, date_to
+                или dates, или dates передан вместе с date_from или date_to.
 
         Returns:
             List[List[str]]
@@ -254,22 +1132,82 @@ class Scheduler:
         Example:
             >> scheduler = Scheduler()
             >> scheduler.get_busy_slots(date="2025-02-17")
+            >> scheduler.get_busy_slots(date_from="2025-02-17",
+            >>                          date_to="2025-02-23")
         """
         if date:
-            self._validate_date(date)
-            self.selected_date = datetime.strptime(date, "%Y-%m-%d")
-        timeslots = self._get_df_timeslots(False)
-        if date:
-            return timeslots.drop(["date"], axis=1).reindex(
-                columns=["start", "end"]
-            ).values.tolist()
-        timeslots["date"] = timeslots["date"].dt.strftime("%Y-%m-%d")
-        return timeslots.reindex(
-            columns=["date", "start", "end"]
-        ).values.tolist()
+            self._validate_single_date(date, date_from, date_to, dates)
+            index = self._query_index(dates=[date])
+            busy = index.day_merged(date) if merged else \
+                index.day_busy(date).values()
+            return [[minutes_to_time(start), minutes_to_time(end)]
+                    for start, end in busy]
+        dates = self._validate_dates(date_from, date_to, dates)
+        index = self._query_index(date_from, date_to, dates)
+        if merged:
+            selected = self._select_dates(index, date_from, date_to, dates)
+            return [[slot_date, minutes_to_time(start), minutes_to_time(end)]
+                    for slot_date in selected
+                    for start, end in index.day_merged(slot_date)]
+        if date_from is None and date_to is None and dates is None:
+            return [[slot_date, minutes_to_time(start), minutes_to_time(end)]
+                    for slot_date, start, end
+                    in list(index.timeslots.values())]
+        return [[slot_date, minutes_to_time(start), minutes_to_time(end)]
+                for slot_date in self._select_dates(index, date_from,
+                                                    date_to, dates)
+                for start, end in index.day_busy(slot_date).values()]
+
+    def get_overlaps(
+            self, date_from: Optional[str] = None,
+            date_to: Optional[str] = None
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Функция для проверки качества данных: пересечения таймслотов.
 
+        Пересечения находятся при построении индекса и при изменении
+            таймслотов, запросы к расписанию работают по объединённым
+            занятым интервалам.
+
+        Args:
+            date_from (Optional[str], default=None, example="2025-02-16"):
+                Первая дата диапазона включительно.
+            date_to (Optional[str], default=None, example="2025-02-18"):
+                Последняя дата диапазона включительно.
+
+        Raises:
+            SchedulerError: если нет данных для анализа.
+            ValueError: если дата не является строкой или не прошла
+                валидацию.
+
+        Returns:
+            List[Tuple[str, str, str]]. Дата, начало и окончание участков,
+                занятых несколькими таймслотами
+            [('2025-02-18', '12:00', '13:00')]
+
+        Example:
+            >> scheduler = Scheduler()
+            >> scheduler.get_overlaps(date_from="2025-02-01")
+        """
+        if date_from is not None:
+            self._validate_date(date_from)
+        if date_to is not None:
+            self._validate_date(date_to)
+        index = self._get_index()
+        overlaps = index.overlaps
+        if not overlaps:
+            return []
+        lo, hi = index.date_range(date_from, date_to)
+        return [(date, minutes_to_time(start), minutes_to_time(end))
+                for date in index.dates[lo:hi]
+                for start, end in overlaps.get(date, ())]
+
+    @instrument
     def get_free_slots(
-            self, date: Optional[str] = None
+            self, date: Optional[str] = None,
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            dates: Optional[Iterable[str]] = None
     ) -> List[Tuple[str, str, str] | Tuple[str, str]]:
         """
         Функция для получения свободных слотов.
@@ -277,10 +1215,19 @@ class Scheduler:
         Args:
             date (Optional[str], default=None, example="2025-02-17"):
                 Дата для получения свободных таймслотов.
+            date_from (Optional[str], default=None, example="2025-02-16"):
+                Первая дата диапазона включительно.
+            date_to (Optional[str], default=None, example="2025-02-18"):
+                Последняя дата диапазона включительно.
+            dates (Optional[Iterable[str]], default=None,
+                example=["2025-02-15", "2025-02-17"]): Отдельные даты.
+                Результат возвращается в порядке dates.
 
         Raises:
             SchedulerError: если нет данных для анализа или date отсутствует.
             ValueError: если date не является строкой или не прошёл валидацию.
+            ValueError: если date передан вместе с date_from, date_to
+                или dates, или dates передан вместе с date_from или date_to.
 
         Returns:
             List[Tuple[str, str, str]]
@@ -292,48 +1239,100 @@ class Scheduler:
         Example:
             >> scheduler = Scheduler()
             >> scheduler.get_free_slots(date="2025-02-17")
+            >> scheduler.get_free_slots(dates=["2025-02-17", "2025-02-19"])
         """
         if date:
-            self._validate_date(date)
-            self.selected_date = datetime.strptime(date, "%Y-%m-%d")
-        timeslots_df = self._get_df_timeslots()
-        timeslots_df = timeslots_df.sort_values(
-            ['date', 'start'] if date else 'start'
-        )
-        selected_days_df = self._get_df_days()
-        for i in selected_days_df.index.values:
-            start_ts = {'start': pd.to_datetime('00:00', format='%H:%M'),
-                        'end': selected_days_df.loc[i].start,
-                        'date': selected_days_df.loc[i].date}
-            end_ts = {'start': selected_days_df.loc[i].end,
-                      'end': pd.to_datetime('23:59', format='%H:%M'),
-                      'date': selected_days_df.loc[i].date}
-            timeslots_df = pd.concat([timeslots_df,
-                                      pd.DataFrame([start_ts, end_ts])])
-        timeslots_df = timeslots_df.sort_values(['date', 'start'])
-        timeslots_df = timeslots_df.set_index(
-            keys=pd.RangeIndex(start=1, stop=len(timeslots_df)+1)
-        )
-        free_slots = []
-        for i in range(1, len(timeslots_df)):
-            free_start = timeslots_df.iloc[i - 1]['end']
-            free_end = timeslots_df.iloc[i]['start']
-            if (free_start < free_end and
-                    timeslots_df.iloc[i - 1]['date'] ==
-                    timeslots_df.iloc[i]['date']):
-                if date:
-                    free_slots.append(
-                        (free_start.strftime('%H:%M'),
-                         free_end.strftime('%H:%M'))
-                    )
-                else:
-                    free_slots.append(
-                        (timeslots_df.iloc[i]['date'].strftime("%Y-%m-%d"),
-                         free_start.strftime('%H:%M'),
-                         free_end.strftime('%H:%M'))
-                    )
-        return free_slots
+            self._validate_single_date(date, date_from, date_to, dates)
+            index = self._query_index(dates=[date])
+            return [(minutes_to_time(start), minutes_to_time(end))
+                    for start, end in index.day_free(date)]
+        dates = self._validate_dates(date_from, date_to, dates)
+        index = self._query_index(date_from, date_to, dates)
+        return [(slot_date, minutes_to_time(start), minutes_to_time(end))
+                for slot_date in self._select_dates(index, date_from,
+                                                    date_to, dates)
+                for start, end in index.day_free(slot_date)]
+
+    def iter_busy_slots(
+            self, date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            dates: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[str, List[Tuple[str, str]]]]:
+        """
+        Функция для ленивого получения занятых таймслотов по дням.
+
+        Параметры проверяются при вызове, а таймслоты дня переводятся
+            в строки только когда день запрошен у итератора. Дни, которых
+            нет в расписании, пропускаются.
+
+        Args:
+            date_from (Optional[str], default=None, example="2025-02-16"):
+                Первая дата диапазона включительно.
+            date_to (Optional[str], default=None, example="2025-02-18"):
+                Последняя дата диапазона включительно.
+            dates (Optional[Iterable[str]], default=None,
+                example=["2025-02-15", "2025-02-17"]): Отдельные даты.
+
+        Raises:
+            SchedulerError: если нет данных для анализа.
+            ValueError: если дата не является строкой или не прошла
+                валидацию, или dates передан вместе с date_from или date_to.
+
+        Returns:
+            Iterator[Tuple[str, List[Tuple[str, str]]]]
+            ('2025-02-15', [('09:00', '12:00'), ('17:30', '20:00')])
+
+        Example:
+            >> for date, slots in scheduler.iter_busy_slots("2025-01-01"):
+            >>     print(date, slots)
+        """
+        index = self._get_index()
+        selected = self._select_dates(index, date_from, date_to, dates)
+        return ((slot_date, [(minutes_to_time(start), minutes_to_time(end))
+                             for start, end in
+                             index.day_busy(slot_date).values()])
+                for slot_date in selected if index.has_day(slot_date))
+
+    def iter_free_slots(
+            self, date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            dates: Optional[Iterable[str]] = None
+    ) -> Iterator[Tuple[str, List[Tuple[str, str]]]]:
+        """
+        Функция для ленивого получения свободных таймслотов по дням.
+
+        Параметры проверяются при вызове, а свободные интервалы дня
+            переводятся в строки только когда день запрошен у итератора.
+            Дни, которых нет в расписании, пропускаются.
+
+        Args:
+            date_from (Optional[str], default=None, example="2025-02-16"):
+                Первая дата диапазона включительно.
+            date_to (Optional[str], default=None, example="2025-02-18"):
+                Последняя дата диапазона включительно.
+            dates (Optional[Iterable[str]], default=None,
+                example=["2025-02-15", "2025-02-17"]): Отдельные даты.
 
+        Raises:
+            SchedulerError: если нет данных для анализа.
+            ValueError: если дата не является строкой или не прошла
+                валидацию, или dates передан вместе с date_from или date_to.
+
+        Returns:
+            Iterator[Tuple[str, List[Tuple[str, str]]]]
+            ('2025-02-15', [('12:00', '17:30'), ('20:00', '21:00')])
+
+        Example:
+            >> for date, slots in scheduler.iter_free_slots("2025-01-01"):
+            >>     print(date, slots)
+        """
+        index = self._get_index()
+        selected = self._select_dates(index, date_from, date_to, dates)
+        return ((slot_date, [(minutes_to_time(start), minutes_to_time(end))
+                             for start, end in index.day_free(slot_date)])
+                for slot_date in selected if index.has_day(slot_date))
+
+    @instrument
     def is_available(
             self, date: str, time_start: str, time_end: str
     ) -> bool:
@@ -360,30 +1359,118 @@ class Scheduler:
             >> scheduler = Scheduler()
             >> scheduler.is_available("2025-02-17", "17:30", "20:30")
         """
-        self._validate_date(date)
-        self._validate_time(time_start)
-        self._validate_time(time_end)
-        free_slots = self.get_free_slots(date)
-        time_start = datetime.strptime(time_start, "%H:%M")
-        time_end = datetime.strptime(time_end, "%H:%M")
-        if time_start >= time_end:
-            raise ValueError("Start time must be before end time")
-        return self._check_is_available(free_slots, time_start, time_end)
+        slot = self._parse_slot(date, time_start, time_end)
+        return self._check_is_available(self._get_index(), *slot)
+
+    def are_available(
+            self, queries: Iterable[Tuple[str, str, str]]
+    ) -> List[bool]:
+        """
+        Функция для пакетной проверки слотов на предмет занятости.
+
+        Args:
+            queries (Iterable[Tuple[str, str, str]], example=[('2025-02-18',
+                '17:30', '20:30')]): дата, время начала и время окончания
+                проверяемых таймслотов.
+
+        Raises:
+            SchedulerError: если нет данных для анализа.
+            SchedulerError: если date, time_start или time_end отсутствует.
+            ValueError: если date, time_start или time_end не является
+                строкой или не прошёл валидацию.
+
+        Returns:
+            List[bool]. Результаты проверки в порядке queries
+
+        Example:
+            >> scheduler = Scheduler()
+            >> scheduler.are_available([("2025-02-17", "17:30", "20:30"),
+            >>                          ("2025-02-18", "11:00", "11:30")])
+        """
+        slots = [self._parse_slot(date, time_start, time_end)
+                 for date, time_start, time_end in queries]
+        index = self._get_index()
+        return [self._check_is_available(index, *slot) for slot in slots]
+
+    @instrument
+    def _find_gaps(
+            self, duration_minutes: int, strategy: str,
+            date_from: Optional[str], date_to: Optional[str],
+            granularity: Optional[int], limit: int
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Служебная функция для валидации параметров поиска и поиска
+            свободных таймслотов по продолжительности.
+
+        Args:
+            duration_minutes (int, example=120): количество минут.
+            strategy (str, example="best"): стратегия поиска.
+            date_from (Optional[str], example="2025-02-16"): первая дата
+                поиска включительно.
+            date_to (Optional[str], example="2025-02-18"): последняя дата
+                поиска включительно.
+            granularity (Optional[int], example=15): шаг сетки начала
+                таймслота в минутах.
+            limit (int, example=3): максимальное количество результатов.
 
+        Raises:
+            SchedulerError: если нет данных для анализа.
+            SchedulerError: если duration_minutes отсутствует.
+            ValueError: если параметры поиска не прошли валидацию.
+
+        Returns:
+            List[Tuple[str, str, str]]. [('2025-02-15', '12:00', '17:30')]
+
+        Example:
+            >> self._find_gaps(120, "earliest", None, None, None, 1)
+        """
+        self._validate_duration(duration_minutes)
+        if strategy not in ("earliest", "best"):
+            raise ValueError("strategy must be 'earliest' or 'best'")
+        if granularity is not None and (not isinstance(granularity, int) or
+                                        granularity <= 0):
+            raise ValueError("granularity must be a positive integer")
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("limit must be a positive integer")
+        if date_from is not None:
+            self._validate_date(date_from)
+        if date_to is not None:
+            self._validate_date(date_to)
+        return [(date, minutes_to_time(start), minutes_to_time(end))
+                for date, start, end in self._get_index().find_gaps(
+                    duration_minutes, strategy, date_from, date_to,
+                    granularity, limit
+                )]
+
+    @instrument
     def find_slot_for_duration(
-            self, duration_minutes: int
+            self, duration_minutes: int,
+            strategy: str = "earliest",
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            granularity: Optional[int] = None
     ) -> Tuple[str, str, str] | None:
         """
-        Функция для проверки слота на предмет занятости.
+        Функция для поиска свободного таймслота по продолжительности.
 
         Args:
             duration_minutes (int, example=120): количество минут,
             для которых необходимо найти свободный таймслот.
+            strategy (str, default="earliest"): earliest - самый ранний
+                подходящий таймслот, best - самый короткий из подходящих.
+            date_from (Optional[str], default=None, example="2025-02-16"):
+                Первая дата поиска включительно.
+            date_to (Optional[str], default=None, example="2025-02-18"):
+                Последняя дата поиска включительно.
+            granularity (Optional[int], default=None, example=15): Шаг
+                сетки в минутах, на которую выравнивается начало таймслота.
 
         Raises:
             SchedulerError: если нет данных для анализа.
             SchedulerError: если duration_minutes отсутствует.
             ValueError: duration_minutes не является int или менее 1.
+            ValueError: если strategy, granularity, date_from или date_to
+                не прошли валидацию.
 
         Returns:
             Tuple[str, str, str]. ('2025-02-15', '12:00', '17:30')
@@ -392,18 +1479,438 @@ class Scheduler:
         Example:
             >> scheduler = Scheduler()
             >> scheduler.find_slot_for_duration(480)
+            >> scheduler.find_slot_for_duration(60, strategy="best",
+            >>                                  granularity=15)
         """
-        if duration_minutes is None:
-            raise self.SchedulerError("duration_minutes must be set")
-        if not isinstance(duration_minutes, int):
-            raise ValueError("duration_minutes must be an integer")
-        if duration_minutes <= 0:
-            raise ValueError("duration_minutes must be "
-                             "positive and more than 0")
-        free_slots = self.get_free_slots()
-        for time_slot in free_slots:
-            if (datetime.strptime(time_slot[1], "%H:%M") +
-                    timedelta(minutes=duration_minutes) <=
-                    datetime.strptime(time_slot[2], "%H:%M")):
-                return time_slot
-        return None
+        found = self._find_gaps(duration_minutes, strategy,
+                                date_from, date_to, granularity, 1)
+        return found[0] if found else None
+
+    def find_slots_for_duration(
+            self, duration_minutes: int,
+            limit: int = 10,
+            strategy: str = "earliest",
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            granularity: Optional[int] = None
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Функция для поиска нескольких свободных таймслотов
+            по продолжительности.
+
+        Args:
+            duration_minutes (int, example=120): количество минут,
+            для которых необходимо найти свободные таймслоты.
+            limit (int, default=10): максимальное количество таймслотов.
+            strategy (str, default="earliest"): earliest - самые ранние
+                подходящие таймслоты, best - самые короткие из подходящих.
+            date_from (Optional[str], default=None, example="2025-02-16"):
+                Первая дата поиска включительно.
+            date_to (Optional[str], default=None, example="2025-02-18"):
+                Последняя дата поиска включительно.
+            granularity (Optional[int], default=None, example=15): Шаг
+                сетки в минутах, на которую выравнивается начало таймслота.
+
+        Raises:
+            SchedulerError: если нет данных для анализа.
+            SchedulerError: если duration_minutes отсутствует.
+            ValueError: если параметры поиска не прошли валидацию.
+
+        Returns:
+            List[Tuple[str, str, str]]. [('2025-02-15', '12:00', '17:30')]
+
+        Example:
+            >> scheduler = Scheduler()
+            >> scheduler.find_slots_for_duration(60, limit=3, strategy="best")
+        """
+        return self._find_gaps(duration_minutes, strategy,
+                               date_from, date_to, granularity, limit)
+
+    @instrument
+    def place_many(
+            self, durations: Iterable[int],
+            strategy: str = "earliest",
+            buffer: int = 0,
+            max_per_day: Optional[int] = None,
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            book: bool = False
+    ) -> Tuple[List[Tuple[int, str, str, str]], List[int]]:
+        """
+        Функция для размещения нескольких встреч за один вызов.
+
+        Встречи размещаются в порядке durations: каждая занимает начало
+            выбранного свободного интервала, и следующие встречи
+            размещаются в оставшемся времени, поэтому результаты не
+            пересекаются. Индекс строится один раз на вызов, размещение
+            одной встречи занимает O(log n).
+
+        Args:
+            durations (Iterable[int], example=[60, 30, 90]): длины встреч
+                в минутах.
+            strategy (str, default="earliest"): earliest - самый ранний
+                подходящий интервал, best - самый короткий из подходящих.
+            buffer (int, default=0): минимальный промежуток в минутах
+                между встречей и соседними таймслотами или встречами.
+                Границы рабочего дня промежутка не требуют.
+            max_per_day (Optional[int], default=None, example=3):
+                Максимальное количество встреч, размещаемых в один день.
+            date_from (Optional[str], default=None, example="2025-02-16"):
+                Первая дата размещения включительно.
+            date_to (Optional[str], default=None, example="2025-02-18"):
+                Последняя дата размещения включительно.
+            book (bool, default=False): Забронировать размещённые встречи
+                одним изменением расписания.
+
+        Raises:
+            SchedulerError: если нет данных для анализа.
+            SchedulerError: если одна из длин отсутствует.
+            ValueError: если параметры размещения не прошли валидацию.
+
+        Returns:
+            Tuple[List[Tuple[int, str, str, str]], List[int]]. Номер
+                встречи в durations, дата, начало и окончание размещённых
+                встреч и номера встреч, которые не удалось разместить
+            ([(0, '2025-02-15', '12:00', '13:00')], [1])
+
+        Example:
+            >> scheduler = Scheduler()
+            >> scheduler.place_many([60, 30, 90], strategy="best",
+            >>                      buffer=10, max_per_day=2)
+        """
+        if isinstance(durations, (str, bytes)):
+            raise ValueError("durations must be an iterable of integers")
+        durations = list(durations)
+        for duration in durations:
+            self._validate_duration(duration)
+        if strategy not in ("earliest", "best"):
+            raise ValueError("strategy must be 'earliest' or 'best'")
+        if not isinstance(buffer, int) or buffer < 0:
+            raise ValueError("buffer must be a non-negative integer")
+        if max_per_day is not None and (not isinstance(max_per_day, int) or
+                                        max_per_day <= 0):
+            raise ValueError("max_per_day must be a positive integer")
+        if date_from is not None:
+            self._validate_date(date_from)
+        if date_to is not None:
+            self._validate_date(date_to)
+        if not book:
+            placements = GapAllocator.from_index(
+                self._get_index(), date_from, date_to, strategy, buffer,
+                max_per_day
+            ).place_many(durations)
+        else:
+            with self._write_lock:
+                placements = GapAllocator.from_index(
+                    self._get_index(), date_from, date_to, strategy, buffer,
+                    max_per_day
+                ).place_many(durations)
+                self._book_placements([placement for placement in placements
+                                       if placement is not None])
+        placed = []
+        unplaced = []
+        for pos, placement in enumerate(placements):
+            if placement is None:
+                unplaced.append(pos)
+            else:
+                date, start, end = placement
+                placed.append((pos, date, minutes_to_time(start),
+                               minutes_to_time(end)))
+        return placed, unplaced
+
+    def _book_placements(
+            self, placements: List[Tuple[str, int, int]]
+    ) -> None:
+        """
+        Служебная функция для бронирования размещённых встреч.
+
+        Дни по правилам становятся днями расписания, после чего все
+            встречи добавляются одним изменением таймслотов.
+
+        Args:
+            placements (List[Tuple[str, int, int]]): дата, начало
+                и окончание встреч в минутах.
+
+        Example:
+            >> self._book_placements([("2025-02-15", 720, 780)])
+        """
+        if not placements:
+            return
+        index = self._get_index()
+        for date in sorted({date for date, _, _ in placements}):
+            if date not in index.day_ids:
+                index = index.with_day(date)
+        if index is not self._index:
+            self._schedule_data = None
+            self._index = index
+        first_id = index.last_timeslot_id + 1
+        self._apply_delta({"added": [
+            {"day_id": index.day_ids[date],
+             "end": minutes_to_time(end),
+             "id": timeslot_id,
+             "start": minutes_to_time(start)}
+            for timeslot_id, (date, start, end) in enumerate(placements,
+                                                             first_id)
+        ]})
+
+    def occupancy(
+            self, date_from: Optional[str] = None,
+            date_to: Optional[str] = None
+    ) -> OccupancyMatrix:
+        """
+        Функция для получения матрицы занятости расписания.
+
+        Матрица строится по индексу при первом вызове и переиспользуется,
+            пока не изменились расписание и диапазон дат.
+
+        Args:
+            date_from (Optional[str], default=None, example="2025-01-01"):
+                Первая дата включительно.
+            date_to (Optional[str], default=None, example="2025-12-31"):
+                Последняя дата включительно.
+
+        Raises:
+            SchedulerError: если нет данных для анализа.
+            ValueError: если дата не является строкой или не прошла
+                валидацию.
+
+        Returns:
+            OccupancyMatrix
+
+        Example:
+            >> scheduler = Scheduler()
+            >> matrix = scheduler.occupancy("2025-01-01", "2025-12-31")
+            >> matrix.are_available(dates, starts, ends)
+        """
+        if date_from is not None:
+            self._validate_date(date_from)
+        if date_to is not None:
+            self._validate_date(date_to)
+        index = self._get_index()
+        cached = self._occupancy
+        if cached is not None and cached[0] is index and \
+                cached[1:4] == (index.version, date_from, date_to):
+            return cached[4]
+        matrix = OccupancyMatrix.from_index(index, date_from, date_to)
+        self._occupancy = (index, matrix.version, date_from, date_to,
+                           matrix)
+        return matrix
+
+    @instrument
+    def find_free_windows(
+            self, duration_minutes: int,
+            time_from: Optional[str] = None,
+            time_to: Optional[str] = None,
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            granularity: Optional[int] = None,
+            limit: Optional[int] = None
+    ) -> List[Tuple[str, str, str]]:
+        """
+        Функция для поиска дней со свободным окном заданной длины.
+
+        Поиск выполняется по матрице занятости векторно для всех дней
+            сразу, поэтому подходит для запросов на год и более.
+
+        Args:
+            duration_minutes (int, example=90): длина окна в минутах.
+            time_from (Optional[str], default=None, example="10:00"):
+                Окно начинается не раньше этого времени.
+            time_to (Optional[str], default=None, example="16:00"):
+                Окно заканчивается не позже этого времени.
+            date_from (Optional[str], default=None, example="2025-01-01"):
+                Первая дата поиска включительно.
+            date_to (Optional[str], default=None, example="2025-12-31"):
+                Последняя дата поиска включительно.
+            granularity (Optional[int], default=None, example=15): Шаг
+                сетки в минутах, на которую выравнивается начало окна.
+            limit (Optional[int], default=None, example=10): максимальное
+                количество дней. None - все подходящие дни.
+
+        Raises:
+            SchedulerError: если нет данных для анализа.
+            SchedulerError: если duration_minutes отсутствует.
+            ValueError: если параметры поиска не прошли валидацию.
+
+        Returns:
+            List[Tuple[str, str, str]]. Дата, начало самого раннего окна
+                дня и окончание свободного интервала, содержащего окно
+            [('2025-02-17', '10:00', '12:30')]
+
+        Example:
+            >> scheduler = Scheduler()
+            >> scheduler.find_free_windows(90, "10:00", "16:00",
+            >>                             date_from="2025-01-01",
+            >>                             date_to="2025-12-31")
+        """
+        self._validate_duration(duration_minutes)
+        start = 0 if time_from is None else self._validate_time(time_from)
+        end = MINUTES_IN_DAY if time_to is None else \
+            self._validate_time(time_to)
+        if start >= end:
+            raise ValueError("Start time must be before end time")
+        if granularity is not None and (not isinstance(granularity, int) or
+                                        granularity <= 0):
+            raise ValueError("granularity must be a positive integer")
+        if limit is not None and (not isinstance(limit, int) or limit <= 0):
+            raise ValueError("limit must be a positive integer")
+        matrix = self.occupancy(date_from, date_to)
+        return [(date, minutes_to_time(window_start),
+                 minutes_to_time(min(window_end, MINUTES_IN_DAY - 1)))
+                for date, window_start, window_end in matrix.find_windows(
+                    duration_minutes, start, end, granularity, limit=limit
+                )]
+
+    @instrument
+    def stats(
+            self, date_from: Optional[str] = None,
+            date_to: Optional[str] = None
+    ) -> ScheduleStats:
+        """
+        Функция для расчёта показателей загрузки расписания.
+
+        Загрузка дней, распределение занятых минут по часам суток
+            и распределение длин свободных интервалов считаются одним
+            векторным проходом по интервалам индекса, без перевода
+            таймслотов в строки.
+
+        Args:
+            date_from (Optional[str], default=None, example="2025-01-01"):
+                Первая дата включительно.
+            date_to (Optional[str], default=None, example="2025-12-31"):
+                Последняя дата включительно.
+
+        Raises:
+            SchedulerError: если нет данных для анализа.
+            ValueError: если дата не является строкой или не прошла
+                валидацию.
+
+        Returns:
+            ScheduleStats
+
+        Example:
+            >> scheduler = Scheduler()
+            >> stats = scheduler.stats("2025-01-01", "2025-12-31")
+            >> stats.occupancy, stats.hour_busy, stats.longest_gap()
+            >> stats.to_dict(min_gap=10)
+        """
+        if date_from is not None:
+            self._validate_date(date_from)
+        if date_to is not None:
+            self._validate_date(date_to)
+        return ScheduleStats.from_index(self._get_index(), date_from, date_to)
+
+    def book(
+            self, date: str, time_start: str, time_end: str
+    ) -> int:
+        """
+        Функция для бронирования таймслота.
+
+        Проверка доступности и добавление таймслота выполняются атомарно,
+            пересчитываются только данные выбранного дня. День, заданный
+            правилом, при первом бронировании становится днём расписания.
+
+        Args:
+            date (str, example='2025-02-18'): дата таймслота.
+            time_start (str, example='16:00'): время начала таймслота.
+            time_end (str, example='16:30'): время окончания таймслота.
+
+        Raises:
+            SchedulerError: если нет данных для анализа.
+            SchedulerError: если date, time_start или time_end отсутствует.
+            SchedulerError: если таймслот недоступен для бронирования.
+            ValueError: если date, time_start или time_end не является
+                строкой или не прошёл валидацию.
+
+        Returns:
+            int. id созданного таймслота
+
+        Example:
+            >> scheduler = Scheduler()
+            >> scheduler.book("2025-02-18", "16:00", "16:30")
+        """
+        date, start, end = self._parse_slot(date, time_start, time_end)
+        with self._write_lock:
+            index = self._get_index()
+            if not self._check_is_available(index, date, start, end):
+                raise self.SchedulerError("Timeslot is not available")
+            if date not in index.day_ids:
+                index = index.with_day(date)
+                self._schedule_data = None
+                self._index = index
+            timeslot_id = index.last_timeslot_id + 1
+            self._apply_delta({"added": [{"day_id": index.day_ids[date],
+                                          "end": time_end,
+                                          "id": timeslot_id,
+                                          "start": time_start}]})
+        return timeslot_id
+
+    def release(
+            self, date: str, time_start: str, time_end: str
+    ) -> int:
+        """
+        Функция для отмены бронирования таймслота.
+
+        Пересчитываются только данные выбранного дня.
+
+        Args:
+            date (str, example='2025-02-18'): дата таймслота.
+            time_start (str, example='16:00'): время начала таймслота.
+            time_end (str, example='16:30'): время окончания таймслота.
+
+        Raises:
+            SchedulerError: если нет данных для анализа.
+            SchedulerError: если date, time_start или time_end отсутствует.
+            SchedulerError: если такой таймслот не забронирован.
+            ValueError: если date, time_start или time_end не является
+                строкой или не прошёл валидацию.
+
+        Returns:
+            int. id удалённого таймслота
+
+        Example:
+            >> scheduler = Scheduler()
+            >> scheduler.release("2025-02-18", "16:00", "16:30")
+        """
+        date, start, end = self._parse_slot(date, time_start, time_end)
+        with self._write_lock:
+            timeslot_id = self._get_index().find_timeslot(date, start, end)
+            if timeslot_id is None:
+                raise self.SchedulerError("Timeslot is not booked")
+            self._apply_delta({"removed": [timeslot_id]})
+        return timeslot_id
+
+    def to_dataframe(
+            self, free: bool = False
+    ) -> "pd.DataFrame":
+        """
+        Функция для выгрузки таймслотов в DataFrame.
+
+        pandas импортируется только при вызове функции.
+
+        Args:
+            free (bool, default=False): Выгрузить свободные таймслоты
+                вместо занятых.
+
+        Raises:
+            SchedulerError: если нет данных для анализа.
+
+        Returns:
+            pd.DataFrame с колонками date, start, end
+
+        Example:
+            >> scheduler = Scheduler()
+            >> scheduler.to_dataframe(free=True)
+        """
+        import pandas as pd
+
+        slots = self.get_free_slots() if free else self.get_busy_slots()
+        return pd.DataFrame(slots, columns=["date", "start", "end"])
+
+
+if __name__ == "__main__":
+    import sys
+
+    from scheduler_cli import main
+
+    sys.exit(main())
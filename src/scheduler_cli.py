@@ -0,0 +1,295 @@
+"""Командная строка для запросов к расписанию.
+
+Модули с numpy и requests импортируются только при выполнении команды,
+а расписание берётся из кэша снимков, поэтому повторные запуски
+не обращаются к API и не разбирают JSON.
+"""
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, Sequence, TYPE_CHECKING, TextIO
+
+from settings import (CACHE_DIR,
+                      CACHE_TTL,
+                      DEFAULT_API_URL,
+                      SERVER_CACHE_SIZE,
+                      SERVER_HOST,
+                      SERVER_PORT,
+                      SERVER_REFRESH_INTERVAL)
+
+if TYPE_CHECKING:
+    from scheduler import Scheduler
+
+
+def load_scheduler(
+        url: str = DEFAULT_API_URL,
+        file: str | os.PathLike | None = None,
+        db: str | os.PathLike | None = None,
+        cache_dir: str | os.PathLike | None = CACHE_DIR,
+        ttl: float = CACHE_TTL,
+        stream: bool = False
+) -> "Scheduler":
+    """
+    Функция для загрузки расписания из API, файла JSON или базы SQLite.
+
+    Снимок файла в кэше используется, пока файл не изменился. База
+    SQLite не загружается целиком: запросы по датам читают только
+    выбранные дни.
+
+    Args:
+        url (str, default=DEFAULT_API_URL): URL Endpoint расписания.
+        file (str | os.PathLike | None, default=None): файл с ответом
+            API. Если задан, url не используется.
+        db (str | os.PathLike | None, default=None): база SQLite,
+            созданная import-db. Если задана, url, file и кэш
+            не используются.
+        cache_dir (str | os.PathLike | None, default=CACHE_DIR): каталог
+            кэша снимков. None - не использовать кэш.
+        ttl (float, default=CACHE_TTL): время в секундах, в течение
+            которого снимок ответа API считается свежим.
+        stream (bool, default=False): разбирать ответ API потоково.
+
+    Raises:
+        ValueError: если URL не прошёл валидацию или файл не является
+            объектом JSON.
+        OSError: если файл не читается или запрос к API не удался,
+            а снимка в кэше нет.
+
+    Returns:
+        Scheduler
+
+    Example:
+        >> scheduler = load_scheduler(file="schedule.json")
+    """
+    from scheduler import Scheduler
+    from schedule_index import ScheduleArrays
+    from schedule_sources import JSONFileSource, SQLiteSource
+    from snapshot_cache import SnapshotCache
+
+    if db is not None:
+        return Scheduler(source=SQLiteSource(db))
+    cache = SnapshotCache(cache_dir, ttl=ttl) \
+        if cache_dir is not None else None
+    if file is None:
+        return Scheduler(url, cache=cache, stream=stream)
+    source = JSONFileSource(file)
+    snapshot = cache.load(source.key) if cache is not None else None
+    if snapshot is not None and \
+            snapshot.created >= source.path.stat().st_mtime:
+        return Scheduler.from_snapshot(snapshot)
+    arrays = ScheduleArrays.from_schedule_data(source.load())
+    if cache is not None:
+        try:
+            cache.store(source.key, arrays)
+        except OSError:
+            pass
+    return Scheduler.from_arrays(arrays)
+
+
+def format_result(result: Any) -> str:
+    """
+    Функция для вывода результата запроса в текстовом виде.
+
+    Args:
+        result (Any): результат метода Scheduler.
+
+    Returns:
+        str. Слоты по одному в строке, поля через пробел
+        2025-02-15 09:00 12:00
+
+    Example:
+        >> print(format_result(scheduler.get_free_slots()))
+    """
+    if result is None:
+        return ""
+    if isinstance(result, bool):
+        return "true" if result else "false"
+    if isinstance(result, str):
+        return result
+    if result and isinstance(result[0], str):
+        return " ".join(result)
+    return "\n".join(format_result(item) for item in result)
+
+
+def run_bulk(scheduler: "Scheduler", lines: TextIO, out: TextIO) -> int:
+    """
+    Функция для выполнения запросов, прочитанных по одному в строке.
+
+    Каждая строка - JSON объект с именем запроса в query и параметрами
+    run_query. На каждую непустую строку выводится одна строка JSON
+    с result или error, результаты выводятся по мере выполнения.
+
+    Args:
+        scheduler (Scheduler): расписание.
+        lines (TextIO): входной поток запросов.
+        out (TextIO): выходной поток результатов.
+
+    Returns:
+        int. Количество запросов с ошибкой.
+
+    Example:
+        >> run_bulk(scheduler, io.StringIO(
+        >>     '{"query": "find", "duration_minutes": 60}\\n'
+        >> ), sys.stdout)
+    """
+    from scheduler import Scheduler
+    from scheduler_queries import run_query
+
+    errors = 0
+    dumps = json.JSONEncoder(separators=(",", ":")).encode
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            query = json.loads(line)
+            if not isinstance(query, dict):
+                raise ValueError("query must be a JSON object")
+            response = {"result": run_query(scheduler, query.pop("query", ""),
+                                            query)}
+        except (ValueError, Scheduler.SchedulerError) as exc:
+            errors += 1
+            response = {"error": str(exc)}
+        out.write(dumps(response) + "\n")
+    return errors
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    source = argparse.ArgumentParser(add_help=False)
+    group = source.add_argument_group("источник расписания")
+    group.add_argument("--url", default=DEFAULT_API_URL,
+                       help="URL Endpoint расписания")
+    group.add_argument("--file", default=None,
+                       help="файл JSON в формате ответа API")
+    group.add_argument("--db", default=None,
+                       help="база SQLite, созданная import-db")
+    group.add_argument("--cache-dir", default=CACHE_DIR,
+                       help="каталог кэша снимков")
+    group.add_argument("--no-cache", action="store_true",
+                       help="не использовать кэш снимков")
+    group.add_argument("--ttl", type=float, default=CACHE_TTL,
+                       help="время жизни снимка ответа API в секундах")
+    group.add_argument("--stream", action="store_true",
+                       help="разбирать ответ API потоково")
+    output = argparse.ArgumentParser(add_help=False)
+    output.add_argument("--json", action="store_true",
+                        help="вывести результат в JSON")
+    ranges = argparse.ArgumentParser(add_help=False)
+    ranges.add_argument("--date-from", default=None)
+    ranges.add_argument("--date-to", default=None)
+
+    parser = argparse.ArgumentParser(prog="scheduler",
+                                     description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    for name, title in (("free", "свободные таймслоты"),
+                        ("busy", "занятые таймслоты")):
+        command = commands.add_parser(name, help=title,
+                                      parents=[source, output, ranges])
+        command.add_argument("date", nargs="?", default=None)
+        command.add_argument("--dates", nargs="+", default=None)
+        if name == "busy":
+            command.add_argument("--merged", action="store_true",
+                                 help="объединить пересекающиеся таймслоты")
+    command = commands.add_parser("available", help="проверка слота",
+                                  parents=[source, output])
+    command.add_argument("date")
+    command.add_argument("time_start")
+    command.add_argument("time_end")
+    command = commands.add_parser("find", help="поиск слота",
+                                  parents=[source, output, ranges])
+    command.add_argument("duration_minutes", type=int)
+    command.add_argument("--strategy", choices=("earliest", "best"),
+                         default="earliest")
+    command.add_argument("--granularity", type=int, default=None)
+    command.add_argument("--limit", type=int, default=None)
+    command = commands.add_parser("windows", help="дни со свободным окном",
+                                  parents=[source, output, ranges])
+    command.add_argument("duration_minutes", type=int)
+    command.add_argument("--time-from", default=None)
+    command.add_argument("--time-to", default=None)
+    command.add_argument("--granularity", type=int, default=None)
+    command.add_argument("--limit", type=int, default=None)
+    command = commands.add_parser(
+        "import-db", parents=[source],
+        help="сохранить расписание в базу SQLite"
+    )
+    command.add_argument("database")
+    commands.add_parser(
+        "bulk", parents=[source],
+        help="запросы JSON по одному в строке из stdin"
+    )
+    command = commands.add_parser("serve", parents=[source],
+                                  help="HTTP сервис запросов к расписанию")
+    command.add_argument("--host", default=SERVER_HOST)
+    command.add_argument("--port", type=int, default=SERVER_PORT)
+    command.add_argument("--refresh-interval", type=float,
+                         default=SERVER_REFRESH_INTERVAL)
+    command.add_argument("--cache-size", type=int,
+                         default=SERVER_CACHE_SIZE)
+    return parser
+
+
+def _query_params(args: argparse.Namespace) -> Dict[str, Any]:
+    from scheduler_queries import QUERIES
+
+    _, params = QUERIES[args.command]
+    return {param: getattr(args, param) for param in params
+            if getattr(args, param, None) is not None}
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """
+    Точка входа команды scheduler и python -m scheduler.
+
+    Args:
+        argv (Sequence[str] | None, default=None): аргументы командной
+            строки без имени программы.
+
+    Returns:
+        int. Код завершения: 0 - успех, 1 - слот занят или не найден,
+            либо в bulk есть запросы с ошибкой, 2 - ошибка.
+
+    Example:
+        >> main(["available", "2025-02-15", "09:00", "10:00"])
+    """
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    from scheduler import Scheduler
+
+    try:
+        scheduler = load_scheduler(
+            url=args.url, file=args.file, db=args.db,
+            cache_dir=None if args.no_cache else args.cache_dir,
+            ttl=args.ttl, stream=args.stream
+        )
+        if args.command == "import-db":
+            from schedule_sources import SQLiteSource
+
+            SQLiteSource.create(args.database,
+                                scheduler._get_index().to_arrays())
+            return 0
+        if args.command == "bulk":
+            return 1 if run_bulk(scheduler, sys.stdin, sys.stdout) else 0
+        if args.command == "serve":
+            import asyncio
+
+            from scheduler_server import serve
+
+            refresh_interval = args.refresh_interval or None
+            try:
+                asyncio.run(serve(scheduler, args.host, args.port,
+                                  refresh_interval if args.file is None
+                                  else None, args.cache_size))
+            except KeyboardInterrupt:
+                pass
+            return 0
+        from scheduler_queries import run_query
+
+        result = run_query(scheduler, args.command, _query_params(args))
+    except (OSError, ValueError, Scheduler.SchedulerError) as exc:
+        print(f"{parser.prog}: error: {exc}", file=sys.stderr)
+        return 2
+    text = json.dumps(result) if args.json else format_result(result)
+    if text:
+        print(text)
+    return 1 if result is None or result is False else 0
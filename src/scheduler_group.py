@@ -0,0 +1,262 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Iterable, List, Optional, Tuple
+
+from async_scheduler import AsyncScheduler
+
+from schedule_index import (Interval,
+                            ScheduleIndex,
+                            align_up,
+                            intervals_covered_by,
+                            minutes_to_time)
+
+from scheduler import Scheduler
+
+from settings import FETCH_CONCURRENCY, PARALLEL_MIN_DAYS, REQUEST_TIMEOUT
+
+DayIntervals = Tuple[str, List[Tuple[Interval, ...]]]
+
+
+def _cover_days(
+        days: List[DayIntervals], min_free: int
+) -> List[Tuple[str, Tuple[Interval, ...]]]:
+    """Расчёт общих свободных интервалов для части дней в пуле процессов."""
+    return [(date, intervals_covered_by(day_intervals, min_free))
+            for date, day_intervals in days]
+
+
+class SchedulerGroup:
+    """Общее свободное время нескольких расписаний.
+
+    Свободные интервалы расписаний объединяются по дням алгоритмом
+    заметающей прямой. Для длинных горизонтов расчёт по дням можно
+    распределить по пулу процессов.
+
+    Attributes:
+        schedulers (List[Scheduler]): расписания ресурсов группы.
+        processes (Optional[int]): количество процессов для расчёта.
+            None - расчёт в текущем процессе.
+
+    Example:
+        >> group = SchedulerGroup([room_a, room_b, room_c])
+        >> group.get_common_free_slots("2025-02-17", min_free=2)
+    """
+    schedulers: List[Scheduler]
+    processes: Optional[int]
+
+    def __init__(self,
+                 schedulers: Iterable[Scheduler],
+                 processes: Optional[int] = None):
+        self.schedulers = list(schedulers)
+        if not self.schedulers:
+            raise ValueError("schedulers must not be empty")
+        if processes is not None and (not isinstance(processes, int) or
+                                      processes <= 0):
+            raise ValueError("processes must be a positive integer")
+        self.processes = processes
+
+    @classmethod
+    def from_urls(
+            cls, api_urls: Iterable[str],
+            concurrency: int = FETCH_CONCURRENCY,
+            timeout: float = REQUEST_TIMEOUT,
+            processes: Optional[int] = None
+    ) -> "SchedulerGroup":
+        """
+        Функция для создания группы с параллельной загрузкой расписаний.
+
+        Args:
+            api_urls (Iterable[str]): URL Endpoint'ы расписаний ресурсов.
+            concurrency (int, default=FETCH_CONCURRENCY): Максимальное
+                количество одновременных запросов.
+            timeout (float, default=REQUEST_TIMEOUT): Таймаут запроса.
+            processes (Optional[int], default=None): Количество процессов
+                для расчёта.
+
+        Returns:
+            SchedulerGroup
+
+        Example:
+            >> group = SchedulerGroup.from_urls([url_1, url_2])
+        """
+        async def load():
+            async with AsyncScheduler(concurrency, timeout) as client:
+                return await client.fetch_many(api_urls)
+
+        return cls(asyncio.run(load()), processes)
+
+    def _validate_min_free(self, min_free: Optional[int]) -> int:
+        """
+        Служебная функция для валидации количества свободных ресурсов.
+
+        Args:
+            min_free (Optional[int], example=2): Входные данные.
+                None - все ресурсы группы.
+
+        Raises:
+            ValueError: если min_free не является int или выходит за
+                пределы от 1 до количества расписаний.
+
+        Returns:
+            int. 2
+
+        Example:
+            >> self._validate_min_free(2)
+        """
+        if min_free is None:
+            return len(self.schedulers)
+        if (not isinstance(min_free, int) or
+                not 1 <= min_free <= len(self.schedulers)):
+            raise ValueError("min_free must be between 1 and "
+                             "number of schedulers")
+        return min_free
+
+    def _get_indexes(self) -> List[ScheduleIndex]:
+        """
+        Служебная функция для получения индексов всех расписаний.
+
+        Raises:
+            SchedulerError: если у одного из расписаний нет данных.
+
+        Returns:
+            List[ScheduleIndex]
+
+        Example:
+            >> indexes = self._get_indexes()
+        """
+        return [scheduler._get_index() for scheduler in self.schedulers]
+
+    def _common_free(
+            self, indexes: List[ScheduleIndex], dates: List[str],
+            min_free: int
+    ) -> List[Tuple[str, Tuple[Interval, ...]]]:
+        """
+        Служебная функция для расчёта общих свободных интервалов по дням.
+
+        Args:
+            indexes (List[ScheduleIndex]): индексы расписаний.
+            dates (List[str]): отсортированные даты для расчёта.
+            min_free (int): минимальное количество свободных ресурсов.
+
+        Returns:
+            List[Tuple[str, Tuple[Tuple[int, int], ...]]]
+
+        Example:
+            >> self._common_free(indexes, ["2025-02-17"], 2)
+        """
+        days = [(date, [index.day_free(date) for index in indexes])
+                for date in dates]
+        if self.processes is None or len(days) < PARALLEL_MIN_DAYS:
+            return _cover_days(days, min_free)
+        chunk_size = -(-len(days) // (self.processes * 4))
+        chunks = [days[pos:pos + chunk_size]
+                  for pos in range(0, len(days), chunk_size)]
+        with ProcessPoolExecutor(self.processes) as executor:
+            return [day for chunk in executor.map(_cover_days, chunks,
+                                                  repeat(min_free))
+                    for day in chunk]
+
+    def get_common_free_slots(
+            self, date: Optional[str] = None,
+            min_free: Optional[int] = None
+    ) -> List[Tuple[str, str, str] | Tuple[str, str]]:
+        """
+        Функция для получения общих свободных слотов группы.
+
+        Args:
+            date (Optional[str], default=None, example="2025-02-17"):
+                Дата для получения свободных таймслотов.
+            min_free (Optional[int], default=None, example=2): Минимальное
+                количество свободных ресурсов. None - все ресурсы группы.
+
+        Raises:
+            SchedulerError: если у одного из расписаний нет данных.
+            ValueError: если date или min_free не прошли валидацию.
+
+        Returns:
+            List[Tuple[str, str, str]]
+            [('2025-02-15', '12:00', '17:30')] (date is None)
+
+            List[Tuple[str, str]]
+            [('12:00', '17:30')] (date is not None)
+
+        Example:
+            >> group.get_common_free_slots(min_free=2)
+        """
+        if date:
+            self.schedulers[0]._validate_date(date)
+        min_free = self._validate_min_free(min_free)
+        indexes = self._get_indexes()
+        if date:
+            return [(minutes_to_time(start), minutes_to_time(end))
+                    for _, intervals in self._common_free(indexes, [date],
+                                                          min_free)
+                    for start, end in intervals]
+        dates = sorted(set().union(*(index.iter_dates() for index in indexes)))
+        return [(day, minutes_to_time(start), minutes_to_time(end))
+                for day, intervals in self._common_free(indexes, dates,
+                                                        min_free)
+                for start, end in intervals]
+
+    def find_common_slot_for_duration(
+            self, duration_minutes: int,
+            min_free: Optional[int] = None,
+            date_from: Optional[str] = None,
+            date_to: Optional[str] = None,
+            granularity: Optional[int] = None
+    ) -> Tuple[str, str, str] | None:
+        """
+        Функция для поиска первого общего свободного таймслота группы.
+
+        Дни, в которых меньше min_free расписаний имеют свободный
+            интервал нужной длины, пропускаются без расчёта.
+
+        Args:
+            duration_minutes (int, example=120): количество минут.
+            min_free (Optional[int], default=None, example=2): Минимальное
+                количество свободных ресурсов. None - все ресурсы группы.
+            date_from (Optional[str], default=None, example="2025-02-16"):
+                Первая дата поиска включительно.
+            date_to (Optional[str], default=None, example="2025-02-18"):
+                Последняя дата поиска включительно.
+            granularity (Optional[int], default=None, example=15): Шаг
+                сетки в минутах, на которую выравнивается начало таймслота.
+
+        Raises:
+            SchedulerError: если у одного из расписаний нет данных.
+            SchedulerError: если duration_minutes отсутствует.
+            ValueError: если параметры поиска не прошли валидацию.
+
+        Returns:
+            Tuple[str, str, str]. ('2025-02-15', '12:00', '17:30')
+            None. Если общий свободный таймслот не найден
+
+        Example:
+            >> group.find_common_slot_for_duration(60, min_free=2)
+        """
+        validator = self.schedulers[0]
+        validator._validate_duration(duration_minutes)
+        if granularity is not None and (not isinstance(granularity, int) or
+                                        granularity <= 0):
+            raise ValueError("granularity must be a positive integer")
+        if date_from is not None:
+            validator._validate_date(date_from)
+        if date_to is not None:
+            validator._validate_date(date_to)
+        min_free = self._validate_min_free(min_free)
+        indexes = self._get_indexes()
+        dates = sorted(set().union(*(index.iter_dates(date_from, date_to)
+                                     for index in indexes)))
+        for date in dates:
+            fitting = sum(index.max_gap(date) >= duration_minutes
+                          for index in indexes)
+            if fitting < min_free:
+                continue
+            for start, end in intervals_covered_by(
+                    [index.day_free(date) for index in indexes], min_free
+            ):
+                start = align_up(start, granularity)
+                if start + duration_minutes <= end:
+                    return date, minutes_to_time(start), minutes_to_time(end)
+        return None
@@ -0,0 +1,98 @@
+from typing import Any, Dict
+from urllib.parse import parse_qsl
+
+from scheduler import Scheduler
+
+# Запрос: (метод Scheduler, допустимые параметры)
+QUERIES = {
+    "free": ("get_free_slots", ("date", "date_from", "date_to", "dates")),
+    "busy": ("get_busy_slots", ("date", "date_from", "date_to", "dates",
+                                "merged")),
+    "available": ("is_available", ("date", "time_start", "time_end")),
+    "find": ("find_slot_for_duration", ("duration_minutes", "strategy",
+                                        "date_from", "date_to",
+                                        "granularity", "limit")),
+    "windows": ("find_free_windows", ("duration_minutes", "time_from",
+                                      "time_to", "date_from", "date_to",
+                                      "granularity", "limit")),
+}
+INT_PARAMS = frozenset(("duration_minutes", "granularity", "limit"))
+BOOL_PARAMS = frozenset(("merged",))
+
+
+def parse_query_string(query_string: str) -> Dict[str, Any]:
+    """
+    Функция для разбора параметров запроса из строки URL.
+
+    Числовые параметры приводятся к int, логические - к bool
+    (1 и true - истина), dates разделяется по запятым.
+
+    Args:
+        query_string (str, example="date=2025-02-15&time_start=09:00"):
+            строка параметров запроса.
+
+    Raises:
+        ValueError: если числовой параметр не является целым числом.
+
+    Returns:
+        Dict[str, Any]. {"date": "2025-02-15", "time_start": "09:00"}
+
+    Example:
+        >> parse_query_string("duration_minutes=60&limit=3")
+    """
+    query = {}
+    for key, value in parse_qsl(query_string, keep_blank_values=True):
+        if key in INT_PARAMS:
+            try:
+                value = int(value)
+            except ValueError:
+                raise ValueError(f"{key} must be an integer") from None
+        elif key in BOOL_PARAMS:
+            value = value.lower() in ("1", "true")
+        elif key == "dates":
+            value = [date for date in value.split(",") if date]
+        query[key] = value
+    return query
+
+
+def run_query(scheduler: Scheduler, name: str, query: Any) -> Any:
+    """
+    Функция для выполнения запроса к расписанию по имени.
+
+    Параметры запроса совпадают с аргументами get_free_slots,
+    get_busy_slots, is_available, find_slot_for_duration
+    и find_free_windows.
+    find с limit вызывает find_slots_for_duration.
+
+    Args:
+        scheduler (Scheduler): расписание.
+        name (str, example="available"): имя запроса из QUERIES.
+        query (Any): параметры запроса.
+
+    Raises:
+        SchedulerError: если нет данных из запроса.
+        ValueError: если запрос неизвестен, query не является словарём,
+            содержит неизвестные параметры или не прошёл валидацию.
+
+    Returns:
+        Any. Результат метода Scheduler.
+
+    Example:
+        >> run_query(scheduler, "available", {"date": "2025-02-15",
+        >>                                    "time_start": "09:00",
+        >>                                    "time_end": "10:00"})
+    """
+    if name not in QUERIES:
+        raise ValueError(f"Unknown query: {name}")
+    method, params = QUERIES[name]
+    if not isinstance(query, dict):
+        raise ValueError("query must be a JSON object")
+    unknown = sorted(set(query) - set(params))
+    if unknown:
+        raise ValueError(f"Unknown parameters: {', '.join(unknown)}")
+    if name == "find" and "limit" in query:
+        method = "find_slots_for_duration"
+    try:
+        return getattr(scheduler, method)(**query)
+    except TypeError as exc:
+        raise ValueError(str(exc)) from None
@@ -0,0 +1,305 @@
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import Any, Tuple
+from urllib.parse import urlsplit
+
+import requests
+
+from scheduler import Scheduler
+
+from scheduler_queries import QUERIES, parse_query_string, run_query
+
+from settings import (SERVER_CACHE_SIZE,
+                      SERVER_HOST,
+                      SERVER_MAX_BODY,
+                      SERVER_PORT,
+                      SERVER_REFRESH_INTERVAL)
+
+logger = logging.getLogger(__name__)
+
+Response = Tuple[int, bytes]
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode()
+
+
+class SchedulerServer:
+    """HTTP сервис запросов к одному загруженному расписанию.
+
+    Сервис держит один экземпляр Scheduler с построенным индексом
+    и отвечает на запросы из цикла событий asyncio без обращений к API.
+    Расписание обновляется условными запросами в фоне. Ответы
+    кэшируются до изменения расписания.
+
+    Эндпоинты /free, /busy, /available и /find принимают GET запрос
+    с параметрами в строке запроса или POST запрос с JSON массивом
+    запросов (пакетный режим). Параметры описаны в run_query.
+
+    Attributes:
+        scheduler (Scheduler): расписание, на которое отвечает сервис.
+        host (str): адрес, на котором слушает сервис.
+        port (int): порт сервиса. 0 - выбрать свободный порт при запуске.
+        refresh_interval (float | None): интервал фонового обновления
+            в секундах. None - не обновлять.
+        cache_size (int): количество кэшированных ответов.
+
+    Example:
+        >> async with SchedulerServer(Scheduler(api_url)) as server:
+        >>     await server.serve_forever()
+    """
+    scheduler: Scheduler
+    host: str
+    port: int
+    refresh_interval: float | None
+    cache_size: int
+
+    def __init__(self,
+                 scheduler: Scheduler,
+                 host: str = SERVER_HOST,
+                 port: int = SERVER_PORT,
+                 refresh_interval: float | None = SERVER_REFRESH_INTERVAL,
+                 cache_size: int = SERVER_CACHE_SIZE):
+        if refresh_interval is not None and refresh_interval <= 0:
+            raise ValueError("refresh_interval must be positive")
+        if not isinstance(cache_size, int) or cache_size < 0:
+            raise ValueError("cache_size must be a non-negative integer")
+        self.scheduler = scheduler
+        self.host = host
+        self.port = port
+        self.refresh_interval = refresh_interval
+        self.cache_size = cache_size
+        self._cache: OrderedDict[Tuple[str, str], Response] = OrderedDict()
+        self._cache_version = None
+        self._server: asyncio.AbstractServer | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "SchedulerServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def url(self) -> str:
+        """Адрес сервиса."""
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        """
+        Функция для запуска сервиса и фонового обновления.
+
+        Example:
+            >> await server.start()
+        """
+        self._server = await asyncio.start_server(self._handle_connection,
+                                                  self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.refresh_interval is not None:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
+
+    async def serve_forever(self) -> None:
+        """
+        Функция для обработки запросов до отмены задачи.
+
+        Example:
+            >> await server.serve_forever()
+        """
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        """
+        Функция для остановки сервиса.
+
+        Example:
+            >> await server.close()
+        """
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _refresh_loop(self) -> None:
+        """
+        Служебная функция для периодического обновления расписания.
+
+        Ошибка обновления записывается в лог и не останавливает цикл:
+        сервис отвечает по прежнему расписанию до следующей попытки.
+        """
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await asyncio.to_thread(self.scheduler.refresh)
+            except asyncio.CancelledError:
+                raise
+            except requests.RequestException as exc:
+                logger.warning("Schedule refresh failed: %s", exc)
+            except Exception:
+                logger.exception("Schedule refresh failed")
+
+    def _query(self, endpoint: str, query: Any) -> Response:
+        """
+        Служебная функция для ответа на один запрос.
+
+        Args:
+            endpoint (str, example="/free"): эндпоинт сервиса.
+            query (Any): параметры запроса.
+
+        Returns:
+            Tuple[int, bytes]. HTTP статус и JSON ответа
+            (200, b'{"result":[["09:00","12:30"]]}')
+        """
+        try:
+            result = run_query(self.scheduler, endpoint[1:], query)
+        except Scheduler.SchedulerError as exc:
+            return HTTPStatus.CONFLICT, _dumps({"error": str(exc)})
+        except ValueError as exc:
+            return HTTPStatus.BAD_REQUEST, _dumps({"error": str(exc)})
+        return HTTPStatus.OK, _dumps({"result": result})
+
+    def _cached_query(self, endpoint: str, query: Any) -> Response:
+        """Служебная функция для ответа на запрос через кэш ответов."""
+        key = (endpoint, json.dumps(query, sort_keys=True))
+        response = self._cache.get(key)
+        if response is not None:
+            self._cache.move_to_end(key)
+            return response
+        response = self._query(endpoint, query)
+        if self.cache_size:
+            self._cache[key] = response
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return response
+
+    def _check_cache(self) -> None:
+        """
+        Служебная функция для сброса кэша после изменения расписания.
+
+        Индекс не строится: с источником, который загружает только
+        выбранные даты, он не нужен для ответа на запросы по датам.
+        """
+        version = self.scheduler.data_version
+        if version != self._cache_version:
+            self._cache.clear()
+            self._cache_version = version
+
+    def handle(self, method: str, target: str, body: bytes = b"") \
+            -> Response:
+        """
+        Функция для ответа на HTTP запрос к сервису.
+
+        Args:
+            method (str, example="GET"): HTTP метод.
+            target (str, example="/free?date=2025-02-15"): путь запроса
+                со строкой параметров.
+            body (bytes, default=b""): тело POST запроса - JSON объект
+                или массив объектов с параметрами.
+
+        Returns:
+            Tuple[int, bytes]. HTTP статус и JSON ответа
+            (200, b'{"result":[["09:00","12:30"]]}')
+            (200, b'{"results":[{"result":true},{"error":"..."}]}')
+
+        Example:
+            >> server.handle("GET", "/available?date=2025-02-15"
+            >>                      "&time_start=09:00&time_end=10:00")
+        """
+        url = urlsplit(target)
+        if url.path[1:] not in QUERIES:
+            return HTTPStatus.NOT_FOUND, _dumps({"error": "Not found"})
+        self._check_cache()
+        if method == "GET":
+            try:
+                query = parse_query_string(url.query)
+            except ValueError as exc:
+                return HTTPStatus.BAD_REQUEST, _dumps({"error": str(exc)})
+            return self._cached_query(url.path, query)
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, \
+                _dumps({"error": "Method not allowed"})
+        try:
+            queries = json.loads(body)
+        except ValueError:
+            return HTTPStatus.BAD_REQUEST, \
+                _dumps({"error": "Request body must be JSON"})
+        if not isinstance(queries, list):
+            return self._cached_query(url.path, queries)
+        results = [self._cached_query(url.path, query)[1]
+                   for query in queries]
+        return HTTPStatus.OK, b'{"results":[' + b",".join(results) + b"]}"
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        """Служебная функция для обработки запросов одного соединения."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, target, version = \
+                    request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                keep_alive = (headers.get("connection", "").lower() !=
+                              "close" and version.strip() == "HTTP/1.1")
+                length = int(headers.get("content-length") or 0)
+                if length > SERVER_MAX_BODY:
+                    status, payload = HTTPStatus.REQUEST_ENTITY_TOO_LARGE, \
+                        _dumps({"error": "Request body too large"})
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = self.handle(method, target, body)
+                head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                        f"Content-Type: application/json\r\n"
+                        f"Content-Length: {len(payload)}\r\n")
+                if not keep_alive:
+                    head += "Connection: close\r\n"
+                writer.write(head.encode() + b"\r\n" + payload)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(
+        scheduler: Scheduler,
+        host: str = SERVER_HOST,
+        port: int = SERVER_PORT,
+        refresh_interval: float | None = SERVER_REFRESH_INTERVAL,
+        cache_size: int = SERVER_CACHE_SIZE
+) -> None:
+    """
+    Функция для запуска HTTP сервиса до отмены задачи.
+
+    Args:
+        scheduler (Scheduler): загруженное расписание.
+        host (str, default=SERVER_HOST): адрес сервиса.
+        port (int, default=SERVER_PORT): порт сервиса.
+        refresh_interval (float | None, default=SERVER_REFRESH_INTERVAL):
+            интервал фонового обновления в секундах.
+        cache_size (int, default=SERVER_CACHE_SIZE): количество
+            кэшированных ответов.
+
+    Example:
+        >> asyncio.run(serve(Scheduler(api_url), port=8000))
+    """
+    async with SchedulerServer(scheduler, host, port, refresh_interval,
+                               cache_size) as server:
+        logger.info("Serving %s on %s", scheduler.api_url, server.url)
+        await server.serve_forever()
@@ -1,6 +1,20 @@
+import os
 import re
 
 DEFAULT_API_URL = 'https://ofc-test-01.tspb.su/test-task/'
+REQUEST_TIMEOUT = 30
+FETCH_CONCURRENCY = 10
+PARALLEL_MIN_DAYS = 256
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "scheduler")
+CACHE_TTL = 300
+CACHE_MAX_SIZE = 256 * 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+PARSE_CACHE_SIZE = 4096
+SERVER_HOST = '127.0.0.1'
+SERVER_PORT = 8080
+SERVER_REFRESH_INTERVAL = 60
+SERVER_CACHE_SIZE = 4096
+SERVER_MAX_BODY = 1024 * 1024
 DATE_PATTERN = r'(20\d{2}-(0[1-9]|1[0-2])-(0[1-9]|[12]\d|3[01]))'
 TIME_PATTERN = r'([01]\d|2[0-3]):([0-5]\d)'
 URL_PATTERN = re.compile(
@@ -0,0 +1,268 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+
+from schedule_index import ScheduleArrays
+
+from settings import CACHE_DIR, CACHE_MAX_SIZE, CACHE_TTL
+
+SNAPSHOT_MAGIC = b"SCHEDSNP"
+SNAPSHOT_VERSION = 1
+SNAPSHOT_SUFFIX = ".snap"
+
+_PREFIX = struct.Struct("<8sII")
+_ALIGNMENT = 8
+_COLUMNS = (
+    ("day_id", "<i8"),
+    ("day_date", "<i4"),
+    ("day_start", "<u2"),
+    ("day_end", "<u2"),
+    ("slot_id", "<i8"),
+    ("slot_day_id", "<i8"),
+    ("slot_start", "<u2"),
+    ("slot_end", "<u2"),
+)
+
+
+class Snapshot:
+    """Снимок расписания, прочитанный из кэша.
+
+    Массивы ссылаются на отображённый в память файл и не копируются,
+    поэтому несколько процессов, читающих один снимок, разделяют его
+    страницы.
+
+    Attributes:
+        api_url (str): URL, для которого сохранён снимок.
+        created (float): время сохранения снимка (Unix time).
+        etag (str | None): ETag ответа API.
+        last_modified (str | None): Last-Modified ответа API.
+        arrays (ScheduleArrays): дни и таймслоты в виде массивов.
+    """
+    __slots__ = ("api_url", "created", "etag", "last_modified", "arrays")
+
+    api_url: str
+    created: float
+    etag: str | None
+    last_modified: str | None
+    arrays: ScheduleArrays
+
+    def __init__(self, api_url: str, created: float,
+                 etag: str | None, last_modified: str | None,
+                 arrays: ScheduleArrays):
+        self.api_url = api_url
+        self.created = created
+        self.etag = etag
+        self.last_modified = last_modified
+        self.arrays = arrays
+
+    @property
+    def age(self) -> float:
+        """Возраст снимка в секундах."""
+        return time.time() - self.created
+
+
+class SnapshotCache:
+    """Кэш ответов API на диске в компактном бинарном формате.
+
+    Файл снимка состоит из заголовка (сигнатура, версия, длина JSON),
+    JSON с таблицей дат и смещениями колонок и выровненных колонок
+    с id и минутами от начала суток. Запись атомарна: снимок пишется
+    во временный файл и переименовывается.
+
+    Attributes:
+        directory (Path): каталог с файлами снимков.
+        ttl (float): время в секундах, в течение которого снимок
+            считается свежим.
+        max_size (int): максимальный суммарный размер снимков в байтах.
+            При превышении удаляются самые старые снимки.
+
+    Example:
+        >> cache = SnapshotCache(ttl=600)
+        >> scheduler = Scheduler(cache=cache)
+    """
+    directory: Path
+    ttl: float
+    max_size: int
+
+    def __init__(self,
+                 directory: str | os.PathLike = CACHE_DIR,
+                 ttl: float = CACHE_TTL,
+                 max_size: int = CACHE_MAX_SIZE):
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+        if not isinstance(max_size, int) or max_size <= 0:
+            raise ValueError("max_size must be a positive integer")
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.max_size = max_size
+
+    def path(self, api_url: str) -> Path:
+        """
+        Функция для получения пути к файлу снимка.
+
+        Args:
+            api_url (str): URL Endpoint расписания.
+
+        Returns:
+            Path
+
+        Example:
+            >> cache.path(DEFAULT_API_URL)
+        """
+        digest = hashlib.sha256(api_url.encode()).hexdigest()[:32]
+        return self.directory / f"{digest}{SNAPSHOT_SUFFIX}"
+
+    def store(
+            self, api_url: str,
+            schedule: Dict[str, list] | ScheduleArrays,
+            etag: str | None = None,
+            last_modified: str | None = None
+    ) -> Path:
+        """
+        Функция для сохранения снимка расписания.
+
+        Args:
+            api_url (str): URL Endpoint расписания.
+            schedule (Dict[str, list] | ScheduleArrays): ответ API
+                или его колоночное представление.
+            etag (str | None, default=None): ETag ответа API.
+            last_modified (str | None, default=None): Last-Modified
+                ответа API.
+
+        Returns:
+            Path. Путь к файлу снимка.
+
+        Example:
+            >> cache.store(scheduler.api_url, scheduler.schedule_data)
+        """
+        arrays = schedule if isinstance(schedule, ScheduleArrays) else \
+            ScheduleArrays.from_schedule_data(schedule)
+        columns = {}
+        offset = 0
+        for name, dtype in _COLUMNS:
+            column = np.ascontiguousarray(getattr(arrays, name), dtype=dtype)
+            columns[name] = (offset, len(column), column)
+            offset += -(-column.nbytes // _ALIGNMENT) * _ALIGNMENT
+        header = json.dumps({
+            "api_url": api_url,
+            "created": time.time(),
+            "etag": etag,
+            "last_modified": last_modified,
+            "dates": arrays.dates,
+            "columns": {name: [column_offset, count]
+                        for name, (column_offset, count, _)
+                        in columns.items()}
+        }).encode()
+        header += b" " * (-(_PREFIX.size + len(header)) % _ALIGNMENT)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.path(api_url)
+        descriptor, tmp_path = tempfile.mkstemp(dir=self.directory,
+                                                suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                f.write(_PREFIX.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                                     len(header)))
+                f.write(header)
+                data_start = f.tell()
+                for column_offset, _, column in columns.values():
+                    f.seek(data_start + column_offset)
+                    f.write(column.tobytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.evict()
+        return path
+
+    def load(self, api_url: str) -> Snapshot | None:
+        """
+        Функция для чтения снимка расписания.
+
+        Args:
+            api_url (str): URL Endpoint расписания.
+
+        Returns:
+            Snapshot. Снимок независимо от его возраста
+            None. Если снимка нет или файл повреждён
+
+        Example:
+            >> snapshot = cache.load(DEFAULT_API_URL)
+        """
+        try:
+            with open(self.path(api_url), "rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+        try:
+            magic, version, header_size = _PREFIX.unpack_from(buffer)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                return None
+            header = json.loads(
+                buffer[_PREFIX.size:_PREFIX.size + header_size]
+            )
+            if header["api_url"] != api_url:
+                return None
+            data_start = _PREFIX.size + header_size
+            columns = {}
+            for name, dtype in _COLUMNS:
+                column_offset, count = header["columns"][name]
+                columns[name] = np.frombuffer(
+                    buffer, dtype=dtype, count=count,
+                    offset=data_start + column_offset
+                )
+        except (struct.error, ValueError, KeyError):
+            return None
+        return Snapshot(api_url=api_url,
+                        created=header["created"],
+                        etag=header["etag"],
+                        last_modified=header["last_modified"],
+                        arrays=ScheduleArrays(dates=header["dates"],
+                                              **columns))
+
+    def load_fresh(self, api_url: str) -> Snapshot | None:
+        """
+        Функция для чтения снимка, возраст которого не превышает ttl.
+
+        Args:
+            api_url (str): URL Endpoint расписания.
+
+        Returns:
+            Snapshot
+            None. Если снимка нет или он устарел
+
+        Example:
+            >> snapshot = cache.load_fresh(DEFAULT_API_URL)
+        """
+        snapshot = self.load(api_url)
+        if snapshot is None or snapshot.age > self.ttl:
+            return None
+        return snapshot
+
+    def evict(self) -> None:
+        """
+        Функция для удаления самых старых снимков сверх max_size.
+
+        Example:
+            >> cache.evict()
+        """
+        files = []
+        for path in self.directory.glob(f"*{SNAPSHOT_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
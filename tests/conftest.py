@@ -1,13 +1,73 @@
 import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
 
+from schedule_index import ScheduleIndex, minutes_to_time
+
 from scheduler import Scheduler
 
 from settings import DEFAULT_API_URL
 
 
+class StubAPIServer(ThreadingHTTPServer):
+    """Локальный HTTP сервер, отдающий заранее заданные ответы API."""
+    daemon_threads = True
+    request_queue_size = 64
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubAPIHandler)
+        self.routes = {}
+        self.delay = 0
+        self.requests = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def url(self, path: str = "/") -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}{path}"
+
+
+class StubAPIHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append((self.path, dict(self.headers)))
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+        try:
+            time.sleep(server.delay)
+            if self.path not in server.routes:
+                self.send_response(404)
+                self.end_headers()
+                return
+            status, body, *headers = server.routes[self.path]
+            headers = headers[0] if headers else {}
+            if (headers.get("ETag") and
+                    self.headers.get("If-None-Match") == headers["ETag"]):
+                self.send_response(304)
+                self.end_headers()
+                return
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def log_message(self, *args):
+        pass
+
+
 @pytest.fixture()
 def response_mock_data():
     fixture_path = Path(__file__).parent / "fixtures" / "api_response.json"
@@ -25,7 +85,51 @@ def scheduler_mock(response_mock, response_mock_data):
         return scheduler
 
 
+@pytest.fixture()
+def random_index():
+    """Индекс случайного расписания: рабочие дни с 07:00-11:00
+    до 16:00-21:00 и до max_slots таймслотов в день"""
+    def build(seed: int, days_count: int = 120, max_slots: int = 6,
+              slot_starts: range = range(420, 1200, 5),
+              slot_lengths: range = range(10, 180, 5)) -> ScheduleIndex:
+        rnd = random.Random(seed)
+        days = []
+        timeslots = []
+        for day_id in range(1, days_count + 1):
+            days.append({"date": f"2025-{(day_id - 1) // 28 + 1:02d}-"
+                                 f"{(day_id - 1) % 28 + 1:02d}",
+                         "end": minutes_to_time(rnd.randrange(960, 1260,
+                                                              30)),
+                         "id": day_id,
+                         "start": minutes_to_time(rnd.randrange(420, 660,
+                                                                30))})
+            for _ in range(rnd.randrange(max_slots)):
+                start = rnd.choice(slot_starts)
+                timeslots.append({"day_id": day_id,
+                                  "end": minutes_to_time(
+                                      start + rnd.choice(slot_lengths)
+                                  ),
+                                  "id": len(timeslots) + 1,
+                                  "start": minutes_to_time(start)})
+        return ScheduleIndex.from_schedule_data({"days": days,
+                                                 "timeslots": timeslots})
+
+    return build
+
+
 @pytest.fixture()
 def scheduler_nodata():
     scheduler = Scheduler(auto_fetch=False)
     return scheduler
+
+
+@pytest.fixture()
+def stub_api():
+    server = StubAPIServer()
+    thread = threading.Thread(target=server.serve_forever,
+                              kwargs={"poll_interval": 0.01},
+                              daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
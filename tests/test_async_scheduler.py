@@ -0,0 +1,69 @@
+import asyncio
+import os
+
+from async_scheduler import AsyncScheduler
+
+import pytest
+
+import requests
+
+from scheduler import Scheduler
+
+
+def test_fetch_many(stub_api, response_mock_data: dict):
+    data = response_mock_data["data"]
+    stub_api.routes["/a"] = (200, data)
+    stub_api.routes["/b"] = (200, {"days": data["days"][:1],
+                                   "timeslots": []})
+
+    async def load():
+        async with AsyncScheduler() as client:
+            return await client.fetch_many([stub_api.url("/a"),
+                                            stub_api.url("/b")])
+
+    scheduler_a, scheduler_b = asyncio.run(load())
+    assert isinstance(scheduler_a, Scheduler)
+    assert scheduler_a.schedule_data == data
+    assert scheduler_a._index is not None
+    assert scheduler_b.get_free_slots() == [('2025-02-15', '09:00', '21:00')]
+
+
+def test_concurrency_limit(stub_api, response_mock_data: dict):
+    stub_api.routes["/"] = (200, response_mock_data["data"])
+    stub_api.delay = 0.2
+    # Больше размера пула потоков asyncio по умолчанию
+    concurrency = min(32, (os.cpu_count() or 1) + 4) + 4
+
+    async def load():
+        async with AsyncScheduler(concurrency=concurrency) as client:
+            schedulers = await client.fetch_many(
+                [stub_api.url("/")] * concurrency * 2
+            )
+        assert client._executor._shutdown
+        return schedulers
+
+    assert len(asyncio.run(load())) == concurrency * 2
+    assert stub_api.max_active == concurrency
+
+
+def test_fetch_errors(stub_api, response_mock_data: dict):
+    stub_api.routes["/"] = (200, response_mock_data["data"])
+
+    async def load(return_exceptions):
+        async with AsyncScheduler(timeout=1) as client:
+            return await client.fetch_many(
+                [stub_api.url("/"), stub_api.url("/missing")],
+                return_exceptions=return_exceptions
+            )
+
+    scheduler, error = asyncio.run(load(True))
+    assert isinstance(scheduler, Scheduler)
+    assert isinstance(error, requests.HTTPError)
+    with pytest.raises(requests.HTTPError):
+        asyncio.run(load(False))
+
+
+def test_validation_concurrency():
+    with pytest.raises(ValueError,
+                       match="concurrency must be a positive integer"):
+        AsyncScheduler(concurrency=0)
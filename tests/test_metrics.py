@@ -0,0 +1,122 @@
+import json
+
+from metrics import (MetricsRegistry,
+                     add_hook,
+                     hooks_enabled,
+                     instrument,
+                     remove_hook)
+
+import pytest
+
+from scheduler import Scheduler
+
+
+@pytest.fixture
+def registry():
+    registry = MetricsRegistry()
+    add_hook(registry)
+    yield registry
+    remove_hook(registry)
+
+
+def test_instrument_disabled():
+    @instrument
+    def double(value):
+        return value * 2
+
+    assert not hooks_enabled()
+    assert double(2) == 4
+    assert double.__name__ == "double"
+
+
+def test_instrument_events():
+    events = []
+
+    @instrument(name="fail")
+    def fail():
+        raise KeyError("missing")
+
+    def hook(*event):
+        events.append(event)
+
+    add_hook(hook)
+    try:
+        with pytest.raises(KeyError):
+            fail()
+    finally:
+        remove_hook(hook)
+    assert not hooks_enabled()
+    (name, seconds, info), = events
+    assert name == "fail"
+    assert seconds >= 0
+    assert info == {"error": "KeyError"}
+    with pytest.raises(ValueError):
+        remove_hook(print)
+
+
+def test_registry_render():
+    registry = MetricsRegistry(buckets=(0.01, 0.1))
+    registry.inc("requests_total", method="book")
+    registry.inc("requests_total", 2, method="book")
+    registry.observe("latency_seconds", 0.05)
+    registry.observe("latency_seconds", 0.5)
+    assert registry.value("requests_total", method="book") == 3
+    assert registry.value("requests_total", method="release") == 0
+    assert registry.summary("latency_seconds") == (2, 0.55)
+    assert registry.render().splitlines() == [
+        "# TYPE requests_total counter",
+        'requests_total{method="book"} 3',
+        "# TYPE latency_seconds histogram",
+        'latency_seconds_bucket{le="0.01"} 0',
+        'latency_seconds_bucket{le="0.1"} 1',
+        'latency_seconds_bucket{le="+Inf"} 2',
+        "latency_seconds_sum 0.55",
+        "latency_seconds_count 2",
+    ]
+    registry.reset()
+    assert registry.render() == "\n"
+
+
+def test_scheduler_metrics(registry, stub_api, response_mock_data: dict):
+    data = response_mock_data["data"]
+    stub_api.routes["/"] = (200, data, {"ETag": '"v1"'})
+    scheduler = Scheduler(stub_api.url("/"))
+    scheduler.refresh()
+    scheduler.get_free_slots("2025-02-17")
+    scheduler.is_available("2025-02-17", "09:00", "10:00")
+    scheduler.find_slot_for_duration(60)
+    with pytest.raises(ValueError):
+        scheduler.get_free_slots("2025-02-30")
+
+    assert registry.value("scheduler_fetch_responses_total",
+                          status=200) == 1
+    assert registry.value("scheduler_fetch_responses_total",
+                          status=304) == 1
+    assert registry.value("scheduler_fetch_bytes_total") == \
+        len(json.dumps(data).encode())
+    assert registry.summary("scheduler_fetch_duration_seconds")[0] == 2
+    for method, calls in [("_fetch_schedule_data", 2),
+                          ("build_index", 1),
+                          ("get_free_slots", 2),
+                          ("is_available", 1),
+                          ("_find_gaps", 1),
+                          ("find_slot_for_duration", 1)]:
+        assert registry.value("scheduler_calls_total",
+                              method=method) == calls
+        count, total = registry.summary("scheduler_call_duration_seconds",
+                                        method=method)
+        assert count == calls and total >= 0
+    assert registry.value("scheduler_call_errors_total",
+                          method="get_free_slots",
+                          error="ValueError") == 1
+    assert 'scheduler_calls_total{method="is_available"} 1' in \
+        registry.render()
+
+
+def test_scheduler_metrics_stream(registry, stub_api,
+                                  response_mock_data: dict):
+    data = response_mock_data["data"]
+    stub_api.routes["/"] = (200, data)
+    Scheduler(stub_api.url("/"), stream=True)
+    assert registry.value("scheduler_fetch_bytes_total") == \
+        len(json.dumps(data).encode())
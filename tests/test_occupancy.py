@@ -0,0 +1,114 @@
+import random
+
+import numpy as np
+
+from occupancy import OccupancyMatrix
+
+import pytest
+
+from scheduler import Scheduler
+
+
+def test_matrix_day_free(random_index):
+    index = random_index(0)
+    matrix = OccupancyMatrix.from_index(index)
+    assert matrix.dates == index.dates
+    assert matrix.nbytes == len(index.dates) * 180
+    for date in index.dates:
+        assert matrix.day_free(date) == index.day_free(date)
+    assert matrix.day_free("2030-01-01") == ()
+
+
+def test_matrix_find_windows(random_index):
+    """Векторный поиск окон совпадает с перебором свободных интервалов"""
+    index = random_index(1)
+    matrix = OccupancyMatrix.from_index(index)
+    for duration, time_from, time_to, granularity in (
+            (30, 0, 1440, None), (90, 600, 960, None),
+            (45, 540, 1020, 15), (240, 0, 1440, 30), (600, 0, 1440, None)
+    ):
+        expected = []
+        for date in index.dates:
+            for start, end in index.day_free(date):
+                start = max(start, time_from)
+                if granularity:
+                    start = -(-start // granularity) * granularity
+                end = min(end, time_to)
+                if start + duration <= end:
+                    expected.append((date, start, end))
+                    break
+        assert matrix.find_windows(duration, time_from, time_to,
+                                   granularity) == expected
+    assert matrix.find_windows(30, limit=3) == \
+        matrix.find_windows(30)[:3]
+    assert matrix.find_windows(30, date_from="2025-02-10",
+                               date_to="2025-02-20") == [
+        window for window in matrix.find_windows(30)
+        if "2025-02-10" <= window[0] <= "2025-02-20"
+    ]
+    assert matrix.find_windows(0) == []
+    assert matrix.find_windows(120, 600, 660) == []
+
+
+def test_matrix_are_available(random_index):
+    index = random_index(2)
+    matrix = OccupancyMatrix.from_index(index)
+    rnd = random.Random(2)
+    queries = [(rnd.choice(index.dates), start, start + rnd.randrange(1, 120))
+               for start in (rnd.randrange(300, 1300) for _ in range(500))]
+    queries.append(("2030-01-01", 600, 660))
+    expected = [index.has_day(date) and any(
+        start >= free_start and end <= free_end
+        for free_start, free_end in index.day_free(date)
+    ) for date, start, end in queries]
+    dates, starts, ends = zip(*queries)
+    assert matrix.are_available(dates, starts, ends).tolist() == expected
+    assert [matrix.is_available(*query) for query in queries] == expected
+    assert matrix.are_available([], [], []).tolist() == []
+    assert isinstance(matrix.are_available(dates, starts, ends), np.ndarray)
+
+
+def test_find_free_windows(scheduler_mock: Scheduler):
+    assert scheduler_mock.find_free_windows(60) == [
+        ("2025-02-15", "12:00", "17:30"),
+        ("2025-02-16", "08:00", "09:30"),
+        ("2025-02-17", "09:00", "12:30"),
+        ("2025-02-18", "16:00", "17:00"),
+        ("2025-02-19", "09:00", "18:00")
+    ]
+    assert scheduler_mock.find_free_windows(
+        60, "13:00", "17:00", date_from="2025-02-16", limit=2
+    ) == [("2025-02-16", "13:00", "14:30"),
+          ("2025-02-18", "16:00", "17:00")]
+    assert scheduler_mock.find_free_windows(300, time_from="12:00") == [
+        ("2025-02-15", "12:00", "17:30"),
+        ("2025-02-19", "12:00", "18:00")
+    ]
+    assert scheduler_mock.find_free_windows(600) == []
+    earliest = scheduler_mock.find_slot_for_duration(60)
+    assert scheduler_mock.find_free_windows(60, limit=1)[0][:2] == \
+        earliest[:2]
+
+
+def test_occupancy_cached(scheduler_mock: Scheduler):
+    matrix = scheduler_mock.occupancy()
+    assert scheduler_mock.occupancy() is matrix
+    assert scheduler_mock.occupancy("2025-02-16") is not matrix
+    scheduler_mock.book("2025-02-19", "09:00", "12:00")
+    updated = scheduler_mock.occupancy()
+    assert updated is not matrix
+    assert updated.day_free("2025-02-19") == ((720, 1080),)
+
+
+def test_find_free_windows_validation(scheduler_mock: Scheduler,
+                                      scheduler_nodata: Scheduler):
+    with pytest.raises(Scheduler.SchedulerError):
+        scheduler_nodata.find_free_windows(60)
+    with pytest.raises(ValueError):
+        scheduler_mock.find_free_windows(60, "17:00", "10:00")
+    with pytest.raises(ValueError):
+        scheduler_mock.find_free_windows(60, granularity=0)
+    with pytest.raises(ValueError):
+        scheduler_mock.find_free_windows(60, limit=-1)
+    with pytest.raises(ValueError):
+        scheduler_mock.find_free_windows(60, date_from="2025-13-01")
@@ -0,0 +1,308 @@
+import random
+
+import numpy as np
+
+from schedule_index import (GapIndex,
+                            OverlayMap,
+                            ScheduleIndex,
+                            align_up,
+                            free_intervals,
+                            free_intervals_by_day,
+                            is_covered,
+                            merge_intervals,
+                            merge_intervals_by_day,
+                            minutes_to_time,
+                            time_to_minutes,
+                            times_to_minutes)
+
+from scheduler import Scheduler
+
+
+def test_time_conversion():
+    assert time_to_minutes("00:00") == 0
+    assert time_to_minutes("13:25") == 805
+    assert time_to_minutes("23:59") == 1439
+    assert minutes_to_time(0) == "00:00"
+    assert minutes_to_time(805) == "13:25"
+    assert minutes_to_time(1439) == "23:59"
+
+
+def test_free_intervals():
+    assert free_intervals([(540, 1260)],
+                          [(1050, 1200), (540, 720)]) == ((720, 1050),
+                                                          (1200, 1260))
+    assert free_intervals([(540, 1080)], []) == ((540, 1080),)
+    assert free_intervals([(600, 1080)],
+                          [(660, 840), (840, 960)]) == ((600, 660),
+                                                        (960, 1080))
+    assert free_intervals([(780, 1080), (540, 720)],
+                          [(600, 660)]) == ((540, 600), (660, 720),
+                                            (780, 1080))
+    assert free_intervals([(540, 1080)],
+                          [(600, 900), (660, 720), (420, 480)]) == (
+        (540, 600), (900, 1080)
+    )
+    assert free_intervals([(720, 1080), (540, 780)],
+                          [(600, 630)]) == ((540, 600), (630, 1080))
+    assert free_intervals([(540, 1080), (600, 700)], []) == ((540, 1080),)
+
+
+def test_merge_intervals():
+    assert merge_intervals([(690, 840), (840, 960), (600, 660)]) == (
+        ((600, 660), (690, 960)), ()
+    )
+    assert merge_intervals([(600, 900), (660, 720), (700, 960),
+                            (600, 600)]) == (
+        ((600, 960),), ((660, 900),)
+    )
+
+
+def test_merge_intervals_by_day():
+    """Векторное объединение совпадает с объединением по одному дню"""
+    rnd = random.Random(1)
+    slots = [(day, start, start + rnd.randrange(-10, 180))
+             for day in range(30)
+             for start in (rnd.randrange(0, 1300) for _ in range(15))]
+    rnd.shuffle(slots)
+    (day, start, end), (o_day, o_start, o_end) = merge_intervals_by_day(
+        *(np.array(column) for column in zip(*slots))
+    )
+    merged = list(zip(day.tolist(), start.tolist(), end.tolist()))
+    overlaps = list(zip(o_day.tolist(), o_start.tolist(), o_end.tolist()))
+    expected_merged = []
+    expected_overlaps = []
+    for pos in range(30):
+        day_merged, day_overlaps = merge_intervals(
+            (slot_start, slot_end) for slot_day, slot_start, slot_end
+            in slots if slot_day == pos
+        )
+        expected_merged += [(pos, *interval) for interval in day_merged]
+        expected_overlaps += [(pos, *interval) for interval in day_overlaps]
+    assert merged == expected_merged
+    assert overlaps == expected_overlaps
+    assert overlaps
+
+
+def test_times_to_minutes():
+    assert times_to_minutes(["00:00", "09:30", "23:59"]).tolist() == [
+        0, 570, 1439
+    ]
+    assert times_to_minutes([]).tolist() == []
+
+
+def test_free_intervals_by_day():
+    """Векторный расчёт совпадает с расчётом по одному дню"""
+    rnd = random.Random(0)
+    bounds = [(rnd.randrange(360, 600), rnd.randrange(1020, 1380))
+              for _ in range(50)]
+    slots = [(day, start, start + rnd.randrange(1, 120))
+             for day in range(50) for start in
+             rnd.sample(range(bounds[day][0], bounds[day][1]), 10)]
+    # Дни с несколькими, в том числе пересекающимися, рабочими интервалами
+    extra = [(day, start, start + rnd.randrange(30, 300))
+             for day in rnd.sample(range(50), 20)
+             for start in (rnd.randrange(300, 1100),)]
+    day_idx = np.array(list(range(50)) + [e[0] for e in extra])
+    gap_day, gap_start, gap_end = free_intervals_by_day(
+        day_idx, np.array([b[0] for b in bounds] + [e[1] for e in extra]),
+        np.array([b[1] for b in bounds] + [e[2] for e in extra]),
+        np.array([s[0] for s in slots]), np.array([s[1] for s in slots]),
+        np.array([s[2] for s in slots])
+    )
+    gaps = list(zip(gap_day.tolist(), gap_start.tolist(), gap_end.tolist()))
+    expected = [(day, start, end) for day in range(50)
+                for start, end in free_intervals(
+                    [bounds[day]] + [e[1:] for e in extra if e[0] == day],
+                    [s[1:] for s in slots if s[0] == day]
+                )]
+    assert gaps == expected
+
+
+def test_is_covered():
+    intervals = ((720, 1050), (1200, 1260))
+    assert is_covered(intervals, 720, 1050) is True
+    assert is_covered(intervals, 780, 900) is True
+    assert is_covered(intervals, 1200, 1260) is True
+    assert is_covered(intervals, 719, 1050) is False
+    assert is_covered(intervals, 720, 1051) is False
+    assert is_covered(intervals, 1000, 1230) is False
+    assert is_covered(intervals, 600, 700) is False
+    assert is_covered((), 600, 700) is False
+
+
+def test_align_up():
+    assert align_up(725, 15) == 735
+    assert align_up(720, 15) == 720
+    assert align_up(725, None) == 725
+
+
+def test_gap_index():
+    gaps = GapIndex([30, 0, 120, 60, 240])
+    assert gaps.first_fit(60, 0, 5) == 2
+    assert gaps.first_fit(60, 3, 5) == 3
+    assert gaps.first_fit(200, 0, 4) == -1
+    assert gaps.first_fit(1, 1, 2) == -1
+    gaps.update(1, 90)
+    assert gaps.first_fit(60, 0, 5) == 1
+    gaps.update(4, 0)
+    assert gaps.first_fit(200, 0, 5) == -1
+    assert GapIndex([]).first_fit(1, 0, 0) == -1
+
+
+def test_gap_index_versions():
+    """Версии дерева совпадают с перебором и не меняют прежние"""
+    rnd = random.Random(3)
+    expected = [rnd.randrange(0, 600) for _ in range(300)]
+    gaps = GapIndex(expected)
+    versions = []
+    for _ in range(400):
+        versions.append((gaps, list(expected)))
+        updates = [(rnd.randrange(300), rnd.randrange(0, 600))
+                   for _ in range(rnd.randrange(1, 4))]
+        for pos, max_gap in updates:
+            expected[pos] = max_gap
+        gaps = gaps.updated(updates)
+        assert gaps.leaves(300) == expected
+        assert gaps[7] == expected[7]
+    for old, max_gaps in versions[::20]:
+        assert old.leaves(300) == max_gaps
+        for length in (1, 300, 590):
+            lo, hi = sorted(rnd.sample(range(301), 2))
+            assert old.first_fit(length, lo, hi) == next(
+                (pos for pos in range(lo, hi) if max_gaps[pos] >= length),
+                -1
+            )
+    gaps.update(0, 599)
+    assert gaps.leaves(300) == [599] + expected[1:]
+    assert versions[-1][0].leaves(300) == versions[-1][1]
+
+
+def test_find_gaps_consistency():
+    """Поиск по индексу совпадает с полным перебором"""
+    rnd = random.Random(1)
+    days = []
+    timeslots = []
+    for day_id in range(1, 101):
+        days.append({"date": f"2025-{(day_id - 1) // 28 + 1:02d}-"
+                             f"{(day_id - 1) % 28 + 1:02d}",
+                     "end": "20:00", "id": day_id, "start": "08:00"})
+        cuts = sorted(rnd.sample(range(480, 1200), 8))
+        for start, end in zip(cuts[::2], cuts[1::2]):
+            timeslots.append({"day_id": day_id,
+                              "end": minutes_to_time(end),
+                              "id": len(timeslots) + 1,
+                              "start": minutes_to_time(start)})
+    index = ScheduleIndex.from_schedule_data({"days": days,
+                                              "timeslots": timeslots})
+    gaps = [(date, start, end) for date in index.dates
+            for start, end in index.free[date]]
+    for duration in (1, 30, 90, 180, 400):
+        fitting = [gap for gap in gaps if gap[1] + duration <= gap[2]]
+        assert index.find_gaps(duration, limit=5) == fitting[:5]
+        best = sorted(fitting, key=lambda gap: (gap[2] - gap[1],
+                                                index.date_pos[gap[0]],
+                                                gap[1]))
+        assert index.find_gaps(duration, "best", limit=5) == best[:5]
+        for _ in range(20):
+            lo, hi = sorted(rnd.sample(range(len(index.dates)), 2))
+            date_from, date_to = index.dates[lo], index.dates[hi]
+            assert index.find_gaps(duration, "best", date_from, date_to,
+                                   limit=len(gaps)) == \
+                [gap for gap in best if date_from <= gap[0] <= date_to]
+
+
+def test_index_from_schedule_data(response_mock_data: dict):
+    index = ScheduleIndex.from_schedule_data(response_mock_data["data"])
+    assert index.dates == ("2025-02-15", "2025-02-16", "2025-02-17",
+                           "2025-02-18", "2025-02-19")
+    assert index.bounds["2025-02-15"] == ((540, 1260),)
+    assert index.busy["2025-02-15"] == {1: (1050, 1200), 2: (540, 720)}
+    assert index.busy["2025-02-19"] == {}
+    assert index.free["2025-02-17"] == ((540, 750),)
+    assert len(index.timeslots) == 9
+    assert index.timeslots[5] == ("2025-02-17", 750, 1080)
+    assert index.busy["2025-02-17"][5][0] is index.timeslots[5][1]
+    assert index.free["2025-02-17"][0][1] is index.timeslots[5][1]
+
+
+def test_index_apply_delta(response_mock_data: dict):
+    old = ScheduleIndex.from_schedule_data(response_mock_data["data"])
+    free = dict(old.free)
+    index, changed = old.apply_delta(
+        [5], [{"day_id": 4, "end": "11:30", "id": 6, "start": "10:00"},
+              {"day_id": 5, "end": "10:00", "id": 10, "start": "09:00"}]
+    )
+    assert changed == {"2025-02-17", "2025-02-18", "2025-02-19"}
+    # Прежний индекс не меняется
+    assert old.free == free
+    assert 5 in old.timeslots and 10 not in old.timeslots
+    assert old.busy["2025-02-19"] == {}
+    assert old.find_gaps(500) == [("2025-02-19", 540, 1080)]
+    assert index.version == old.version + 1
+    assert 5 not in index.timeslots
+    assert index.free["2025-02-17"] == ((540, 1080),)
+    assert index.free["2025-02-18"] == ((960, 1020),)
+    assert index.free["2025-02-19"] == ((600, 1080),)
+    assert index.busy["2025-02-18"][6] == (600, 690)
+    assert index.busy["2025-02-18"][6][0] is index.busy["2025-02-19"][10][1]
+    assert index.free["2025-02-15"] is free["2025-02-15"]
+    assert list(index.timeslots)[-2:] == [6, 10]
+    assert index.find_gaps(500) == [("2025-02-17", 540, 1080)]
+    assert old.apply_delta([42], []) == (old, set())
+
+
+def test_overlay_map():
+    """Версии словаря совпадают со словарём, изменяемым на месте"""
+    rnd = random.Random(5)
+    expected = {slot_id: ("2025-02-15", slot_id, slot_id + 1)
+                for slot_id in range(100)}
+    timeslots = OverlayMap(dict(expected))
+    versions = []
+    for step in range(300):
+        removed = [slot_id for slot_id in rnd.sample(range(150), 3)
+                   if slot_id in expected]
+        added = [(slot_id, ("2025-02-16", step, step + 1))
+                 for slot_id in rnd.sample(range(150), 2)]
+        for slot_id in removed:
+            del expected[slot_id]
+        for slot_id, slot in added:
+            expected.pop(slot_id, None)
+            expected[slot_id] = slot
+        versions.append((timeslots, list(timeslots.items())))
+        timeslots = timeslots.updated(removed, added)
+        assert list(timeslots.items()) == list(expected.items())
+        assert len(timeslots) == len(expected)
+        assert all(timeslots.get(slot_id) == expected.get(slot_id)
+                   for slot_id in range(150))
+    assert all(list(old.items()) == items for old, items in versions)
+    base = OverlayMap({1: "a", 2: "b"})
+    updated = base.updated([1], [(3, "c")]).updated([1, 3, 4], [])
+    assert dict(updated) == {2: "b"} and len(updated) == 1
+    assert updated._changes == {1: None}
+
+
+def test_index_built_on_fetch(scheduler_mock: Scheduler):
+    index = scheduler_mock._index
+    assert index is not None
+    scheduler_mock.get_free_slots()
+    scheduler_mock.is_available("2025-02-15", "13:00", "17:00")
+    assert scheduler_mock._index is index
+
+
+def test_raw_response_not_retained(scheduler_mock: Scheduler,
+                                   response_mock_data: dict):
+    assert scheduler_mock._schedule_data is None
+    assert scheduler_mock.schedule_data == response_mock_data["data"]
+    assert scheduler_mock.schedule_data is scheduler_mock._schedule_data
+
+
+def test_index_invalidated(scheduler_mock: Scheduler,
+                           response_mock_data: dict):
+    data = response_mock_data["data"]
+    scheduler_mock.schedule_data = {"days": data["days"][:1],
+                                    "timeslots": data["timeslots"][:1]}
+    assert scheduler_mock._index is None
+    assert scheduler_mock.get_free_slots() == [
+        ('2025-02-15', '09:00', '17:30'),
+        ('2025-02-15', '20:00', '21:00')
+    ]
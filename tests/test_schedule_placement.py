@@ -0,0 +1,148 @@
+import random
+
+import pytest
+
+from schedule_index import ScheduleIndex
+
+from schedule_placement import GapAllocator
+
+from schedule_rules import DayRule, RecurringSchedule
+
+from scheduler import Scheduler
+
+
+def brute_force(index: ScheduleIndex, durations, strategy: str,
+                buffer: int = 0, max_per_day: int | None = None):
+    """Размещение перебором всех оставшихся интервалов"""
+    gaps = []
+    for date in index.dates:
+        starts = {start for start, _ in index.day_bounds(date)}
+        ends = {end for _, end in index.day_bounds(date)}
+        for start, end in index.day_free(date):
+            gaps.append([date, start if start in starts else start + buffer,
+                         end if end in ends else end - buffer])
+    placed = {}
+    result = []
+    for duration in durations:
+        fitting = [gap for gap in gaps
+                   if gap[2] - gap[1] >= duration and
+                   (max_per_day is None or
+                    placed.get(gap[0], 0) < max_per_day)]
+        if not fitting:
+            result.append(None)
+            continue
+        if strategy == "best":
+            gap = min(fitting, key=lambda gap: (gap[2] - gap[1], gap[0],
+                                                gap[1]))
+        else:
+            gap = fitting[0]
+        result.append((gap[0], gap[1], gap[1] + duration))
+        gap[1] += duration + buffer
+        placed[gap[0]] = placed.get(gap[0], 0) + 1
+    return result
+
+
+@pytest.mark.parametrize("strategy", ["earliest", "best"])
+@pytest.mark.parametrize("buffer, max_per_day", [(0, None), (10, 2),
+                                                 (15, 1)])
+def test_allocator_matches_brute_force(random_index, strategy: str,
+                                       buffer: int, max_per_day: int | None):
+    index = random_index(7, days_count=60)
+    rnd = random.Random(3)
+    durations = [rnd.randrange(5, 300, 5) for _ in range(300)]
+    allocator = GapAllocator.from_index(index, strategy=strategy,
+                                        buffer=buffer,
+                                        max_per_day=max_per_day)
+    placements = allocator.place_many(durations)
+    assert placements == brute_force(index, durations, strategy, buffer,
+                                     max_per_day)
+    by_date = {}
+    for placement in placements:
+        if placement is not None:
+            by_date.setdefault(placement[0], []).append(placement[1:])
+    for date, meetings in by_date.items():
+        meetings.sort()
+        for (_, end), (start, _) in zip(meetings, meetings[1:]):
+            assert start - end >= buffer
+        assert all(any(free_start <= start and end <= free_end
+                       for free_start, free_end in index.day_free(date))
+                   for start, end in meetings)
+        if max_per_day is not None:
+            assert len(meetings) <= max_per_day
+
+
+def test_place_many(scheduler_mock: Scheduler):
+    assert scheduler_mock.place_many([60, 30, 90, 600]) == (
+        [(0, "2025-02-15", "12:00", "13:00"),
+         (1, "2025-02-15", "13:00", "13:30"),
+         (2, "2025-02-15", "13:30", "15:00")], [3]
+    )
+    assert scheduler_mock.place_many([60, 30, 90], strategy="best") == (
+        [(0, "2025-02-15", "20:00", "21:00"),
+         (1, "2025-02-18", "11:00", "11:30"),
+         (2, "2025-02-16", "08:00", "09:30")], []
+    )
+    assert scheduler_mock.place_many([60] * 5, buffer=15, max_per_day=1,
+                                     date_to="2025-02-18") == (
+        [(0, "2025-02-15", "12:15", "13:15"),
+         (1, "2025-02-16", "08:00", "09:00"),
+         (2, "2025-02-17", "09:00", "10:00")], [3, 4]
+    )
+    assert scheduler_mock.place_many([]) == ([], [])
+    assert scheduler_mock.get_free_slots("2025-02-15") == \
+        [("12:00", "17:30"), ("20:00", "21:00")]
+
+
+def test_place_many_book(scheduler_mock: Scheduler):
+    placed, unplaced = scheduler_mock.place_many([60, 60], book=True)
+    assert unplaced == []
+    assert scheduler_mock.get_free_slots("2025-02-15") == \
+        [("14:00", "17:30"), ("20:00", "21:00")]
+    assert scheduler_mock.get_busy_slots("2025-02-15")[-2:] == \
+        [["12:00", "13:00"], ["13:00", "14:00"]]
+    scheduler_mock.rules = RecurringSchedule(
+        [DayRule([("09:00", "10:00")])],
+        date_from="2025-03-03", date_to="2025-03-03"
+    )
+    assert scheduler_mock.place_many([30], date_from="2025-03-01",
+                                     book=True) == \
+        ([(0, "2025-03-03", "09:00", "09:30")], [])
+    assert scheduler_mock.get_free_slots("2025-03-03") == \
+        [("09:30", "10:00")]
+
+
+def test_place_many_validation(scheduler_mock: Scheduler,
+                               scheduler_nodata: Scheduler):
+    with pytest.raises(Scheduler.SchedulerError):
+        scheduler_nodata.place_many([60])
+    with pytest.raises(Scheduler.SchedulerError):
+        scheduler_mock.place_many([60, None])
+    with pytest.raises(ValueError):
+        scheduler_mock.place_many([60, 0])
+    with pytest.raises(ValueError):
+        scheduler_mock.place_many("60")
+    with pytest.raises(ValueError):
+        scheduler_mock.place_many([60], strategy="worst")
+    with pytest.raises(ValueError):
+        scheduler_mock.place_many([60], buffer=-5)
+    with pytest.raises(ValueError):
+        scheduler_mock.place_many([60], max_per_day=0)
+    with pytest.raises(ValueError):
+        scheduler_mock.place_many([60], date_from="2025-13-01")
+
+
+def test_allocator_validation(scheduler_mock: Scheduler):
+    index = scheduler_mock._get_index()
+    with pytest.raises(ValueError):
+        GapAllocator.from_index(index, strategy="worst")
+    with pytest.raises(ValueError):
+        GapAllocator.from_index(index, buffer=-5)
+    with pytest.raises(ValueError):
+        GapAllocator.from_index(index, max_per_day=0)
+    allocator = GapAllocator.from_index(index)
+    free = allocator.free
+    for duration in (0, -5, 1.5, "60"):
+        with pytest.raises(ValueError):
+            allocator.place(duration)
+    assert allocator.free == free
+    assert allocator.place(60) == ("2025-02-15", 720, 780)
@@ -0,0 +1,193 @@
+import random
+from datetime import date as Date, timedelta
+
+import pytest
+
+from schedule_rules import DayRule, RecurringSchedule
+
+from scheduler import Scheduler
+
+
+@pytest.fixture()
+def rules():
+    return RecurringSchedule(
+        [DayRule([("09:00", "16:00")], weekdays=[4]),
+         DayRule([("09:00", "13:00"), ("14:00", "18:00")])],
+        date_from="2025-02-01", date_to="2027-12-31",
+        holidays=["2025-02-24"]
+    )
+
+
+def test_rule_for(rules: RecurringSchedule):
+    assert rules.rule_for("2025-02-20").bounds == ((540, 780), (840, 1080))
+    assert rules.rule_for("2025-02-21").free == ((540, 960),)
+    assert rules.rule_for("2025-02-22") is None
+    assert rules.rule_for("2025-02-24") is None
+    assert rules.rule_for("2028-01-03") is None
+    assert rules.rule_for("2025-02-30") is None
+    assert [date for date, _ in rules.iter_days("2025-02-20",
+                                                "2025-02-26")] == [
+        "2025-02-20", "2025-02-21", "2025-02-25", "2025-02-26"
+    ]
+
+
+def test_rule_validation():
+    with pytest.raises(ValueError):
+        DayRule([])
+    with pytest.raises(ValueError):
+        DayRule([("18:00", "09:00")])
+    with pytest.raises(ValueError):
+        DayRule([("9:00", "18:00")])
+    with pytest.raises(ValueError):
+        DayRule([("09:00", "18:00")], weekdays=[7])
+    with pytest.raises(ValueError):
+        RecurringSchedule([], "2025-02-02", "2025-02-01")
+    with pytest.raises(ValueError):
+        RecurringSchedule([("09:00", "18:00")], "2025-02-01", "2025-02-02")
+
+
+def test_rules_only(rules: RecurringSchedule):
+    scheduler = Scheduler(auto_fetch=False, rules=rules)
+    assert scheduler.get_free_slots("2025-02-20") == [("09:00", "13:00"),
+                                                      ("14:00", "18:00")]
+    assert scheduler.get_busy_slots("2025-02-20") == []
+    assert scheduler.is_available("2025-02-21", "15:00", "16:00") is True
+    assert scheduler.is_available("2025-02-22", "10:00", "11:00") is False
+    assert scheduler.find_slot_for_duration(300) == ("2025-02-07",
+                                                     "09:00", "16:00")
+    assert scheduler.find_slot_for_duration(
+        240, strategy="best", date_from="2025-03-01"
+    ) == ("2025-03-03", "09:00", "13:00")
+    assert scheduler.find_slot_for_duration(600) is None
+    assert scheduler.schedule_data == {"days": [], "timeslots": []}
+
+
+def test_explicit_days_override_rules(scheduler_mock: Scheduler,
+                                      rules: RecurringSchedule):
+    scheduler_mock.rules = rules
+    assert scheduler_mock.get_free_slots("2025-02-17") == [("09:00",
+                                                            "12:30")]
+    assert scheduler_mock.get_free_slots(date_from="2025-02-19",
+                                         date_to="2025-02-21") == [
+        ("2025-02-19", "09:00", "18:00"),
+        ("2025-02-20", "09:00", "13:00"),
+        ("2025-02-20", "14:00", "18:00"),
+        ("2025-02-21", "09:00", "16:00")
+    ]
+    assert [date for date, _ in scheduler_mock.iter_free_slots(
+        "2025-02-14", "2025-02-25"
+    )] == ["2025-02-14", "2025-02-15", "2025-02-16", "2025-02-17",
+           "2025-02-18", "2025-02-19", "2025-02-20", "2025-02-21",
+           "2025-02-25"]
+    assert scheduler_mock.find_slots_for_duration(
+        420, limit=3, date_from="2025-02-17"
+    ) == [("2025-02-19", "09:00", "18:00"),
+          ("2025-02-21", "09:00", "16:00"),
+          ("2025-02-28", "09:00", "16:00")]
+    scheduler_mock.rules = None
+    assert scheduler_mock.get_free_slots("2025-02-20") == []
+
+
+def test_book_rule_day(scheduler_mock: Scheduler, rules: RecurringSchedule):
+    scheduler_mock.rules = rules
+    index = scheduler_mock._index
+    free_15 = index.free["2025-02-15"]
+    assert scheduler_mock.book("2025-02-20", "09:00", "10:00") == 10
+    assert "2025-02-20" not in index.bounds
+    assert "2025-02-20" not in index.day_ids
+    assert index.day_free("2025-02-20") == ((540, 780), (840, 1080))
+    assert scheduler_mock.get_free_slots("2025-02-20") == [
+        ("10:00", "13:00"), ("14:00", "18:00")
+    ]
+    assert scheduler_mock.get_busy_slots("2025-02-20") == [["09:00",
+                                                            "10:00"]]
+    assert scheduler_mock._index.free["2025-02-15"] is free_15
+    schedule_data = scheduler_mock.schedule_data
+    assert schedule_data["days"][-2:] == [
+        {"date": "2025-02-20", "end": "13:00", "id": 6, "start": "09:00"},
+        {"date": "2025-02-20", "end": "18:00", "id": 7, "start": "14:00"}
+    ]
+    assert schedule_data["timeslots"][-1] == {
+        "day_id": 6, "end": "10:00", "id": 10, "start": "09:00"
+    }
+    assert scheduler_mock.release("2025-02-20", "09:00", "10:00") == 10
+    assert scheduler_mock.get_free_slots("2025-02-20") == [
+        ("09:00", "13:00"), ("14:00", "18:00")
+    ]
+    with pytest.raises(Scheduler.SchedulerError):
+        scheduler_mock.book("2025-02-22", "09:00", "10:00")
+
+
+def test_book_overlapping_rule_hours():
+    """Пересекающиеся рабочие часы правила объединяются после book"""
+    scheduler = Scheduler(auto_fetch=False, rules=RecurringSchedule(
+        [DayRule([("09:00", "13:00"), ("12:00", "18:00")])],
+        date_from="2025-03-01", date_to="2025-03-31"
+    ))
+    assert scheduler.is_available("2025-03-03", "10:00", "17:00")
+    slot_id = scheduler.book("2025-03-03", "09:00", "09:30")
+    assert scheduler.is_available("2025-03-03", "10:00", "17:00")
+    assert scheduler.get_free_slots("2025-03-03") == [("09:30", "18:00")]
+    assert scheduler.find_slot_for_duration(500) == \
+        ("2025-03-03", "09:30", "18:00")
+    assert scheduler.release("2025-03-03", "09:00", "09:30") == slot_id
+    assert scheduler.get_free_slots("2025-03-03") == [("09:00", "18:00")]
+    scheduler.schedule_data = scheduler.schedule_data
+    assert scheduler.get_free_slots("2025-03-03") == [("09:00", "18:00")]
+
+
+def test_rules_consistency():
+    """Запросы по правилам совпадают с запросами по развёрнутым дням"""
+    rnd = random.Random(0)
+    rules = RecurringSchedule(
+        [DayRule([("10:00", "15:00")], weekdays=[2],
+                 date_from="2025-03-01", date_to="2025-03-31"),
+         DayRule([("09:00", "12:00"), ("13:00", "18:00")]),
+         DayRule([("11:00", "14:00")], weekdays=[5])],
+        date_from="2025-01-01", date_to="2025-06-30",
+        holidays=["2025-01-01", "2025-05-01", "2025-05-09"]
+    )
+    days = []
+    timeslots = []
+    first = Date(2025, 1, 1)
+    for offset in rnd.sample(range(181), 40):
+        date = (first + timedelta(offset)).isoformat()
+        days.append({"date": date, "end": "20:00", "id": len(days) + 1,
+                     "start": "08:00"})
+        for start in rnd.sample(range(8, 19), 3):
+            timeslots.append({"day_id": len(days), "end": f"{start:02d}:45",
+                              "id": len(timeslots) + 1,
+                              "start": f"{start:02d}:00"})
+    explicit_dates = {day["date"] for day in days}
+    expanded = {"days": list(days), "timeslots": timeslots}
+    for date, rule in rules.iter_days():
+        if date in explicit_dates:
+            continue
+        for start, end in rule.hours:
+            expanded["days"].append({"date": date, "end": end,
+                                     "id": len(expanded["days"]) + 1,
+                                     "start": start})
+
+    lazy = Scheduler(auto_fetch=False, rules=rules)
+    lazy.schedule_data = {"days": days, "timeslots": timeslots}
+    full = Scheduler(auto_fetch=False)
+    full.schedule_data = expanded
+
+    assert lazy.get_free_slots() == full.get_free_slots()
+    assert lazy.get_busy_slots(date_from="2025-02-01") == \
+        full.get_busy_slots(date_from="2025-02-01")
+    for duration in (30, 100, 180, 240, 300, 500):
+        for strategy in ("earliest", "best"):
+            for date_from, date_to in ((None, None),
+                                       ("2025-03-10", "2025-04-20")):
+                assert lazy.find_slots_for_duration(
+                    duration, 20, strategy, date_from, date_to, 15
+                ) == full.find_slots_for_duration(
+                    duration, 20, strategy, date_from, date_to, 15
+                )
+    for _ in range(200):
+        date = (first + timedelta(rnd.randrange(181))).isoformat()
+        start = rnd.randrange(8 * 60, 19 * 60, 15)
+        query = (date, f"{start // 60:02d}:{start % 60:02d}",
+                 f"{(start + 60) // 60:02d}:{start % 60:02d}")
+        assert lazy.is_available(*query) == full.is_available(*query)
@@ -0,0 +1,140 @@
+import json
+from pathlib import Path
+
+import pytest
+
+from schedule_index import ScheduleArrays
+
+from schedule_sources import (HTTPSource,
+                              JSONFileSource,
+                              PushdownSource,
+                              SQLiteSource,
+                              ScheduleSource)
+
+from scheduler import Scheduler
+
+from scheduler_cli import main
+
+FIXTURE = Path(__file__).parent / "fixtures" / "api_response.json"
+
+
+@pytest.fixture
+def sqlite_source(tmp_path, response_mock_data: dict) -> SQLiteSource:
+    return SQLiteSource.create(tmp_path / "schedule.db",
+                               response_mock_data["data"])
+
+
+def test_sqlite_pushdown(sqlite_source: SQLiteSource,
+                         scheduler_mock: Scheduler):
+    scheduler = Scheduler(source=sqlite_source)
+    assert scheduler.schedule_data is None
+    for date in scheduler_mock._get_index().dates:
+        assert scheduler.get_free_slots(date) == \
+            scheduler_mock.get_free_slots(date)
+        assert scheduler.get_busy_slots(date) == \
+            scheduler_mock.get_busy_slots(date)
+    assert scheduler.get_free_slots(date_from="2025-02-16",
+                                    date_to="2025-02-17") == \
+        scheduler_mock.get_free_slots(date_from="2025-02-16",
+                                      date_to="2025-02-17")
+    assert scheduler.get_busy_slots(dates=["2025-02-18", "2025-02-15"]) == \
+        scheduler_mock.get_busy_slots(dates=["2025-02-18", "2025-02-15"])
+    assert scheduler.get_free_slots("2025-03-01") == []
+    # Запросы по датам не загружают расписание целиком
+    assert scheduler._index is None
+    assert scheduler.get_free_slots() == scheduler_mock.get_free_slots()
+    assert scheduler._index is not None
+    assert scheduler.find_slot_for_duration(60) == \
+        scheduler_mock.find_slot_for_duration(60)
+
+
+def test_sqlite_load(sqlite_source: SQLiteSource, response_mock_data: dict):
+    arrays = sqlite_source.load()
+    assert arrays.dates == sorted({day["date"] for day
+                                   in response_mock_data["data"]["days"]})
+    assert arrays.slot_id.tolist() == \
+        [slot["id"] for slot in response_mock_data["data"]["timeslots"]]
+    assert len(sqlite_source.load_dates(dates=[]).dates) == 0
+    assert sqlite_source.load_dates("2025-02-16", "2025-02-17").dates == \
+        ["2025-02-16", "2025-02-17"]
+    SQLiteSource.create(sqlite_source.path, {"days": [], "timeslots": []})
+    assert sqlite_source.load().dates == []
+
+
+def test_sqlite_refresh(tmp_path, sqlite_source: SQLiteSource,
+                        response_mock_data: dict):
+    scheduler = Scheduler(source=sqlite_source)
+    assert scheduler.get_free_slots("2025-02-15") == \
+        [("12:00", "17:30"), ("20:00", "21:00")]
+    data = response_mock_data["data"]
+    SQLiteSource.create(sqlite_source.path, {
+        "days": data["days"],
+        "timeslots": [slot for slot in data["timeslots"]
+                      if slot["day_id"] != 1]
+    })
+    assert scheduler.refresh()
+    assert scheduler.get_free_slots("2025-02-15") == [("09:00", "21:00")]
+    with pytest.raises(FileNotFoundError):
+        SQLiteSource(tmp_path / "missing.db")
+
+
+def test_json_file_source(tmp_path, scheduler_mock: Scheduler):
+    scheduler = Scheduler(source=JSONFileSource(FIXTURE))
+    assert scheduler.schedule_data is not None
+    assert scheduler.get_free_slots() == scheduler_mock.get_free_slots()
+    file = tmp_path / "schedule.json"
+    file.write_text("[]")
+    with pytest.raises(ValueError):
+        Scheduler(source=JSONFileSource(file))
+
+
+def test_http_source(response_mock, response_mock_data: dict):
+    url = "https://example.com/api/schedule"
+    scheduler = Scheduler(auto_fetch=False, source=HTTPSource(url, timeout=3))
+    assert (scheduler.api_url, scheduler.timeout, scheduler.source) == \
+        (url, 3, None)
+    with response_mock(f'GET {url} -> 200 :{response_mock_data["json"]}'):
+        assert HTTPSource(url).load() == response_mock_data["data"]
+
+
+def test_source_interface(response_mock_data: dict):
+    with pytest.raises(TypeError):
+        ScheduleSource()
+    with pytest.raises(TypeError):
+        PushdownSource()
+    assert not hasattr(HTTPSource("https://example.com/"), "load_dates")
+    assert not hasattr(JSONFileSource(FIXTURE), "load_dates")
+
+    class MemorySource(PushdownSource):
+        key = "memory://"
+
+        def __init__(self):
+            self.requests = []
+
+        def load(self) -> ScheduleArrays:
+            self.requests.append(None)
+            return ScheduleArrays.from_schedule_data(
+                response_mock_data["data"]
+            )
+
+        def load_dates(self, date_from=None, date_to=None, dates=None):
+            self.requests.append(dates)
+            return self.load()
+
+    source = MemorySource()
+    scheduler = Scheduler(source=source)
+    assert scheduler.get_free_slots("2025-02-17") == [("09:00", "12:30")]
+    assert source.requests == [["2025-02-17"], None]
+    assert scheduler._index is None
+
+
+def test_cli_import_db(tmp_path, capsys):
+    database = tmp_path / "schedule.db"
+    assert main(["import-db", str(database), "--file", str(FIXTURE),
+                 "--no-cache"]) == 0
+    assert main(["free", "2025-02-17", "--db", str(database)]) == 0
+    assert capsys.readouterr().out == "09:00 12:30\n"
+    assert main(["busy", "2025-02-17", "--json", "--db",
+                 str(database)]) == 0
+    assert json.loads(capsys.readouterr().out) == [["12:30", "18:00"]]
+    assert main(["free", "--db", str(tmp_path / "missing.db")]) == 2
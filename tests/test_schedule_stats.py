@@ -0,0 +1,90 @@
+import json
+
+import numpy as np
+
+import pytest
+
+from schedule_rules import DayRule, RecurringSchedule
+
+from schedule_stats import GAP_BINS, ScheduleStats
+
+from scheduler import Scheduler
+
+
+def test_stats_match_per_day(random_index):
+    """Векторные показатели совпадают с подсчётом по минутам дней"""
+    index = random_index(0, max_slots=8, slot_starts=range(360, 1260, 5),
+                         slot_lengths=range(5, 180, 5))
+    stats = ScheduleStats.from_index(index)
+    assert stats.dates == index.dates
+    hours = np.zeros(24, dtype=np.int64)
+    gaps = []
+    for pos, date in enumerate(index.dates):
+        minutes = np.zeros(1440, dtype=bool)
+        for start, end in index.day_bounds(date):
+            minutes[start:end] = True
+        working = int(minutes.sum())
+        for start, end in index.day_free(date):
+            minutes[start:end] = False
+            gaps.append(end - start)
+        assert stats.working[pos] == working
+        assert stats.busy[pos] == minutes.sum()
+        assert stats.occupancy[pos] == pytest.approx(minutes.sum() / working)
+        hours += minutes.reshape(24, 60).sum(axis=1)
+    assert stats.hour_busy.tolist() == hours.tolist()
+    assert stats.gap_lengths.tolist() == gaps
+    assert stats.gap_histogram().tolist() == \
+        np.histogram(gaps, bins=GAP_BINS)[0].tolist()
+    assert stats.fragments(30).sum() == sum(gap < 30 for gap in gaps)
+    date, start, end = stats.longest_gap()
+    assert end - start == max(gaps)
+    assert (start, end) in index.day_free(date)
+
+
+def test_scheduler_stats(scheduler_mock: Scheduler):
+    stats = scheduler_mock.stats()
+    assert stats.working.tolist() == [720, 840, 540, 480, 540]
+    assert stats.busy.tolist() == [330, 300, 330, 390, 0]
+    assert stats.occupancy[3] == pytest.approx(390 / 480)
+    assert stats.total_occupancy == pytest.approx(1350 / 3120)
+    assert stats.hour_busy[9:20].tolist() == [90, 180, 90, 90, 120, 150,
+                                              180, 120, 210, 60, 60]
+    assert stats.longest_gap() == ("2025-02-19", 540, 1080)
+    assert stats.gap_histogram((0, 60, 1440)).tolist() == [1, 8]
+    assert scheduler_mock.stats("2025-02-16", "2025-02-17").dates == \
+        ("2025-02-16", "2025-02-17")
+    report = json.loads(json.dumps(stats.to_dict(min_gap=31)))
+    assert report["days"][3] == {"date": "2025-02-18", "working": 480,
+                                 "busy": 390, "occupancy": 0.8125,
+                                 "fragments": 1}
+    assert report["longest_gap"] == ["2025-02-19", "09:00", "18:00"]
+    assert report["fragments"] == 1
+    assert report["gaps"]["counts"] == [0, 0, 1, 3, 2, 3]
+    scheduler_mock.book("2025-02-19", "09:00", "12:00")
+    assert scheduler_mock.stats(date_from="2025-02-19").busy.tolist() == \
+        [180]
+
+
+def test_stats_rules_and_empty():
+    rules = RecurringSchedule([DayRule([("09:00", "13:00"),
+                                        ("12:00", "18:00")])],
+                              date_from="2025-03-03", date_to="2025-03-04")
+    stats = Scheduler(auto_fetch=False, rules=rules).stats()
+    assert stats.dates == ("2025-03-03", "2025-03-04")
+    assert stats.working.tolist() == [540, 540]
+    assert stats.busy.tolist() == [0, 0]
+    assert stats.hour_working[9:18].tolist() == [120] * 9
+    empty = ScheduleStats.from_intervals([], [], [])
+    assert empty.longest_gap() is None
+    assert empty.total_occupancy == 0.0
+    assert empty.to_dict()["days"] == []
+
+
+def test_stats_validation(scheduler_mock: Scheduler,
+                          scheduler_nodata: Scheduler):
+    with pytest.raises(Scheduler.SchedulerError):
+        scheduler_nodata.stats()
+    with pytest.raises(ValueError):
+        scheduler_mock.stats(date_from="2025-13-01")
+    with pytest.raises(ValueError):
+        scheduler_mock.stats(date_to=20250101)
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from schedule_index import ScheduleArrays, ScheduleIndex
+
+from schedule_stream import parse_schedule_stream
+
+from scheduler import Scheduler
+
+
+def chunked(payload: bytes, size: int) -> list:
+    return [payload[pos:pos + size] for pos in range(0, len(payload), size)]
+
+
+def assert_arrays_equal(left: ScheduleArrays, right: ScheduleArrays):
+    assert left.dates == right.dates
+    for name in ScheduleArrays.__slots__[1:]:
+        assert getattr(left, name).tolist() == getattr(right, name).tolist()
+
+
+@pytest.mark.parametrize("size", [1, 7, 65536])
+def test_parse_schedule_stream(response_mock_data: dict, size: int):
+    payload = json.dumps(response_mock_data["data"], indent=2).encode()
+    arrays, rest = parse_schedule_stream(chunked(payload, size))
+    assert rest == {}
+    assert_arrays_equal(
+        arrays, ScheduleArrays.from_schedule_data(response_mock_data["data"])
+    )
+
+
+def test_parse_schedule_stream_rest():
+    payload = ('{"note": "расписание", "removed": [12345], '
+               '"added": []}').encode()
+    arrays, rest = parse_schedule_stream(chunked(payload, 1))
+    assert arrays is None
+    assert rest == {"note": "расписание", "removed": [12345], "added": []}
+    assert parse_schedule_stream([b"{}"]) == (None, {})
+
+
+@pytest.mark.parametrize("payload", [b"", b"[]", b'{"days": [{}]}',
+                                     b'{"days": []', b'{"days": []} {}'])
+def test_parse_schedule_stream_invalid(payload: bytes):
+    with pytest.raises((ValueError, KeyError)):
+        parse_schedule_stream(chunked(payload, 3))
+
+
+def test_index_to_arrays(response_mock_data: dict):
+    index = ScheduleIndex.from_schedule_data(response_mock_data["data"])
+    assert index.to_arrays().to_schedule_data() == response_mock_data["data"]
+
+
+def test_scheduler_stream(stub_api, response_mock_data: dict):
+    stub_api.routes["/"] = (200, response_mock_data["data"], {"ETag": '"v1"'})
+    scheduler = Scheduler(stub_api.url("/"), stream=True)
+    assert scheduler._schedule_data is None
+    assert scheduler.get_free_slots("2025-02-17") == [('09:00', '12:30')]
+    timeslot_id = scheduler.book("2025-02-17", "10:00", "11:00")
+    assert scheduler._schedule_data is None
+    assert scheduler.schedule_data["timeslots"][-1] == {
+        "day_id": 3, "end": "11:00", "id": timeslot_id, "start": "10:00"
+    }
+    scheduler.release("2025-02-17", "10:00", "11:00")
+    assert scheduler.schedule_data == response_mock_data["data"]
+    assert scheduler.refresh() is False
+
+
+def test_scheduler_stream_delta(stub_api, response_mock_data: dict):
+    stub_api.routes["/"] = (200, response_mock_data["data"])
+    scheduler = Scheduler(stub_api.url("/"), stream=True)
+    stub_api.routes["/"] = (200, {"removed": [5]})
+    assert scheduler.refresh() is True
+    assert scheduler.get_free_slots("2025-02-17") == [('09:00', '18:00')]
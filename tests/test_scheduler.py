@@ -1,6 +1,11 @@
+import subprocess
+import sys
+from datetime import date
+from pathlib import Path
+
 import pandas as pd
 
-from scheduler import Scheduler
+from scheduler import Scheduler, parse_date, parse_time
 
 
 def test_mock_data(scheduler_mock: Scheduler,
@@ -99,6 +104,104 @@ def test_get_free_slots(scheduler_mock: Scheduler):
     assert scheduler_mock.get_free_slots("2025-02-19") == [('09:00', '18:00')]
 
 
+def test_get_slots_date_range(scheduler_mock: Scheduler):
+    """Тест на получение таймслотов за диапазон и по списку дат"""
+    assert scheduler_mock.get_free_slots(date_from="2025-02-17") == [
+        ('2025-02-17', '09:00', '12:30'),
+        ('2025-02-18', '11:00', '11:30'),
+        ('2025-02-18', '16:00', '17:00'),
+        ('2025-02-19', '09:00', '18:00')
+    ]
+    assert scheduler_mock.get_free_slots(date_from="2025-02-16",
+                                         date_to="2025-02-16") == [
+        ('2025-02-16', '08:00', '09:30'),
+        ('2025-02-16', '11:00', '14:30'),
+        ('2025-02-16', '18:00', '22:00')
+    ]
+    assert scheduler_mock.get_free_slots(date_from="2025-02-18",
+                                         date_to="2025-02-16") == []
+    assert scheduler_mock.get_free_slots(
+        dates=["2025-02-19", "2025-03-01", "2025-02-17", "2025-02-19"]
+    ) == [
+        ('2025-02-19', '09:00', '18:00'),
+        ('2025-02-17', '09:00', '12:30')
+    ]
+    assert scheduler_mock.get_busy_slots(date_to="2025-02-15") == [
+        ['2025-02-15', '17:30', '20:00'],
+        ['2025-02-15', '09:00', '12:00']
+    ]
+    assert scheduler_mock.get_busy_slots(
+        dates=["2025-02-17", "2025-02-16"]
+    ) == [
+        ['2025-02-17', '12:30', '18:00'],
+        ['2025-02-16', '14:30', '18:00'],
+        ['2025-02-16', '09:30', '11:00']
+    ]
+
+
+def test_overlapping_timeslots(scheduler_mock: Scheduler):
+    """Пересекающиеся таймслоты объединяются и отмечаются"""
+    assert scheduler_mock.get_busy_slots("2025-02-18", merged=True) == [
+        ["10:00", "11:00"], ["11:30", "16:00"], ["17:00", "18:00"]
+    ]
+    assert scheduler_mock.get_overlaps() == []
+    scheduler_mock.refresh({"added": [
+        {"day_id": 3, "end": "14:00", "id": 10, "start": "13:00"},
+        {"day_id": 3, "end": "08:00", "id": 11, "start": "07:00"},
+        {"day_id": 5, "end": "15:00", "id": 12, "start": "10:00"},
+        {"day_id": 5, "end": "12:00", "id": 13, "start": "11:00"}
+    ]})
+    assert scheduler_mock.get_free_slots("2025-02-17") == [("09:00",
+                                                            "12:30")]
+    assert scheduler_mock.get_free_slots("2025-02-19") == [
+        ("09:00", "10:00"), ("15:00", "18:00")
+    ]
+    assert scheduler_mock.get_busy_slots(merged=True,
+                                         date_from="2025-02-19") == [
+        ["2025-02-19", "10:00", "15:00"]
+    ]
+    assert scheduler_mock.get_overlaps() == [
+        ("2025-02-17", "13:00", "14:00"), ("2025-02-19", "11:00", "12:00")
+    ]
+    assert scheduler_mock.get_overlaps(date_to="2025-02-18") == [
+        ("2025-02-17", "13:00", "14:00")
+    ]
+    scheduler_mock.schedule_data = scheduler_mock.schedule_data
+    assert scheduler_mock.get_overlaps(date_from="2025-02-19") == [
+        ("2025-02-19", "11:00", "12:00")
+    ]
+    assert scheduler_mock.is_available("2025-02-19", "11:30",
+                                       "12:30") is False
+    scheduler_mock.refresh({"removed": [12]})
+    assert scheduler_mock.get_overlaps(date_from="2025-02-19") == []
+
+
+def test_iter_slots(scheduler_mock: Scheduler):
+    """Тест на ленивое получение таймслотов по дням"""
+    free = scheduler_mock.iter_free_slots(date_from="2025-02-18")
+    assert next(free) == ('2025-02-18', [('11:00', '11:30'),
+                                         ('16:00', '17:00')])
+    assert list(free) == [('2025-02-19', [('09:00', '18:00')])]
+    assert list(scheduler_mock.iter_busy_slots(
+        dates=["2025-03-01", "2025-02-17", "2025-02-19"]
+    )) == [('2025-02-17', [('12:30', '18:00')]), ('2025-02-19', [])]
+    assert [
+        (date, start, end)
+        for date, slots in scheduler_mock.iter_free_slots()
+        for start, end in slots
+    ] == scheduler_mock.get_free_slots()
+
+
+def test_parse_date_time():
+    """Тест на разбор даты и времени с кэшированием результатов"""
+    assert parse_date("2025-02-17") == date(2025, 2, 17).toordinal()
+    assert parse_time("00:00") == 0
+    assert parse_time("13:25") == 805
+    hits = parse_time.cache_info().hits
+    assert parse_time("13:25") == 805
+    assert parse_time.cache_info().hits == hits + 1
+
+
 def test_is_available(scheduler_mock: Scheduler):
     """Тест на корректность данных проверки свободного таймслота"""
     assert scheduler_mock.is_available("2025-02-15",
@@ -115,6 +218,18 @@ def test_is_available(scheduler_mock: Scheduler):
                                        "17:31") is False
 
 
+def test_are_available(scheduler_mock: Scheduler):
+    """Тест на корректность пакетной проверки свободных таймслотов"""
+    assert scheduler_mock.are_available([
+        ("2025-02-15", "13:00", "17:00"),
+        ("2025-02-15", "11:59", "17:30"),
+        ("2025-02-18", "11:00", "11:30"),
+        ("2025-02-18", "11:00", "11:31"),
+        ("2025-02-20", "11:00", "11:30")
+    ]) == [True, False, True, False, False]
+    assert scheduler_mock.are_available([]) == []
+
+
 def test_find_slot_for_duration(scheduler_mock: Scheduler):
     """Тест на корректность данных первого свободного таймслота"""
     assert scheduler_mock.find_slot_for_duration(120) == ('2025-02-15',
@@ -124,3 +239,68 @@ def test_find_slot_for_duration(scheduler_mock: Scheduler):
                                                           '09:00',
                                                           '18:00')
     assert scheduler_mock.find_slot_for_duration(600) is None
+
+
+def test_to_dataframe(scheduler_mock: Scheduler):
+    """Тест на корректность выгрузки в DataFrame"""
+    df_busy = scheduler_mock.to_dataframe()
+    assert list(df_busy.columns) == ["date", "start", "end"]
+    assert len(df_busy) == 9
+    df_free = scheduler_mock.to_dataframe(free=True)
+    assert df_free.iloc[0].tolist() == ['2025-02-15', '12:00', '17:30']
+    assert len(df_free) == 9
+
+
+def test_import_without_pandas():
+    """Импорт библиотеки не подгружает pandas"""
+    src_path = Path(__file__).parents[1] / "src"
+    result = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, scheduler; print('pandas' in sys.modules)"],
+        cwd=src_path, capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "False"
+
+
+def test_find_slot_for_duration_strategies(scheduler_mock: Scheduler):
+    """Тест на корректность поиска таймслота с параметрами"""
+    assert scheduler_mock.find_slot_for_duration(
+        60, strategy="best"
+    ) == ('2025-02-15', '20:00', '21:00')
+    assert scheduler_mock.find_slot_for_duration(
+        200, strategy="best"
+    ) == ('2025-02-16', '11:00', '14:30')
+    assert scheduler_mock.find_slot_for_duration(
+        200, date_from="2025-02-16"
+    ) == ('2025-02-16', '11:00', '14:30')
+    assert scheduler_mock.find_slot_for_duration(
+        200, strategy="best", date_from="2025-02-17", date_to="2025-02-19"
+    ) == ('2025-02-17', '09:00', '12:30')
+    assert scheduler_mock.find_slot_for_duration(
+        120, date_to="2025-02-14"
+    ) is None
+    assert scheduler_mock.find_slot_for_duration(
+        45, granularity=100
+    ) == ('2025-02-15', '13:20', '17:30')
+    assert scheduler_mock.find_slot_for_duration(
+        30, date_from="2025-02-18", granularity=40
+    ) == ('2025-02-18', '16:00', '17:00')
+
+
+def test_find_slots_for_duration(scheduler_mock: Scheduler):
+    """Тест на корректность поиска нескольких таймслотов"""
+    assert scheduler_mock.find_slots_for_duration(200) == [
+        ('2025-02-15', '12:00', '17:30'),
+        ('2025-02-16', '11:00', '14:30'),
+        ('2025-02-16', '18:00', '22:00'),
+        ('2025-02-17', '09:00', '12:30'),
+        ('2025-02-19', '09:00', '18:00')
+    ]
+    assert scheduler_mock.find_slots_for_duration(
+        60, limit=3, strategy="best"
+    ) == [
+        ('2025-02-15', '20:00', '21:00'),
+        ('2025-02-18', '16:00', '17:00'),
+        ('2025-02-16', '08:00', '09:30')
+    ]
+    assert scheduler_mock.find_slots_for_duration(600) == []
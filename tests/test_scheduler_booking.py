@@ -0,0 +1,103 @@
+import pytest
+
+from scheduler import Scheduler
+
+
+def test_book(scheduler_mock: Scheduler):
+    """Тест на корректность бронирования таймслота"""
+    free_15 = scheduler_mock._index.free["2025-02-15"]
+    assert scheduler_mock.book("2025-02-18", "16:00", "16:30") == 10
+    assert scheduler_mock.get_free_slots("2025-02-18") == [
+        ('11:00', '11:30'),
+        ('16:30', '17:00')
+    ]
+    assert scheduler_mock.get_busy_slots()[-1] == ['2025-02-18',
+                                                   '16:00', '16:30']
+    assert scheduler_mock.schedule_data["timeslots"][-1] == {
+        "day_id": 4, "end": "16:30", "id": 10, "start": "16:00"
+    }
+    assert scheduler_mock.is_available("2025-02-18", "16:00",
+                                       "16:30") is False
+    assert scheduler_mock.find_slot_for_duration(
+        30, date_from="2025-02-18", date_to="2025-02-18", strategy="best"
+    ) == ('2025-02-18', '11:00', '11:30')
+    assert scheduler_mock._index.free["2025-02-15"] is free_15
+    assert scheduler_mock.book("2025-02-18", "16:30", "17:00") == 11
+    assert scheduler_mock.get_free_slots("2025-02-18") == [
+        ('11:00', '11:30')
+    ]
+
+
+def test_book_conflicts(scheduler_mock: Scheduler):
+    with pytest.raises(Scheduler.SchedulerError,
+                       match="Timeslot is not available"):
+        scheduler_mock.book("2025-02-18", "15:30", "16:30")
+    with pytest.raises(Scheduler.SchedulerError,
+                       match="Timeslot is not available"):
+        scheduler_mock.book("2025-02-19", "08:00", "09:30")
+    with pytest.raises(Scheduler.SchedulerError,
+                       match="Timeslot is not available"):
+        scheduler_mock.book("2025-02-20", "10:00", "11:00")
+    scheduler_mock.book("2025-02-19", "09:00", "10:00")
+    with pytest.raises(Scheduler.SchedulerError,
+                       match="Timeslot is not available"):
+        scheduler_mock.book("2025-02-19", "09:30", "10:30")
+    assert len(scheduler_mock.schedule_data["timeslots"]) == 10
+
+
+def test_release(scheduler_mock: Scheduler):
+    """Тест на корректность отмены бронирования таймслота"""
+    assert scheduler_mock.release("2025-02-17", "12:30", "18:00") == 5
+    assert scheduler_mock.get_free_slots("2025-02-17") == [
+        ('09:00', '18:00')
+    ]
+    assert 5 not in [timeslot["id"] for timeslot
+                     in scheduler_mock.schedule_data["timeslots"]]
+    timeslot_id = scheduler_mock.book("2025-02-17", "10:00", "11:00")
+    assert scheduler_mock.release("2025-02-17", "10:00",
+                                  "11:00") == timeslot_id
+    assert scheduler_mock.find_slot_for_duration(
+        540, strategy="best"
+    ) == ('2025-02-17', '09:00', '18:00')
+
+
+def test_release_errors(scheduler_mock: Scheduler,
+                        scheduler_nodata: Scheduler):
+    with pytest.raises(Scheduler.SchedulerError,
+                       match="Timeslot is not booked"):
+        scheduler_mock.release("2025-02-17", "12:30", "17:00")
+    with pytest.raises(Scheduler.SchedulerError,
+                       match="Schedule data didn't fetched"):
+        scheduler_nodata.release("2025-02-17", "12:30", "18:00")
+    with pytest.raises(ValueError,
+                       match="Start time must be before end time"):
+        scheduler_mock.book("2025-02-17", "12:30", "12:30")
+
+
+def test_book_keeps_caller_data(scheduler_nodata: Scheduler,
+                                response_mock_data: dict):
+    data = response_mock_data["data"]
+    timeslots = list(data["timeslots"])
+    scheduler_nodata.schedule_data = data
+    scheduler_nodata.book("2025-02-18", "16:00", "16:30")
+    scheduler_nodata.release("2025-02-17", "12:30", "18:00")
+    scheduler_nodata.refresh({"removed": [1, 2]})
+    assert data["timeslots"] == timeslots
+    assert [timeslot["id"] for timeslot
+            in scheduler_nodata.schedule_data["timeslots"]] == \
+        [3, 4, 6, 7, 8, 9, 10]
+
+
+def test_book_keeps_published_data(scheduler_mock: Scheduler):
+    """Полученный schedule_data не меняется после book и release"""
+    data = scheduler_mock.schedule_data
+    timeslots = [dict(timeslot) for timeslot in data["timeslots"]]
+    slot_id = scheduler_mock.book("2025-02-15", "12:00", "12:30")
+    assert data["timeslots"] == timeslots
+    booked = scheduler_mock.schedule_data
+    assert booked is not data
+    assert booked["timeslots"][-1] == {"day_id": 1, "end": "12:30",
+                                       "id": slot_id, "start": "12:00"}
+    scheduler_mock.release("2025-02-15", "12:00", "12:30")
+    assert len(booked["timeslots"]) == len(timeslots) + 1
+    assert scheduler_mock.schedule_data["timeslots"] == timeslots
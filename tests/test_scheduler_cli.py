@@ -0,0 +1,90 @@
+import io
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from scheduler_cli import format_result, load_scheduler, main, run_bulk
+
+FIXTURE = Path(__file__).parent / "fixtures" / "api_response.json"
+
+
+@pytest.fixture
+def run(tmp_path, capsys):
+    def run(*argv):
+        code = main([*argv, "--file", str(FIXTURE),
+                     "--cache-dir", str(tmp_path)])
+        return code, capsys.readouterr().out
+
+    return run
+
+
+@pytest.mark.parametrize("argv, code, out", [
+    (["free", "2025-02-17"], 0, "09:00 12:30\n"),
+    (["busy", "2025-02-17", "--json"], 0, '[["12:30", "18:00"]]\n'),
+    (["busy", "2025-02-18", "--merged"], 0,
+     "10:00 11:00\n11:30 16:00\n17:00 18:00\n"),
+    (["available", "2025-02-17", "09:00", "10:00"], 0, "true\n"),
+    (["available", "2025-02-17", "12:00", "13:00"], 1, "false\n"),
+    (["find", "60", "--limit", "2", "--date-from", "2025-02-17"], 0,
+     "2025-02-17 09:00 12:30\n2025-02-18 16:00 17:00\n"),
+    (["find", "1000"], 1, ""),
+    (["windows", "60", "--time-from", "13:00", "--time-to", "17:00",
+      "--date-from", "2025-02-16", "--limit", "2"], 0,
+     "2025-02-16 13:00 14:30\n2025-02-18 16:00 17:00\n"),
+])
+def test_queries(run, argv: list, code: int, out: str):
+    assert run(*argv) == (code, out)
+
+
+def test_error(run, capsys):
+    assert run("free", "2025-02-30")[0] == 2
+    assert main(["free", "--file", "missing.json", "--no-cache"]) == 2
+    assert "error" in capsys.readouterr().err
+
+
+def test_bulk(run, monkeypatch):
+    monkeypatch.setattr("sys.stdin", io.StringIO(
+        '{"query": "available", "date": "2025-02-17",'
+        ' "time_start": "09:00", "time_end": "10:00"}\n'
+        '\n'
+        '{"query": "free", "dates": ["2025-02-17"]}\n'
+        '{"query": "unknown"}\n'
+    ))
+    code, out = run("bulk")
+    assert code == 1
+    assert [json.loads(line) for line in out.splitlines()] == [
+        {"result": True},
+        {"result": [["2025-02-17", "09:00", "12:30"]]},
+        {"error": "Unknown query: unknown"},
+    ]
+
+
+def test_run_bulk_invalid_lines(tmp_path):
+    scheduler = load_scheduler(file=FIXTURE, cache_dir=None)
+    out = io.StringIO()
+    assert run_bulk(scheduler, io.StringIO("{\n[1]\n"), out) == 2
+    assert all("error" in json.loads(line)
+               for line in out.getvalue().splitlines())
+
+
+def test_file_snapshot(tmp_path, response_mock_data: dict):
+    file = tmp_path / "schedule.json"
+    file.write_text(json.dumps(response_mock_data["data"]))
+    load_scheduler(file=file, cache_dir=tmp_path / "cache")
+    assert len(list((tmp_path / "cache").glob("*.snap"))) == 1
+    file.write_text("[]")
+    os.utime(file, (1, 1))
+    scheduler = load_scheduler(file=file, cache_dir=tmp_path / "cache")
+    assert scheduler.schedule_data == response_mock_data["data"]
+    os.utime(file)
+    with pytest.raises(ValueError):
+        load_scheduler(file=file, cache_dir=tmp_path / "cache")
+
+
+def test_format_result():
+    assert format_result(None) == ""
+    assert format_result(("2025-02-15", "09:00", "10:00")) == \
+        "2025-02-15 09:00 10:00"
+    assert format_result([]) == ""
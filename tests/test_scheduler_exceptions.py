@@ -27,6 +27,10 @@ def test_validation_date(scheduler_nodata: Scheduler):
         scheduler_nodata._validate_date("2024-13-13")
         scheduler_nodata._validate_date("2024-04-32")
         scheduler_nodata._validate_date("40-25")
+    with pytest.raises(ValueError,
+                       match="Invalid date string. "
+                             "Must be in format YYYY-MM-DD"):
+        scheduler_nodata._validate_date("2025-02-30")
 
 
 def test_validation_time(scheduler_nodata: Scheduler):
@@ -113,3 +117,48 @@ def test_no_fetched_data(scheduler_nodata: Scheduler):
                                       "17:30",
                                       "20:30")
         scheduler_nodata.find_slot_for_duration(60)
+
+
+def test_validation_are_available(scheduler_mock: Scheduler):
+    with pytest.raises(ValueError,
+                       match="Start time must be before end time"):
+        scheduler_mock.are_available([("2025-02-15", "13:00", "17:00"),
+                                      ("2025-02-15", "17:00", "13:00")])
+    with pytest.raises(ValueError,
+                       match="Invalid time string. Must be in format HH:MM"):
+        scheduler_mock.are_available([("2025-02-15", "13:00", "25:00")])
+
+
+def test_validation_find_slot_params(scheduler_mock: Scheduler):
+    with pytest.raises(ValueError,
+                       match="strategy must be 'earliest' or 'best'"):
+        scheduler_mock.find_slot_for_duration(60, strategy="worst")
+    with pytest.raises(ValueError,
+                       match="granularity must be a positive integer"):
+        scheduler_mock.find_slot_for_duration(60, granularity=0)
+    with pytest.raises(ValueError,
+                       match="limit must be a positive integer"):
+        scheduler_mock.find_slots_for_duration(60, limit=0)
+    with pytest.raises(ValueError,
+                       match="Invalid date string. "
+                             "Must be in format YYYY-MM-DD"):
+        scheduler_mock.find_slot_for_duration(60, date_from="2025-2-1")
+
+
+def test_validation_date_range_params(scheduler_mock: Scheduler):
+    with pytest.raises(ValueError,
+                       match="date cannot be combined with date_from, "
+                             "date_to or dates"):
+        scheduler_mock.get_free_slots("2025-02-15", date_to="2025-02-17")
+    with pytest.raises(ValueError,
+                       match="dates cannot be combined with date_from "
+                             "or date_to"):
+        scheduler_mock.get_busy_slots(date_from="2025-02-15",
+                                      dates=["2025-02-17"])
+    with pytest.raises(ValueError,
+                       match="dates must be an iterable of strings"):
+        scheduler_mock.iter_free_slots(dates="2025-02-17")
+    with pytest.raises(ValueError,
+                       match="Invalid date string. "
+                             "Must be in format YYYY-MM-DD"):
+        scheduler_mock.iter_busy_slots(dates=["2025-02-17", "2025-2-18"])
@@ -0,0 +1,90 @@
+import pytest
+
+from schedule_index import intervals_covered_by
+
+from scheduler import Scheduler
+
+import scheduler_group
+from scheduler_group import SchedulerGroup
+
+
+@pytest.fixture()
+def group(scheduler_mock: Scheduler):
+    second = Scheduler(auto_fetch=False)
+    second.schedule_data = {
+        "days": [{"date": "2025-02-15", "end": "18:00",
+                  "id": 1, "start": "09:00"},
+                 {"date": "2025-02-17", "end": "20:00",
+                  "id": 2, "start": "10:00"}],
+        "timeslots": [{"day_id": 1, "end": "14:00",
+                       "id": 1, "start": "13:00"}]
+    }
+    return SchedulerGroup([scheduler_mock, second])
+
+
+def test_intervals_covered_by():
+    assert intervals_covered_by([((720, 1050), (1200, 1260)),
+                                 ((540, 780), (840, 1080))], 2) == (
+        (720, 780), (840, 1050)
+    )
+    assert intervals_covered_by([((720, 1050), (1200, 1260)),
+                                 ((540, 780), (840, 1080))], 1) == (
+        (540, 1080), (1200, 1260)
+    )
+    assert intervals_covered_by([((540, 600),), ((600, 660),)], 1) == (
+        (540, 660),
+    )
+    assert intervals_covered_by([((540, 600),), ()], 2) == ()
+
+
+def test_get_common_free_slots(group: SchedulerGroup):
+    """Тест на корректность общих свободных слотов"""
+    assert group.get_common_free_slots() == [
+        ('2025-02-15', '12:00', '13:00'),
+        ('2025-02-15', '14:00', '17:30'),
+        ('2025-02-17', '10:00', '12:30')
+    ]
+    assert group.get_common_free_slots("2025-02-15", min_free=1) == [
+        ('09:00', '18:00'),
+        ('20:00', '21:00')
+    ]
+    assert group.get_common_free_slots("2025-02-16") == []
+    assert len(group.get_common_free_slots(min_free=1)) == 9
+
+
+def test_find_common_slot_for_duration(group: SchedulerGroup):
+    """Тест на корректность поиска общего свободного таймслота"""
+    assert group.find_common_slot_for_duration(120) == ('2025-02-15',
+                                                        '14:00', '17:30')
+    assert group.find_common_slot_for_duration(240) is None
+    assert group.find_common_slot_for_duration(
+        60, min_free=1, date_from="2025-02-16"
+    ) == ('2025-02-16', '08:00', '09:30')
+    assert group.find_common_slot_for_duration(
+        60, date_from="2025-02-16", granularity=45
+    ) == ('2025-02-17', '10:30', '12:30')
+
+
+def test_process_pool(group: SchedulerGroup, monkeypatch):
+    expected = group.get_common_free_slots(min_free=1)
+    monkeypatch.setattr(scheduler_group, "PARALLEL_MIN_DAYS", 1)
+    group.processes = 2
+    assert group.get_common_free_slots(min_free=1) == expected
+
+
+def test_group_validation(group: SchedulerGroup):
+    with pytest.raises(ValueError, match="schedulers must not be empty"):
+        SchedulerGroup([])
+    with pytest.raises(ValueError,
+                       match="processes must be a positive integer"):
+        SchedulerGroup(group.schedulers, processes=0)
+    with pytest.raises(ValueError,
+                       match="min_free must be between 1 and "
+                             "number of schedulers"):
+        group.get_common_free_slots(min_free=3)
+    with pytest.raises(ValueError,
+                       match="duration_minutes must be an integer"):
+        group.find_common_slot_for_duration("60")
+    with pytest.raises(Scheduler.SchedulerError,
+                       match="Schedule data didn't fetched"):
+        SchedulerGroup([Scheduler(auto_fetch=False)]).get_common_free_slots()
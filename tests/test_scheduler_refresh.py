@@ -0,0 +1,101 @@
+import pytest
+
+from scheduler import Scheduler
+
+
+def test_refresh_not_modified(stub_api, response_mock_data: dict):
+    stub_api.routes["/"] = (200, response_mock_data["data"],
+                            {"ETag": '"v1"',
+                             "Last-Modified": "Sat, 15 Feb 2025 09:00:00 GMT"})
+    scheduler = Scheduler(stub_api.url("/"))
+    index = scheduler._index
+    assert scheduler.refresh() is False
+    assert scheduler._index is index
+    headers = stub_api.requests[-1][1]
+    assert headers["If-None-Match"] == '"v1"'
+    assert headers["If-Modified-Since"] == "Sat, 15 Feb 2025 09:00:00 GMT"
+
+
+def test_refresh_modified(stub_api, response_mock_data: dict):
+    data = response_mock_data["data"]
+    stub_api.routes["/"] = (200, data, {"ETag": '"v1"'})
+    scheduler = Scheduler(stub_api.url("/"))
+    stub_api.routes["/"] = (200, {"days": data["days"][:1],
+                                  "timeslots": []}, {"ETag": '"v2"'})
+    assert scheduler.refresh() is True
+    assert scheduler.get_free_slots() == [('2025-02-15', '09:00', '21:00')]
+    assert scheduler.refresh() is False
+
+
+def test_refresh_delta_response(stub_api, response_mock_data: dict):
+    stub_api.routes["/"] = (200, response_mock_data["data"])
+    scheduler = Scheduler(stub_api.url("/"))
+    stub_api.routes["/"] = (200, {"removed": [5]})
+    assert scheduler.refresh() is True
+    assert scheduler.get_free_slots("2025-02-17") == [('09:00', '18:00')]
+
+
+def test_refresh_delta(scheduler_mock: Scheduler):
+    index = scheduler_mock._index
+    free_15 = index.free["2025-02-15"]
+    assert scheduler_mock.refresh({
+        "added": [{"day_id": 4, "end": "11:30", "id": 6, "start": "10:00"},
+                  {"day_id": 5, "end": "10:00", "id": 10, "start": "09:00"}],
+        "removed": [5]
+    }) is True
+    assert scheduler_mock._index is not index
+    assert index.free["2025-02-17"] == ((540, 750),)
+    assert scheduler_mock._index.free["2025-02-15"] is free_15
+    assert scheduler_mock.get_busy_slots("2025-02-18") == [
+        ['11:30', '14:00'],
+        ['14:00', '16:00'],
+        ['17:00', '18:00'],
+        ['10:00', '11:30']
+    ]
+    assert scheduler_mock.get_free_slots("2025-02-17") == [('09:00', '18:00')]
+    assert scheduler_mock.get_free_slots("2025-02-19") == [('10:00', '18:00')]
+    timeslot_ids = [timeslot["id"]
+                    for timeslot in scheduler_mock.schedule_data["timeslots"]]
+    assert timeslot_ids == [1, 2, 3, 4, 7, 8, 9, 6, 10]
+    assert scheduler_mock.refresh({"removed": [42]}) is False
+
+
+def test_refresh_validation(scheduler_mock: Scheduler,
+                            scheduler_nodata: Scheduler):
+    with pytest.raises(ValueError, match="delta must be a dict"):
+        scheduler_mock.refresh([5])
+    with pytest.raises(ValueError,
+                       match="delta added and removed must be lists"):
+        scheduler_mock.refresh({"removed": 5})
+    with pytest.raises(Scheduler.SchedulerError,
+                       match="Schedule data didn't fetched"):
+        scheduler_nodata.refresh({"removed": [5]})
+
+
+@pytest.mark.parametrize("delta", [
+    {"added": [{"day_id": 1, "end": "26:00", "id": 99, "start": "25:00"}]},
+    {"added": [{"day_id": 1, "end": "13:00", "start": "12:00"}]},
+    {"added": [{"day_id": 1, "end": "10:00", "id": 99, "start": "9:00"}]},
+    {"added": [{"day_id": 1, "end": "12:00", "id": 99, "start": "13:00"}]},
+    {"added": [{"day_id": 1, "id": 99, "start": "12:00"}]},
+    {"added": [5]},
+    {"removed": ["5"]},
+])
+def test_refresh_delta_invalid_timeslot(scheduler_mock: Scheduler,
+                                        delta: dict):
+    with pytest.raises(ValueError):
+        scheduler_mock.refresh(delta)
+
+
+def test_refresh_delta_atomic(scheduler_mock: Scheduler):
+    timeslots = list(scheduler_mock.schedule_data["timeslots"])
+    with pytest.raises(ValueError):
+        scheduler_mock.refresh({"added": [
+            {"day_id": 1, "end": "13:00", "id": 50, "start": "12:00"},
+            {"day_id": 1, "end": "13:00", "id": 51, "start": "9:0"}
+        ]})
+    assert scheduler_mock.schedule_data["timeslots"] == timeslots
+    assert len(scheduler_mock._index.timeslots) == len(timeslots)
+    assert scheduler_mock.is_available("2025-02-15", "12:00", "13:00")
+    assert scheduler_mock.get_free_slots("2025-02-15") == \
+        [("12:00", "17:30"), ("20:00", "21:00")]
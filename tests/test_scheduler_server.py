@@ -0,0 +1,146 @@
+import asyncio
+import json
+
+import pytest
+
+from schedule_sources import SQLiteSource
+
+from scheduler import Scheduler
+
+from scheduler_queries import parse_query_string
+
+from scheduler_server import SchedulerServer
+
+
+@pytest.fixture
+def server(scheduler_mock):
+    return SchedulerServer(scheduler_mock, port=0, refresh_interval=None)
+
+
+def test_parse_query_string():
+    assert parse_query_string(
+        "duration_minutes=60&dates=2025-02-15,2025-02-16&strategy=best"
+    ) == {"duration_minutes": 60,
+          "dates": ["2025-02-15", "2025-02-16"],
+          "strategy": "best"}
+    with pytest.raises(ValueError):
+        parse_query_string("limit=ten")
+
+
+@pytest.mark.parametrize("target, result", [
+    ("/free?date=2025-02-17", [["09:00", "12:30"]]),
+    ("/busy?date=2025-02-17", [["12:30", "18:00"]]),
+    ("/busy?date=2025-02-18&merged=true",
+     [["10:00", "11:00"], ["11:30", "16:00"], ["17:00", "18:00"]]),
+    ("/available?date=2025-02-17&time_start=09:00&time_end=10:00", True),
+    ("/find?duration_minutes=60", ["2025-02-15", "12:00", "17:30"]),
+    ("/find?duration_minutes=60&limit=2&date_from=2025-02-17",
+     [["2025-02-17", "09:00", "12:30"], ["2025-02-18", "16:00", "17:00"]]),
+    ("/windows?duration_minutes=300&time_from=12:00",
+     [["2025-02-15", "12:00", "17:30"], ["2025-02-19", "12:00", "18:00"]]),
+])
+def test_handle_get(server, scheduler_mock, target: str, result):
+    status, payload = server.handle("GET", target)
+    assert status == 200
+    assert json.loads(payload) == {"result": result}
+
+
+def test_handle_batch(server):
+    body = json.dumps([
+        {"date": "2025-02-17", "time_start": "09:00", "time_end": "10:00"},
+        {"date": "2025-02-17", "time_start": "13:00", "time_end": "14:00"},
+        {"date": "2025-02-17", "time_start": "25:00", "time_end": "26:00"},
+        {"day": "2025-02-17"},
+    ]).encode()
+    status, payload = server.handle("POST", "/available", body)
+    assert status == 200
+    results = json.loads(payload)["results"]
+    assert results[:2] == [{"result": True}, {"result": False}]
+    assert "error" in results[2]
+    assert results[3] == {"error": "Unknown parameters: day"}
+    status, payload = server.handle("POST", "/free",
+                                    b'{"date": "2025-02-17"}')
+    assert json.loads(payload) == {"result": [["09:00", "12:30"]]}
+
+
+@pytest.mark.parametrize("method, target, body, status", [
+    ("GET", "/unknown", b"", 404),
+    ("DELETE", "/free", b"", 405),
+    ("POST", "/free", b"{", 400),
+    ("GET", "/free?date=2025-02-30", b"", 400),
+    ("GET", "/find?duration_minutes=x", b"", 400),
+])
+def test_handle_errors(server, method: str, target: str, body: bytes,
+                       status: int):
+    assert server.handle(method, target, body)[0] == status
+
+
+def test_cache_invalidated(server, scheduler_mock):
+    target = "/available?date=2025-02-17&time_start=09:00&time_end=10:00"
+    assert json.loads(server.handle("GET", target)[1])["result"] is True
+    assert len(server._cache) == 1
+    scheduler_mock.book("2025-02-17", "09:00", "10:00")
+    assert json.loads(server.handle("GET", target)[1])["result"] is False
+
+
+def test_cache_pushdown_source(tmp_path, response_mock_data: dict):
+    source = SQLiteSource.create(tmp_path / "schedule.db",
+                                 response_mock_data["data"])
+    scheduler = Scheduler(source=source)
+    server = SchedulerServer(scheduler, port=0, refresh_interval=None)
+    target = "/free?date=2025-02-15"
+    assert json.loads(server.handle("GET", target)[1])["result"] == \
+        [["12:00", "17:30"], ["20:00", "21:00"]]
+    assert json.loads(server.handle("GET", target)[1])["result"] == \
+        [["12:00", "17:30"], ["20:00", "21:00"]]
+    assert scheduler._index is None
+    SQLiteSource.create(source.path, {"days": response_mock_data["data"][
+        "days"], "timeslots": []})
+    scheduler.refresh()
+    assert json.loads(server.handle("GET", target)[1])["result"] == \
+        [["09:00", "21:00"]]
+    assert scheduler._index is None
+
+
+def test_refresh_loop_survives_errors(scheduler_mock, monkeypatch):
+    calls = []
+
+    def refresh():
+        calls.append(None)
+        if len(calls) == 1:
+            raise OSError("snapshot cache is not writable")
+        if len(calls) == 2:
+            raise Scheduler.SchedulerError("Schedule data didn't fetched")
+        return False
+
+    monkeypatch.setattr(scheduler_mock, "refresh", refresh)
+
+    async def run():
+        async with SchedulerServer(scheduler_mock, port=0,
+                                   refresh_interval=0.01) as server:
+            while len(calls) < 3:
+                await asyncio.sleep(0.01)
+            assert not server._refresh_task.done()
+
+    asyncio.run(asyncio.wait_for(run(), 5))
+
+
+def test_http(server):
+    async def request():
+        async with server:
+            reader, writer = await asyncio.open_connection(server.host,
+                                                           server.port)
+            body = b'[{"date": "2025-02-17"}]'
+            writer.write(b"GET /free?date=2025-02-17 HTTP/1.1\r\n\r\n"
+                         b"POST /free HTTP/1.1\r\n"
+                         b"Content-Length: %d\r\n"
+                         b"Connection: close\r\n\r\n%s" % (len(body), body))
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+
+    response = asyncio.run(request())
+    assert response.count(b"HTTP/1.1 200 OK\r\n") == 2
+    assert response.endswith(b'{"results":[{"result":[["09:00","12:30"]]}]}')
+    assert b"Connection: close" in response
@@ -0,0 +1,73 @@
+import threading
+
+from scheduler import Scheduler
+
+
+def test_queries_are_stateless(scheduler_mock: Scheduler):
+    """Запрос по дате не влияет на последующие запросы"""
+    scheduler_mock.get_free_slots("2025-02-17")
+    scheduler_mock.get_busy_slots("2025-02-17")
+    assert scheduler_mock.selected_date is None
+    assert len(scheduler_mock.get_free_slots()) == 9
+    assert len(scheduler_mock.get_busy_slots()) == 9
+    assert len(scheduler_mock._get_df_days()) == 5
+    assert len(scheduler_mock._get_df_timeslots(date="2025-02-18")) == 4
+
+
+def test_concurrent_readers_and_writer(scheduler_mock: Scheduler):
+    """Читатели не видят промежуточных состояний при записи"""
+    expected_17 = {(('09:00', '12:30'),),
+                   (('09:00', '10:00'), ('11:00', '12:30'))}
+    expected_15 = [('12:00', '17:30'), ('20:00', '21:00')]
+    expected_best = {('2025-02-17', '09:00', '12:30'),
+                     ('2025-02-19', '09:00', '18:00')}
+    errors = []
+    stop = threading.Event()
+
+    def read():
+        try:
+            while not stop.is_set():
+                assert tuple(scheduler_mock.get_free_slots(
+                    "2025-02-17"
+                )) in expected_17
+                assert scheduler_mock.get_free_slots(
+                    "2025-02-15"
+                ) == expected_15
+                assert len(scheduler_mock.get_busy_slots()) in (9, 10)
+                assert scheduler_mock.find_slot_for_duration(
+                    200, strategy="best", date_from="2025-02-17"
+                ) in expected_best
+        except Exception as error:
+            errors.append(error)
+
+    readers = [threading.Thread(target=read) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    for _ in range(300):
+        scheduler_mock.book("2025-02-17", "10:00", "11:00")
+        scheduler_mock.release("2025-02-17", "10:00", "11:00")
+    stop.set()
+    for reader in readers:
+        reader.join()
+    assert errors == []
+    assert scheduler_mock.get_free_slots("2025-02-17") == [('09:00', '12:30')]
+
+
+def test_concurrent_writers(scheduler_mock: Scheduler):
+    """Бронирования одного слота из разных потоков не пересекаются"""
+    results = []
+
+    def book():
+        try:
+            results.append(scheduler_mock.book("2025-02-19",
+                                               "09:00", "10:00"))
+        except Scheduler.SchedulerError:
+            results.append(None)
+
+    writers = [threading.Thread(target=book) for _ in range(8)]
+    for writer in writers:
+        writer.start()
+    for writer in writers:
+        writer.join()
+    assert len([result for result in results if result is not None]) == 1
+    assert scheduler_mock.get_busy_slots("2025-02-19") == [['09:00', '10:00']]
@@ -0,0 +1,110 @@
+import os
+import time
+
+import pytest
+
+import requests
+
+from scheduler import Scheduler
+
+from snapshot_cache import SnapshotCache
+
+
+def test_store_load_round_trip(tmp_path, response_mock_data: dict):
+    cache = SnapshotCache(tmp_path)
+    data = response_mock_data["data"]
+    cache.store("http://schedule.test/", data, '"v1"', "Sat, 15 Feb 2025")
+    snapshot = cache.load("http://schedule.test/")
+    assert snapshot.etag == '"v1"'
+    assert snapshot.last_modified == "Sat, 15 Feb 2025"
+    assert snapshot.age < 60
+    assert snapshot.arrays.to_schedule_data() == data
+    assert cache.load("http://other.test/") is None
+
+
+def test_load_fresh_ttl(tmp_path, response_mock_data: dict):
+    cache = SnapshotCache(tmp_path, ttl=60)
+    path = cache.store("http://schedule.test/", response_mock_data["data"])
+    assert cache.load_fresh("http://schedule.test/") is not None
+    cache.ttl = 0
+    time.sleep(0.01)
+    assert cache.load_fresh("http://schedule.test/") is None
+    assert cache.load("http://schedule.test/") is not None
+    assert path.exists()
+
+
+@pytest.mark.parametrize("content", [b"", b"SCHEDSNP", b"x" * 64])
+def test_load_corrupt(tmp_path, content: bytes):
+    cache = SnapshotCache(tmp_path)
+    tmp_path.joinpath(cache.path("http://schedule.test/").name) \
+        .write_bytes(content)
+    assert cache.load("http://schedule.test/") is None
+
+
+def test_evict(tmp_path, response_mock_data: dict):
+    data = response_mock_data["data"]
+    cache = SnapshotCache(tmp_path)
+    first = cache.store("http://first.test/", data)
+    os.utime(first, (1, 1))
+    cache.max_size = first.stat().st_size * 2
+    cache.store("http://second.test/", data)
+    cache.store("http://third.test/", data)
+    assert not first.exists()
+    assert cache.load("http://second.test/") is not None
+    assert cache.load("http://third.test/") is not None
+
+
+@pytest.mark.parametrize("kwargs", [{"ttl": -1}, {"max_size": 0}])
+def test_invalid_params(tmp_path, kwargs: dict):
+    with pytest.raises(ValueError):
+        SnapshotCache(tmp_path, **kwargs)
+
+
+def test_scheduler_fresh_snapshot(tmp_path, stub_api,
+                                  response_mock_data: dict):
+    cache = SnapshotCache(tmp_path)
+    stub_api.routes["/"] = (200, response_mock_data["data"], {"ETag": '"v1"'})
+    Scheduler(stub_api.url("/"), cache=cache)
+    scheduler = Scheduler(stub_api.url("/"), cache=cache)
+    assert len(stub_api.requests) == 1
+    assert scheduler._etag == '"v1"'
+    assert scheduler.schedule_data == response_mock_data["data"]
+    assert scheduler.get_free_slots("2025-02-17") == [('09:00', '12:30')]
+    assert scheduler.refresh() is False
+    assert stub_api.requests[-1][1]["If-None-Match"] == '"v1"'
+
+
+def test_scheduler_stale_fallback(tmp_path, stub_api,
+                                  response_mock_data: dict):
+    cache = SnapshotCache(tmp_path, ttl=0)
+    stub_api.routes["/"] = (200, response_mock_data["data"])
+    Scheduler(stub_api.url("/"), cache=cache)
+    stub_api.routes["/"] = (500, {})
+    scheduler = Scheduler(stub_api.url("/"), cache=cache)
+    assert len(stub_api.requests) == 2
+    assert scheduler.schedule_data == response_mock_data["data"]
+
+
+def test_scheduler_no_snapshot(tmp_path, stub_api):
+    stub_api.routes["/"] = (500, {})
+    scheduler = Scheduler(stub_api.url("/"), auto_fetch=False,
+                          cache=SnapshotCache(tmp_path))
+    with pytest.raises(requests.HTTPError):
+        scheduler.fetch()
+
+
+def test_scheduler_from_snapshot(tmp_path, stub_api,
+                                 response_mock_data: dict):
+    cache = SnapshotCache(tmp_path)
+    data = response_mock_data["data"]
+    stub_api.routes["/"] = (200, data, {"ETag": '"v1"'})
+    cache.store(stub_api.url("/"), data, '"v1"')
+    snapshot = cache.load(stub_api.url("/"))
+    scheduler = Scheduler.from_snapshot(snapshot, api_url=stub_api.url("/"))
+    assert stub_api.requests == []
+    assert scheduler.schedule_data == data
+    assert scheduler.refresh() is False
+    assert stub_api.requests[-1][1]["If-None-Match"] == '"v1"'
+    scheduler = Scheduler.from_arrays(snapshot.arrays, cache=cache)
+    assert scheduler.cache is cache
+    assert scheduler.get_free_slots("2025-02-17") == [('09:00', '12:30')]